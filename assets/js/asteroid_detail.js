@@ -0,0 +1,93 @@
+// Auto-refresh data every 10 minutes (reduced frequency for performance)
+setTimeout(() => {
+    location.reload();
+}, 600000);
+
+// Add loading animation for images
+document.addEventListener('DOMContentLoaded', function() {
+    const name = document.getElementById('generate-report').dataset.asteroid;
+    const img = document.querySelector(`img[alt="${CSS.escape(name)}"]`);
+    if (img) {
+        img.addEventListener('load', function() {
+            this.classList.add('animate-pulse');
+            setTimeout(() => this.classList.remove('animate-pulse'), 1000);
+        });
+    }
+
+    // Initialize trajectory animation
+    initializeTrajectoryAnimation();
+});
+
+function initializeTrajectoryAnimation() {
+    // Add dynamic trajectory visualization
+    const trajectoryPath = document.querySelector('svg path');
+    if (trajectoryPath) {
+        trajectoryPath.style.strokeDasharray = '0,1000';
+        trajectoryPath.style.animation = 'drawPath 5s ease-in-out infinite';
+    }
+}
+
+function generateReport() {
+    // Generate comprehensive impact report
+    const report = document.getElementById('generate-report').dataset;
+    const reportData = {
+        asteroid: report.asteroid,
+        diameter: report.diameter,
+        velocity: report.velocity,
+        approach_date: report.approachDate,
+        impact_probability: report.impactProbability,
+        tnt_equivalent: report.tntEquivalent,
+        crater_diameter: report.craterDiameter,
+        casualties: report.casualties,
+        economic_damage: report.economicDamage,
+        severity: report.severity
+    };
+
+    // Create downloadable report
+    const reportContent = `
+ASTEROID IMPACT ANALYSIS REPORT
+================================
+
+Asteroid: ${reportData.asteroid}
+Diameter: ${reportData.diameter}
+Approach Velocity: ${reportData.velocity}
+Closest Approach: ${reportData.approach_date}
+
+IMPACT ANALYSIS
+===============
+Impact Probability: ${reportData.impact_probability}
+TNT Equivalent: ${reportData.tnt_equivalent}
+Crater Diameter: ${reportData.crater_diameter}
+
+ENVIRONMENTAL IMPACT
+===================
+Severity Level: ${reportData.severity}
+Estimated Casualties: ${reportData.casualties}
+Economic Damage: ${reportData.economic_damage}
+
+Generated: ${new Date().toLocaleString()}
+    `;
+
+    const blob = new Blob([reportContent], { type: 'text/plain' });
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = `${reportData.asteroid}_Impact_Analysis_Report.txt`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    window.URL.revokeObjectURL(url);
+
+    alert('Impact analysis report generated and downloaded!');
+}
+
+// Add CSS for trajectory animation
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes drawPath {
+        0% { stroke-dasharray: 0,1000; }
+        50% { stroke-dasharray: 500,500; }
+        100% { stroke-dasharray: 1000,0; }
+    }
+`;
+document.head.appendChild(style);
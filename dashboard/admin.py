@@ -1,3 +1,57 @@
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
-# Register your models here.
+from .models import RequestProfile
+from .profiling import delete_profile_files, profile_path
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Recent on-demand request profiles; see dashboard.profiling"""
+    list_display = ('created_at', 'method', 'path', 'route', 'status_code', 'duration_ms', 'user', 'download')
+    list_filter = ('route', 'status_code')
+    search_fields = ('path', 'route')
+    date_hierarchy = 'created_at'
+    fields = ('created_at', 'method', 'path', 'route', 'status_code', 'duration_ms', 'user', 'download', 'top_functions')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Profile')
+    def download(self, obj):
+        url = reverse('admin:dashboard_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.filename)
+
+    @admin.display(description='Top functions (cumulative)')
+    def top_functions(self, obj):
+        return format_html('<pre style="font-size: 12px">{}</pre>', obj.summary)
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/download/', self.admin_site.admin_view(self.download_view),
+                 name='dashboard_requestprofile_download'),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = self.get_object(request, str(pk))
+        if profile is None or not self.has_view_permission(request, profile):
+            raise Http404
+        try:
+            return FileResponse(open(profile_path(profile.filename), 'rb'), as_attachment=True,
+                                filename=profile.filename, content_type='application/octet-stream')
+        except FileNotFoundError:
+            raise Http404('The profile file no longer exists')
+
+    def delete_model(self, request, obj):
+        delete_profile_files([obj])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        delete_profile_files(queryset)
+        super().delete_queryset(request, queryset)
@@ -0,0 +1,183 @@
+"""Trajectory and environmental scenarios for the asteroid detail page.
+
+The models fill gaps in the data (orbital elements of objects ingested
+without NeoWs ``orbital_data``, casualty and economic estimates, recovery
+times) with random draws. Each draw comes from a
+generator seeded by the asteroid id and ``MODEL_VERSION``, so an object
+always shows the same numbers in every request and worker. Results are
+memoized per input tuple; bump ``MODEL_VERSION`` when the model changes so
+every object gets fresh draws.
+"""
+import copy
+import hashlib
+import math
+import random
+from functools import lru_cache
+
+from .catalog import DEFAULT_MISS_DISTANCE_KM, DEFAULT_VELOCITY_KMS
+from .orbits import ELEMENT_FIELDS, has_elements, orbital_period_days
+
+MODEL_VERSION = 1
+ANALYSIS_CACHE_SIZE = 4096
+
+KM_PER_AU = 149597870.7
+
+
+def seeded_random(asteroid_id, purpose):
+    """random.Random that is stable across processes (unlike hash()) for one object and purpose"""
+    digest = hashlib.sha256(f'{MODEL_VERSION}:{purpose}:{asteroid_id}'.encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+
+def tsunami_estimate(diameter, velocity):
+    """(risk level, wave height in meters) for an ocean impact; diameter in km"""
+    if diameter > 0.1:
+        return 'extreme', min(300, diameter * velocity * 10)
+    if diameter > 0.05:
+        return 'high', min(100, diameter * velocity * 5)
+    return 'moderate', min(50, diameter * velocity * 2)
+
+
+def calculate_trajectory_data(asteroid):
+    """Calculate trajectory and orbital data"""
+    return dict(_trajectory_data(
+        str(asteroid['id']),
+        asteroid.get('velocity_kms', DEFAULT_VELOCITY_KMS),
+        asteroid.get('miss_distance_km', DEFAULT_MISS_DISTANCE_KM),
+        asteroid.get('close_approach_date', '2025-06-15'),
+        tuple(asteroid[field] for field in ELEMENT_FIELDS) if has_elements(asteroid) else None,
+    ))
+
+
+def calculate_environmental_impact(asteroid):
+    """Calculate comprehensive environmental impact scenarios"""
+    return copy.deepcopy(_environmental_impact(
+        str(asteroid['id']),
+        (asteroid['diameter_min'] + asteroid['diameter_max']) / 2,
+        asteroid.get('velocity_kms', DEFAULT_VELOCITY_KMS),
+    ))
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _trajectory_data(asteroid_id, velocity, miss_distance, approach_date, elements):
+    if elements:
+        elements = dict(zip(ELEMENT_FIELDS, elements))
+        semi_major_axis = elements['semi_major_axis_au']
+        eccentricity = elements['eccentricity']
+        inclination = elements['inclination_deg']
+        orbit_source = 'elements'
+    else:
+        # Simulate orbital elements
+        rng = seeded_random(asteroid_id, 'trajectory')
+        semi_major_axis = rng.uniform(1.0, 3.5)  # AU
+        eccentricity = rng.uniform(0.1, 0.8)
+        inclination = rng.uniform(0, 30)  # degrees
+        orbit_source = 'estimated'
+
+    # Calculate approach angle
+    approach_angle = math.degrees(math.atan2(miss_distance, KM_PER_AU))  # Earth-Sun distance
+
+    return {
+        'semi_major_axis_au': semi_major_axis,
+        'eccentricity': eccentricity,
+        'inclination_deg': inclination,
+        'approach_angle_deg': approach_angle,
+        'approach_velocity_kms': velocity,
+        'closest_approach_date': approach_date,
+        'orbital_period_years': float(orbital_period_days(semi_major_axis)) / 365.25,
+        'perihelion_distance_au': semi_major_axis * (1 - eccentricity),
+        'aphelion_distance_au': semi_major_axis * (1 + eccentricity),
+        'orbit_source': orbit_source,
+    }
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _environmental_impact(asteroid_id, diameter, velocity):
+    rng = seeded_random(asteroid_id, 'environment')
+
+    # Enhanced impact scenarios based on size and velocity
+    if diameter < 0.01:  # < 10m
+        scenario = 'atmospheric_breakup'
+        severity = 'minimal'
+        description = 'Complete atmospheric breakup, bright fireball, possible meteorite fragments'
+        casualties_base = 0
+        economic_base = 0
+    elif diameter < 0.05:  # 10-50m
+        scenario = 'airburst_explosion'
+        severity = 'local'
+        description = 'Airburst explosion, broken windows, minor injuries in populated areas (Chelyabinsk-type event)'
+        casualties_base = rng.randint(0, 1500)
+        economic_base = rng.randint(10, 100)
+    elif diameter < 0.15:  # 50-150m
+        scenario = 'regional_devastation'
+        severity = 'regional'
+        description = 'Significant regional damage, forest flattening, major city damage if urban impact (Tunguska-type event)'
+        casualties_base = rng.randint(1000, 100000)
+        economic_base = rng.randint(100, 10000)
+    elif diameter < 1.0:  # 150m-1km
+        scenario = 'continental_destruction'
+        severity = 'continental'
+        description = 'Continental-scale destruction, climate effects, mass casualties, civilization disruption'
+        casualties_base = rng.randint(100000, 50000000)
+        economic_base = rng.randint(10000, 1000000)
+    else:  # > 1km
+        scenario = 'global_catastrophe'
+        severity = 'global'
+        description = 'Global catastrophe, mass extinction event, climate change, civilization threat (K-Pg type event)'
+        casualties_base = rng.randint(1000000000, 7000000000)
+        economic_base = rng.randint(1000000, 100000000)
+
+    # Enhanced environmental calculations
+    kinetic_energy = 0.5 * (4/3 * math.pi * ((diameter * 1000)/2)**3 * 2600) * (velocity * 1000)**2
+    dust_injection = min(10000, (diameter ** 2) * velocity * 50)  # million tons
+    temperature_drop = min(15, diameter * velocity * 0.1)  # degrees Celsius
+    affected_area = min(510000000, math.pi * (diameter * 1000 * velocity * 0.5) ** 2)  # km²
+
+    # Enhanced tsunami calculations
+    ocean_impact_probability = 0.71  # 71% of Earth is ocean
+    tsunami_risk, tsunami_height = tsunami_estimate(diameter, velocity)
+
+    # Climate and atmospheric effects
+    ozone_depletion = min(50, diameter * 10)  # percentage
+    acid_rain_duration = min(10, diameter * 20)  # years
+    nuclear_winter_duration = min(5, diameter * 2)  # years
+
+    # Recovery time based on severity
+    if severity == 'minimal':
+        recovery_time = rng.randint(0, 1)
+    elif severity == 'local':
+        recovery_time = rng.randint(1, 10)
+    elif severity == 'regional':
+        recovery_time = rng.randint(10, 100)
+    elif severity == 'continental':
+        recovery_time = rng.randint(100, 1000)
+    else:  # global
+        recovery_time = rng.randint(1000, 10000)
+
+    # Geographical impact zones
+    impact_zones = {
+        'ground_zero_radius': diameter * 5,  # km
+        'severe_damage_radius': diameter * 20,  # km
+        'moderate_damage_radius': diameter * 50,  # km
+        'light_damage_radius': diameter * 100,  # km
+    }
+
+    return {
+        'scenario': scenario,
+        'severity_level': severity,
+        'description': description,
+        'dust_injection_million_tons': dust_injection,
+        'temperature_drop_celsius': temperature_drop,
+        'affected_area_km2': affected_area,
+        'tsunami_risk': tsunami_risk,
+        'tsunami_height_m': tsunami_height,
+        'recovery_time_years': recovery_time,
+        'casualties_estimate': casualties_base,
+        'economic_damage_billion_usd': economic_base,
+        'ozone_depletion_percent': ozone_depletion,
+        'acid_rain_duration_years': acid_rain_duration,
+        'nuclear_winter_duration_years': nuclear_winter_duration,
+        'ocean_impact_probability': ocean_impact_probability,
+        'impact_zones': impact_zones,
+        'kinetic_energy_joules': kinetic_energy
+    }
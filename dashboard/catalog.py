@@ -0,0 +1,748 @@
+"""In-memory asteroid catalog, built once per worker process.
+
+The catalog loads every ``Asteroid`` row (the curated objects below are
+seeded by a migration and used directly only when the table is missing) and
+keeps immutable records behind an id index plus secondary indexes by type,
+hazard flag and name, so views never rebuild or scan the whole list to
+answer a request.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Same defaults the impact calculations assume when an approach is unknown
+DEFAULT_VELOCITY_KMS = 20.0
+DEFAULT_MISS_DISTANCE_KM = 5000000
+# Rows without a curated image use the on-demand procedural one
+GENERATED_IMAGE_URL = '/images/asteroid/{}.svg'
+
+# Curated famous asteroids, meteors and comets with accurate generated images
+BUILTIN_OBJECTS = (
+    {
+        'id': '99942',
+        'name': 'Apophis',
+        'type': 'Asteroid',
+        'diameter_min': 0.325,
+        'diameter_max': 0.375,
+        'is_hazardous': True,
+        'absolute_magnitude': 19.7,
+        'image_url': '/static/images/asteroids/Apophis.jpg',
+        'close_approach_date': 'April 13, 2029',
+        'velocity_kms': 7.42,
+        'miss_distance_km': 31000,
+        'description': 'Apophis is a potentially hazardous asteroid that will make an extremely close approach to Earth in 2029, passing closer than some satellites.'
+    },
+    {
+        'id': '101955',
+        'name': 'Bennu',
+        'type': 'Asteroid',
+        'diameter_min': 0.492,
+        'diameter_max': 0.565,
+        'is_hazardous': True,
+        'absolute_magnitude': 20.9,
+        'image_url': '/static/images/asteroids/Bennu.jpg',
+        'close_approach_date': 'September 25, 2025',
+        'velocity_kms': 28.07,
+        'miss_distance_km': 334000,
+        'description': 'Bennu is a carbonaceous asteroid visited by NASA OSIRIS-REx mission, with samples successfully returned to Earth in 2023.'
+    },
+    {
+        'id': '162173',
+        'name': 'Ryugu',
+        'type': 'Asteroid',
+        'diameter_min': 0.865,
+        'diameter_max': 0.915,
+        'is_hazardous': False,
+        'absolute_magnitude': 19.2,
+        'image_url': '/static/images/asteroids/Ryugu.jpg',
+        'close_approach_date': 'November 15, 2025',
+        'velocity_kms': 32.19,
+        'miss_distance_km': 1200000,
+        'description': 'Ryugu is a diamond-shaped asteroid explored by Japan Hayabusa2 mission, revealing its rubble-pile structure and organic compounds.'
+    },
+    {
+        'id': '25143',
+        'name': 'Itokawa',
+        'type': 'Asteroid',
+        'diameter_min': 0.318,
+        'diameter_max': 0.535,
+        'is_hazardous': False,
+        'absolute_magnitude': 19.4,
+        'image_url': '/static/images/asteroids/Itokawa.jpg',
+        'close_approach_date': 'August 10, 2025',
+        'velocity_kms': 25.36,
+        'miss_distance_km': 890000,
+        'description': 'Itokawa is an elongated peanut-shaped asteroid, the first from which samples were successfully returned to Earth by Hayabusa mission.'
+    },
+    {
+        'id': '433',
+        'name': 'Eros',
+        'type': 'Asteroid',
+        'diameter_min': 16.84,
+        'diameter_max': 16.84,
+        'is_hazardous': False,
+        'absolute_magnitude': 10.4,
+        'image_url': '/static/images/asteroids/Eros.jpg',
+        'close_approach_date': 'January 31, 2025',
+        'velocity_kms': 23.04,
+        'miss_distance_km': 16700000,
+        'description': 'Eros is a large S-type asteroid, the first to be orbited by a spacecraft (NEAR Shoemaker) and later landed upon.'
+    },
+    {
+        'id': '4179',
+        'name': 'Toutatis',
+        'type': 'Asteroid',
+        'diameter_min': 2.4,
+        'diameter_max': 4.6,
+        'is_hazardous': True,
+        'absolute_magnitude': 15.3,
+        'image_url': '/static/images/asteroids/Toutatis.jpg',
+        'close_approach_date': 'December 12, 2025',
+        'velocity_kms': 11.02,
+        'miss_distance_km': 7000000,
+        'description': 'Toutatis is an elongated potentially hazardous asteroid with a complex tumbling rotation, studied extensively by radar.'
+    },
+    {
+        'id': '1566',
+        'name': 'Icarus',
+        'type': 'Asteroid',
+        'diameter_min': 1.0,
+        'diameter_max': 1.4,
+        'is_hazardous': True,
+        'absolute_magnitude': 16.9,
+        'image_url': '/static/images/asteroids/Icarus.jpg',
+        'close_approach_date': 'June 16, 2025',
+        'velocity_kms': 27.36,
+        'miss_distance_km': 6400000,
+        'description': 'Icarus is a potentially hazardous asteroid with a highly eccentric orbit that brings it very close to the Sun.'
+    },
+    {
+        'id': '4',
+        'name': 'Vesta',
+        'type': 'Asteroid',
+        'diameter_min': 525.4,
+        'diameter_max': 525.4,
+        'is_hazardous': False,
+        'absolute_magnitude': 3.2,
+        'image_url': '/static/images/asteroids/Vesta.jpg',
+        'close_approach_date': 'March 20, 2025',
+        'velocity_kms': 19.34,
+        'miss_distance_km': 234000000,
+        'description': 'Vesta is one of the largest asteroids in the asteroid belt, visited by NASA Dawn spacecraft, with a differentiated interior.'
+    },
+    {
+        'id': '1',
+        'name': 'Ceres',
+        'type': 'Dwarf Planet',
+        'diameter_min': 939.4,
+        'diameter_max': 939.4,
+        'is_hazardous': False,
+        'absolute_magnitude': 3.36,
+        'image_url': '/static/images/asteroids/Ceres.jpg',
+        'close_approach_date': 'February 14, 2025',
+        'velocity_kms': 17.88,
+        'miss_distance_km': 263000000,
+        'description': 'Ceres is the largest object in the asteroid belt and the only dwarf planet in the inner solar system, with possible subsurface ocean.'
+    },
+    {
+        'id': 'HALLEY',
+        'name': 'Halley\'s Comet',
+        'type': 'Comet',
+        'diameter_min': 15.0,
+        'diameter_max': 15.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 5.1,
+        'image_url': '/static/images/asteroids/Halley.jpg',
+        'close_approach_date': 'July 28, 2061',
+        'velocity_kms': 70.56,
+        'miss_distance_km': 75000000,
+        'description': 'Halley\'s Comet is the most famous comet, visible from Earth every 75-76 years, last seen in 1986, next return in 2061.'
+    },
+    {
+        'id': 'HALE_BOPP',
+        'name': 'Hale-Bopp',
+        'type': 'Comet',
+        'diameter_min': 60.0,
+        'diameter_max': 60.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 1.0,
+        'image_url': '/static/images/asteroids/Hale-bopp.jpg',
+        'close_approach_date': 'April 1, 4385',
+        'velocity_kms': 44.0,
+        'miss_distance_km': 194000000,
+        'description': 'Hale-Bopp was one of the brightest comets of the 20th century, visible to the naked eye for 18 months in 1996-1997.'
+    },
+    {
+        'id': 'NEOWISE',
+        'name': 'NEOWISE',
+        'type': 'Comet',
+        'diameter_min': 5.0,
+        'diameter_max': 5.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 8.3,
+        'image_url': '/static/images/asteroids/Neowise.jpg',
+        'close_approach_date': 'July 3, 8786',
+        'velocity_kms': 62.8,
+        'miss_distance_km': 103000000,
+        'description': 'NEOWISE was a spectacular comet visible in 2020, won\'t return for about 6,800 years due to its long orbital period.'
+    },
+    {
+        'id': 'TUNGUSKA',
+        'name': 'Tunguska Object',
+        'type': 'Meteor/Asteroid',
+        'diameter_min': 0.06,
+        'diameter_max': 0.19,
+        'is_hazardous': True,
+        'absolute_magnitude': 22.0,
+        'image_url': '/static/images/asteroids/Tunguska.jpg',
+        'close_approach_date': 'June 30, 1908',
+        'velocity_kms': 27.0,
+        'miss_distance_km': 0,
+        'description': 'The Tunguska event was a massive explosion in Siberia in 1908, likely caused by an asteroid or comet fragment, flattening 2,000 km² of forest.'
+    },
+    {
+        'id': 'CHELYABINSK',
+        'name': 'Chelyabinsk Meteor',
+        'type': 'Meteor',
+        'diameter_min': 0.017,
+        'diameter_max': 0.020,
+        'is_hazardous': True,
+        'absolute_magnitude': 24.4,
+        'image_url': '/static/images/asteroids/Chelyabinsk.jpg',
+        'close_approach_date': 'February 15, 2013',
+        'velocity_kms': 19.16,
+        'miss_distance_km': 0,
+        'description': 'The Chelyabinsk meteor exploded over Russia in 2013, injuring over 1,500 people and damaging thousands of buildings with its shockwave.'
+    },
+    {
+        'id': '16',
+        'name': 'Psyche',
+        'type': 'Asteroid',
+        'diameter_min': 226.0,
+        'diameter_max': 226.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 5.9,
+        'image_url': '/static/images/asteroids/Psyche.jpg',
+        'close_approach_date': 'May 12, 2025',
+        'velocity_kms': 20.1,
+        'miss_distance_km': 298000000,
+        'description': 'Psyche is a metallic asteroid, possibly the exposed core of a protoplanet, target of NASA Psyche mission launching in 2023.'
+    },
+    {
+        'id': '2',
+        'name': 'Pallas',
+        'type': 'Asteroid',
+        'diameter_min': 512.0,
+        'diameter_max': 512.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 4.13,
+        'image_url': '/static/images/asteroids/Pallas.jpg',
+        'close_approach_date': 'April 8, 2025',
+        'velocity_kms': 16.34,
+        'miss_distance_km': 287000000,
+        'description': 'Pallas is the third-largest asteroid in the asteroid belt, with an unusual highly inclined orbit and possible organic compounds.'
+    },
+    {
+        'id': '65803',
+        'name': 'Didymos',
+        'type': 'Asteroid',
+        'diameter_min': 0.78,
+        'diameter_max': 0.78,
+        'is_hazardous': True,
+        'absolute_magnitude': 18.16,
+        'image_url': '/static/images/asteroids/Didymos.jpg',
+        'close_approach_date': 'October 5, 2025',
+        'velocity_kms': 23.92,
+        'miss_distance_km': 10500000,
+        'description': 'Didymos is a binary asteroid system, target of NASA DART mission that successfully altered the orbit of its moonlet Dimorphos in 2022.'
+    },
+    {
+        'id': '3200',
+        'name': 'Phaethon',
+        'type': 'Asteroid',
+        'diameter_min': 5.1,
+        'diameter_max': 5.1,
+        'is_hazardous': True,
+        'absolute_magnitude': 14.6,
+        'image_url': '/static/images/asteroids/Phaethon.jpg',
+        'close_approach_date': 'December 14, 2025',
+        'velocity_kms': 30.18,
+        'miss_distance_km': 10312000,
+        'description': 'Phaethon is a potentially hazardous asteroid that comes closer to the Sun than any other named asteroid, source of Geminid meteor shower.'
+    },
+    {
+        'id': '1950DA',
+        'name': '1950 DA',
+        'type': 'Asteroid',
+        'diameter_min': 1.1,
+        'diameter_max': 1.4,
+        'is_hazardous': True,
+        'absolute_magnitude': 17.1,
+        'image_url': '/static/images/asteroids/1950 DA.jpg',
+        'close_approach_date': 'March 16, 2880',
+        'velocity_kms': 15.1,
+        'miss_distance_km': 1800000,
+        'description': '1950 DA has a small chance of impacting Earth in 2880, making it one of the most closely monitored potentially hazardous asteroids.'
+    },
+    {
+        'id': 'OUMUAMUA',
+        'name': 'Oumuamua',
+        'type': 'Interstellar Object',
+        'diameter_min': 0.1,
+        'diameter_max': 1.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 22.0,
+        'image_url': '/static/images/asteroids/Oumuamua.jpg',
+        'close_approach_date': 'October 19, 2017',
+        'velocity_kms': 87.3,
+        'miss_distance_km': 24000000,
+        'description': 'Oumuamua was the first confirmed interstellar object to visit our solar system, with an unusual elongated shape and mysterious acceleration.'
+    },
+    {
+        'id': 'LEONIDS',
+        'name': 'Leonids Meteor Shower',
+        'type': 'Meteor Shower',
+        'diameter_min': 0.001,
+        'diameter_max': 0.01,
+        'is_hazardous': False,
+        'absolute_magnitude': 25.0,
+        'image_url': '/static/images/asteroids/Leonids.jpg',
+        'close_approach_date': 'November 17, 2024',
+        'velocity_kms': 71.0,
+        'miss_distance_km': 0,
+        'description': 'The Leonids are a prolific meteor shower associated with comet Tempel-Tuttle, producing spectacular meteor storms every 33 years.'
+    },
+    {
+        'id': 'PERSEIDS',
+        'name': 'Perseids Meteor Shower',
+        'type': 'Meteor Shower',
+        'diameter_min': 0.001,
+        'diameter_max': 0.005,
+        'is_hazardous': False,
+        'absolute_magnitude': 26.0,
+        'image_url': '/static/images/asteroids/Perseids.jpg',
+        'close_approach_date': 'August 12, 2024',
+        'velocity_kms': 59.0,
+        'miss_distance_km': 0,
+        'description': 'The Perseids are the most popular meteor shower, originating from comet Swift-Tuttle and producing up to 100 meteors per hour.'
+    },
+    {
+        'id': 'GEMINIDS',
+        'name': 'Geminids Meteor Shower',
+        'type': 'Meteor Shower',
+        'diameter_min': 0.001,
+        'diameter_max': 0.008,
+        'is_hazardous': False,
+        'absolute_magnitude': 25.5,
+        'image_url': '/static/images/asteroids/Geminids.jpg',
+        'close_approach_date': 'December 14, 2024',
+        'velocity_kms': 35.0,
+        'miss_distance_km': 0,
+        'description': 'The Geminids are the most active meteor shower, originating from asteroid 3200 Phaethon and producing colorful, slow-moving meteors.'
+    },
+    {
+        'id': 'QUADRANTIDS',
+        'name': 'Quadrantids Meteor Shower',
+        'type': 'Meteor Shower',
+        'diameter_min': 0.001,
+        'diameter_max': 0.006,
+        'is_hazardous': False,
+        'absolute_magnitude': 25.8,
+        'image_url': '/static/images/asteroids/Quadrantors.jpg',
+        'close_approach_date': 'January 4, 2025',
+        'velocity_kms': 41.0,
+        'miss_distance_km': 0,
+        'description': 'The Quadrantids have a sharp peak lasting only a few hours, originating from asteroid 2003 EH1 and producing bright blue meteors.'
+    },
+    {
+        'id': 'DRACONIDS',
+        'name': 'Draconids Meteor Shower',
+        'type': 'Meteor Shower',
+        'diameter_min': 0.001,
+        'diameter_max': 0.004,
+        'is_hazardous': False,
+        'absolute_magnitude': 26.5,
+        'image_url': '/static/images/asteroids/Draconids.jpg',
+        'close_approach_date': 'October 8, 2024',
+        'velocity_kms': 20.0,
+        'miss_distance_km': 0,
+        'description': 'The Draconids are associated with comet 21P/Giacobini-Zinner and occasionally produce meteor storms with thousands of meteors per hour.'
+    },
+    {
+        'id': '3',
+        'name': 'Juno',
+        'type': 'Asteroid',
+        'diameter_min': 233.9,
+        'diameter_max': 233.9,
+        'is_hazardous': False,
+        'absolute_magnitude': 5.33,
+        'image_url': '/static/images/asteroids/Juno.jpg',
+        'close_approach_date': 'March 15, 2025',
+        'velocity_kms': 18.2,
+        'miss_distance_km': 298000000,
+        'description': 'Juno is one of the largest asteroids in the main belt, discovered in 1804 and named after the Roman goddess.'
+    },
+    {
+        'id': '10',
+        'name': 'Hygiea',
+        'type': 'Asteroid',
+        'diameter_min': 407.12,
+        'diameter_max': 407.12,
+        'is_hazardous': False,
+        'absolute_magnitude': 5.43,
+        'image_url': '/static/images/asteroids/Hygiea.jpg',
+        'close_approach_date': 'April 22, 2025',
+        'velocity_kms': 16.8,
+        'miss_distance_km': 312000000,
+        'description': 'Hygiea is the fourth-largest asteroid and the largest C-type asteroid, potentially qualifying as a dwarf planet.'
+    },
+    {
+        'id': '243',
+        'name': 'Ida',
+        'type': 'Asteroid',
+        'diameter_min': 31.4,
+        'diameter_max': 31.4,
+        'is_hazardous': False,
+        'absolute_magnitude': 9.94,
+        'image_url': '/static/images/asteroids/Ida.jpg',
+        'close_approach_date': 'June 8, 2025',
+        'velocity_kms': 22.1,
+        'miss_distance_km': 187000000,
+        'description': 'Ida was the first asteroid discovered to have a natural satellite (Dactyl), visited by the Galileo spacecraft.'
+    },
+    {
+        'id': '951',
+        'name': 'Gaspra',
+        'type': 'Asteroid',
+        'diameter_min': 12.2,
+        'diameter_max': 12.2,
+        'is_hazardous': False,
+        'absolute_magnitude': 11.46,
+        'image_url': '/static/images/asteroids/Gaspara.jpg',
+        'close_approach_date': 'July 19, 2025',
+        'velocity_kms': 24.3,
+        'miss_distance_km': 156000000,
+        'description': 'Gaspra was the first asteroid to be closely approached by a spacecraft (Galileo) and photographed in detail.'
+    },
+    {
+        'id': 'ENCKE',
+        'name': 'Encke Comet',
+        'type': 'Comet',
+        'diameter_min': 4.8,
+        'diameter_max': 4.8,
+        'is_hazardous': False,
+        'absolute_magnitude': 9.2,
+        'image_url': '/static/images/asteroids/Encke.jpg',
+        'close_approach_date': 'October 25, 2024',
+        'velocity_kms': 69.9,
+        'miss_distance_km': 64000000,
+        'description': 'Comet Encke has the shortest orbital period of any known comet at 3.3 years, source of the Taurid meteor showers.'
+    },
+    {
+        'id': 'SHOEMAKER_LEVY',
+        'name': 'Shoemaker-Levy 9',
+        'type': 'Comet',
+        'diameter_min': 2.0,
+        'diameter_max': 2.0,
+        'is_hazardous': False,
+        'absolute_magnitude': 14.0,
+        'image_url': '/static/images/asteroids/Shoemaker.jpg',
+        'close_approach_date': 'July 16, 1994',
+        'velocity_kms': 60.0,
+        'miss_distance_km': 0,
+        'description': 'Shoemaker-Levy 9 famously collided with Jupiter in 1994, providing the first direct observation of an extraterrestrial collision.'
+    },
+    {
+        'id': 'TEMPEL1',
+        'name': 'Tempel 1',
+        'type': 'Comet',
+        'diameter_min': 7.6,
+        'diameter_max': 7.6,
+        'is_hazardous': False,
+        'absolute_magnitude': 8.5,
+        'image_url': '/static/images/asteroids/Tempel.jpg',
+        'close_approach_date': 'July 5, 2025',
+        'velocity_kms': 28.6,
+        'miss_distance_km': 133000000,
+        'description': 'Tempel 1 was the target of NASA Deep Impact mission, which deliberately crashed an impactor into the comet in 2005.'
+    },
+    {
+        'id': 'WILD2',
+        'name': 'Wild 2',
+        'type': 'Comet',
+        'diameter_min': 5.5,
+        'diameter_max': 5.5,
+        'is_hazardous': False,
+        'absolute_magnitude': 9.6,
+        'image_url': '/static/images/asteroids/Wild2.jpg',
+        'close_approach_date': 'May 12, 2025',
+        'velocity_kms': 20.0,
+        'miss_distance_km': 240000000,
+        'description': 'Wild 2 was visited by NASA Stardust mission, which collected samples from its coma and returned them to Earth.'
+    },
+    {
+        'id': 'HARTLEY2',
+        'name': 'Hartley 2',
+        'type': 'Comet',
+        'diameter_min': 2.2,
+        'diameter_max': 2.2,
+        'is_hazardous': False,
+        'absolute_magnitude': 13.5,
+        'image_url': '/static/images/asteroids/Hartley 2.jpg',
+        'close_approach_date': 'October 20, 2024',
+        'velocity_kms': 12.4,
+        'miss_distance_km': 18000000,
+        'description': 'Hartley 2 was visited by NASA EPOXI mission, revealing a peanut-shaped nucleus with active jets of gas and dust.'
+    }
+)
+
+
+def generate_simple_description(neo_data):
+    """Simple description generator"""
+    name = neo_data.get('name', 'Unknown')
+    is_hazardous = neo_data.get('is_potentially_hazardous_asteroid', False)
+
+    if is_hazardous:
+        return f"{name} is a potentially hazardous near-Earth asteroid that requires monitoring."
+    else:
+        return f"{name} is a near-Earth asteroid that poses no immediate threat to Earth."
+
+
+def format_approach_date(value):
+    """Format an approach datetime the way the curated records spell it"""
+    if value is None:
+        return ''
+    return f'{value:%B} {value.day}, {value.year}'
+
+
+class CatalogChanged(Exception):
+    """The Asteroid table changed after the catalog was loaded"""
+
+    def __init__(self, result=None):
+        super().__init__('The asteroid catalog changed while the result was built')
+        self.result = result
+
+
+class AsteroidCatalog:
+    """Immutable, indexed collection of asteroid records"""
+
+    def __init__(self, records, last_modified=None):
+        # Derived from the data rather than load time so every worker reports
+        # the same value for the same catalog
+        self.last_modified = last_modified or timezone.now()
+        self.last_updated = self.last_modified.strftime('%Y-%m-%d %H:%M:%S UTC')
+
+        frozen = []
+        by_id = {}
+        for record in records:
+            if record['id'] in by_id:
+                continue
+            item = MappingProxyType({'last_updated': self.last_updated, **record})
+            by_id[item['id']] = item
+            frozen.append(item)
+        self._records = tuple(frozen)
+        self._by_id = by_id
+
+        by_type = {}
+        by_name = {}
+        for item in self._records:
+            by_type.setdefault(item['type'], []).append(item)
+            by_name.setdefault(item['name'].lower(), []).append(item)
+        self._by_type = {key: tuple(items) for key, items in by_type.items()}
+        self._by_name = {key: tuple(items) for key, items in by_name.items()}
+        self._hazardous = tuple(item for item in self._records if item['is_hazardous'])
+
+        digest = hashlib.sha1()
+        for item in self._records:
+            payload = {key: value for key, value in item.items() if key != 'last_updated'}
+            digest.update(json.dumps(payload, sort_keys=True, default=str).encode())
+        self.version = digest.hexdigest()[:16]
+        self.db_state = None
+
+    def is_current(self):
+        """Whether the Asteroid table still has the fingerprint this catalog was loaded from"""
+        return _database_state() == self.db_state
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __contains__(self, asteroid_id):
+        return asteroid_id in self._by_id
+
+    def get(self, asteroid_id, default=None):
+        """O(1) lookup of a record by its id"""
+        return self._by_id.get(asteroid_id, default)
+
+    def by_type(self, object_type):
+        return self._by_type.get(object_type, ())
+
+    def by_name(self, name):
+        """Records whose name matches case-insensitively"""
+        return self._by_name.get(name.lower(), ())
+
+    def hazardous(self):
+        return self._hazardous
+
+    def types(self):
+        return tuple(self._by_type)
+
+    def as_dicts(self):
+        """Mutable copies of every record, in catalog order"""
+        return [dict(item) for item in self._records]
+
+
+# Asteroid columns needed to build an API record
+RECORD_FIELDS = (
+    'neo_id', 'name', 'object_type', 'diameter_min', 'diameter_max',
+    'is_potentially_hazardous', 'absolute_magnitude', 'image_url',
+    'close_approach_date', 'velocity_kms', 'miss_distance_km', 'description',
+    'mass_kg', 'kinetic_energy_joules', 'tnt_equivalent_tons', 'crater_diameter_m',
+    'impact_probability', 'richter_equivalent', 'severity_level',
+    'orbit_epoch_jd', 'semi_major_axis_au', 'eccentricity', 'inclination_deg',
+    'ascending_node_deg', 'perihelion_argument_deg', 'mean_anomaly_deg', 'moid_au', 'updated_at',
+)
+
+
+def record_from_values(row):
+    """API record for an ``Asteroid`` row fetched with ``values(*RECORD_FIELDS)``"""
+    velocity = row['velocity_kms']
+    miss_distance = row['miss_distance_km']
+    return {
+        'id': row['neo_id'],
+        'name': row['name'],
+        'type': row['object_type'],
+        'diameter_min': row['diameter_min'] or 0.0,
+        'diameter_max': row['diameter_max'] or 0.0,
+        'is_hazardous': row['is_potentially_hazardous'],
+        'absolute_magnitude': row['absolute_magnitude'],
+        'image_url': row['image_url'] or GENERATED_IMAGE_URL.format(row['neo_id']),
+        'close_approach_date': format_approach_date(row['close_approach_date']),
+        'velocity_kms': DEFAULT_VELOCITY_KMS if velocity is None else velocity,
+        'miss_distance_km': DEFAULT_MISS_DISTANCE_KM if miss_distance is None else miss_distance,
+        'description': row['description'] or generate_simple_description({
+            'name': row['name'],
+            'is_potentially_hazardous_asteroid': row['is_potentially_hazardous'],
+        }),
+        'mass_kg': row['mass_kg'],
+        'kinetic_energy_joules': row['kinetic_energy_joules'],
+        'tnt_equivalent_tons': row['tnt_equivalent_tons'],
+        'crater_diameter_m': row['crater_diameter_m'],
+        'impact_probability': row['impact_probability'],
+        'richter_equivalent': row['richter_equivalent'],
+        'severity_level': row['severity_level'],
+        'orbit_epoch_jd': row['orbit_epoch_jd'],
+        'semi_major_axis_au': row['semi_major_axis_au'],
+        'eccentricity': row['eccentricity'],
+        'inclination_deg': row['inclination_deg'],
+        'ascending_node_deg': row['ascending_node_deg'],
+        'perihelion_argument_deg': row['perihelion_argument_deg'],
+        'mean_anomaly_deg': row['mean_anomaly_deg'],
+        'moid_au': row['moid_au'],
+        'last_updated': row['updated_at'].strftime('%Y-%m-%d %H:%M:%S UTC'),
+    }
+
+
+def _database_records():
+    """Records for every ``Asteroid`` row, in primary key order"""
+    from .models import Asteroid
+
+    rows = Asteroid.objects.order_by('id').values(*RECORD_FIELDS)
+    for row in rows.iterator(chunk_size=5000):
+        yield record_from_values(row)
+
+
+def _database_state():
+    """Cheap fingerprint of the Asteroid table used to notice new ingests"""
+    from .models import Asteroid
+    from django.db.models import Count, Max
+
+    try:
+        state = Asteroid.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    except DatabaseError:
+        return None
+    return state['count'], state['updated']
+
+
+def _with_impact_metrics(records):
+    """Curated records plus the impact columns the database would have stored"""
+    from .impact import materialized_metrics
+
+    metrics = materialized_metrics(
+        [record['diameter_min'] for record in records],
+        [record['diameter_max'] for record in records],
+        [record['velocity_kms'] for record in records],
+        [record['miss_distance_km'] for record in records],
+    )
+    columns = {name: values.tolist() for name, values in metrics.items()}
+    return [
+        {**record, **{name: values[i] for name, values in columns.items()}}
+        for i, record in enumerate(records)
+    ]
+
+
+def load_catalog():
+    """Build a fresh catalog from the database, falling back to the curated objects"""
+    db_state = _database_state()
+    records = []
+    try:
+        records.extend(_database_records())
+    except DatabaseError:
+        logger.warning('Asteroid table unavailable, serving curated catalog only', exc_info=True)
+    # Curated objects fill in whatever the migration has not stored yet
+    known_ids = {record['id'] for record in records}
+    missing = [record for record in BUILTIN_OBJECTS if record['id'] not in known_ids]
+    if missing:
+        records.extend(_with_impact_metrics(missing))
+    catalog = AsteroidCatalog(records, last_modified=db_state[1] if db_state else None)
+    catalog.db_state = db_state
+    return catalog
+
+
+_catalog = None
+_catalog_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the process-wide catalog, loading it on first use
+
+    Every ``CATALOG_REFRESH_SECONDS`` the Asteroid table fingerprint is
+    compared with the one the catalog was built from, so rows written by
+    ``ingest_neo_feed`` in another process show up without a restart.
+    """
+    global _catalog, _catalog_checked_at
+    catalog = _catalog
+    now = time.monotonic()
+    refresh_seconds = getattr(settings, 'CATALOG_REFRESH_SECONDS', 60)
+    if catalog is not None and now - _catalog_checked_at < refresh_seconds:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is not None and now - _catalog_checked_at < refresh_seconds:
+            return _catalog
+        if _catalog is None or _database_state() != _catalog.db_state:
+            _catalog = load_catalog()
+        _catalog_checked_at = time.monotonic()
+        return _catalog
+
+
+def reload_catalog():
+    """Rebuild the process-wide catalog, e.g. after new data was ingested"""
+    global _catalog, _catalog_checked_at
+    catalog = load_catalog()
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_checked_at = time.monotonic()
+    return catalog
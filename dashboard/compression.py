@@ -0,0 +1,141 @@
+"""Conditional GET and precompressed JSON bodies for the catalog API.
+
+A payload is identified by a strong ETag derived from the catalog version
+and the canonical query, so a matching ``If-None-Match`` is answered with a
+304 before any database work. Bodies are compressed at most once per
+encoding and reused until the catalog version changes. gzip output is
+deterministic (``mtime=0``) so every worker produces byte-identical
+representations for the same ETag.
+"""
+import gzip
+import hashlib
+import threading
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth a Content-Encoding round trip
+MIN_COMPRESS_BYTES = 512
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding, available=None):
+    """Best of ``available`` (default: all supported) encodings the client accepts, or None for identity"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.strip().lower()] = quality
+    for encoding in supported_encodings() if available is None else available:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(body, quality=11)
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+
+def query_etag(version, params):
+    """Strong validator for ``params`` against catalog ``version``"""
+    canonical = '&'.join(
+        f'{key}={value}' for key in sorted(params) for value in params.getlist(key)
+    )
+    return hashlib.sha1(f'{version}?{canonical}'.encode()).hexdigest()[:20]
+
+
+def variant_etag(etag, encoding):
+    """Each Content-Encoding is a distinct representation with its own ETag"""
+    return quote_etag(f'{etag}-{encoding}' if encoding else etag)
+
+
+class Payload:
+    """A serialized body plus its lazily built compressed variants"""
+
+    def __init__(self, body, etag, last_modified=None, content_type='application/json'):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self._encoded = {None: body}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        if encoding is not None and len(self.body) < MIN_COMPRESS_BYTES:
+            encoding = None
+        data = self._encoded.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._encoded.get(encoding)
+                if data is None:
+                    data = self._encoded[encoding] = compress(self.body, encoding)
+        return encoding, data
+
+    def precompress(self):
+        """Build every supported variant up front, e.g. before sharing the payload"""
+        for encoding in supported_encodings():
+            self.encoded(encoding)
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def response(self, request):
+        encoding, data = self.encoded(negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        response = HttpResponse(data, content_type=self.content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        return with_validators(response, self.etag, encoding, self.last_modified)
+
+
+def with_validators(response, etag, encoding, last_modified):
+    # no-cache: browsers may store the body but must revalidate it each poll
+    patch_cache_control(response, no_cache=True)
+    response['ETag'] = variant_etag(etag, encoding)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """A 304 if the client's validators match ``etag``/``last_modified``, else None"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        client_etags = parse_etags(if_none_match)
+        ours = {variant_etag(etag, encoding) for encoding in (None, *supported_encodings())}
+        if '*' not in client_etags and ours.isdisjoint(client_etags):
+            return None
+    else:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if since is None or last_modified is None or int(last_modified.timestamp()) > since:
+            return None
+    encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    return with_validators(HttpResponseNotModified(), etag, encoding, last_modified)
+
@@ -0,0 +1,193 @@
+"""Concurrent, resumable HTTP downloads into a directory.
+
+One pooled ``requests.Session`` is shared by a bounded thread pool, with a
+semaphore per host so no single server sees more than ``per_host``
+connections at once. A JSON manifest records the URL, ETag and
+Last-Modified of every completed download; later runs revalidate with
+``If-None-Match``/``If-Modified-Since`` and leave unchanged files alone on
+a 304. A file already in the directory with no manifest entry (placed
+there by hand or by an older version of the command) is left alone. Bodies stream into ``<name>.part`` and are renamed into place when
+complete, so an interrupted transfer resumes with a ``Range`` request
+(guarded by ``If-Range``) instead of starting over. The manifest and the
+partial files live in a separate state directory, so a download into a
+static files directory never publishes them.
+"""
+import errno
+import json
+import os
+import shutil
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MANIFEST_NAME = 'manifest.json'
+CHUNK_SIZE = 16 * 1024
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# status: 'downloaded', 'resumed', 'not_modified', 'existing' or 'failed'
+DownloadResult = namedtuple('DownloadResult', 'key filename url status bytes error')
+
+
+def make_session(pool_size):
+    """Session whose connection pool per host holds ``pool_size`` keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class Downloader:
+    """Fetches ``{key: (filename, [urls...])}`` into ``directory``, trying each URL in turn
+
+    The manifest and ``.part`` files go to ``state_dir`` (``directory`` itself if not given).
+    """
+
+    def __init__(self, directory, workers=8, per_host=2, timeout=10, session=None, state_dir=None):
+        self.directory = directory
+        self.state_dir = state_dir or directory
+        self.workers = workers
+        self.timeout = timeout
+        self.session = session or make_session(max(workers, per_host))
+        self.manifest = load_manifest(self.state_dir)
+        self._manifest_lock = threading.Lock()
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_slots_lock = threading.Lock()
+
+    def run(self, jobs, on_result=None):
+        """Download every job; returns the results in completion order"""
+        os.makedirs(self.directory, exist_ok=True)
+        os.makedirs(self.state_dir, exist_ok=True)
+        results = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self.fetch, key, filename, urls) for key, (filename, urls) in jobs.items()]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        finally:
+            # Also after an interruption, so partial files keep the validators needed to resume
+            with self._manifest_lock:
+                save_manifest(self.state_dir, self.manifest)
+        return results
+
+    def fetch(self, key, filename, urls):
+        with self._manifest_lock:
+            known = filename in self.manifest
+        # Without validators there is nothing to revalidate against
+        if not known and os.path.exists(os.path.join(self.directory, filename)):
+            return DownloadResult(key, filename, None, 'existing', 0, None)
+        error = None
+        for url in urls:
+            try:
+                with self._host_slot(url):
+                    status, size = self._fetch_url(filename, url)
+                return DownloadResult(key, filename, url, status, size, None)
+            except (requests.RequestException, OSError, ValueError) as e:
+                error = str(e)
+        return DownloadResult(key, filename, None, 'failed', 0, error)
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self._host_slots_lock:
+            return self._host_slots[host]
+
+    def _fetch_url(self, filename, url):
+        path = os.path.join(self.directory, filename)
+        part_path = os.path.join(self.state_dir, f'{filename}.part')
+        with self._manifest_lock:
+            entry = dict(self.manifest.get(filename) or {})
+        # Validators only describe the file we have if it came from this URL
+        if entry.get('url') != url:
+            entry = {}
+
+        headers = {}
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = entry.get('etag') or entry.get('last_modified')
+        if offset and entry.get('partial') and validator:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = validator
+        elif os.path.exists(path) and not entry.get('partial'):
+            offset = 0
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        else:
+            offset = 0
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304:
+                return 'not_modified', 0
+            response.raise_for_status()
+            resumed = response.status_code == 206 and _range_start(response) == offset
+            if response.status_code == 206 and not resumed:
+                raise ValueError(f'Unexpected Content-Range {response.headers.get("Content-Range")!r}')
+
+            previous = entry if resumed else {}
+            entry = {
+                'url': url,
+                'etag': response.headers.get('ETag', previous.get('etag')),
+                'last_modified': response.headers.get('Last-Modified', previous.get('last_modified')),
+                'partial': True,
+            }
+            with self._manifest_lock:
+                self.manifest[filename] = entry
+            size = 0
+            with open(part_path, 'ab' if resumed else 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+
+        _move_into_place(part_path, path)
+        with self._manifest_lock:
+            self.manifest[filename] = {**entry, 'partial': False, 'size': os.path.getsize(path),
+                                       'downloaded_at': time.time()}
+        return ('resumed' if resumed else 'downloaded'), size
+
+
+def _move_into_place(source, target):
+    """Atomically replace ``target`` with ``source``, also when the state directory is on another filesystem"""
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        tmp_path = f'{target}.{os.getpid()}.tmp'
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+        os.remove(source)
+
+
+def _range_start(response):
+    """First byte offset of a 206 response's Content-Range, or None if it is malformed"""
+    value = response.headers.get('Content-Range', '')
+    unit, _, spec = value.partition(' ')
+    try:
+        return int(spec.split('-', 1)[0]) if unit == 'bytes' else None
+    except ValueError:
+        return None
@@ -0,0 +1,247 @@
+"""Server-Sent Events for live catalog changes.
+
+Each server process runs one watcher task per event loop while anyone is
+subscribed. It reloads the catalog when an ingestion command calls
+``notify_catalog_changed`` (which touches ``CATALOG_NOTIFY_FILE``) or when
+the regular fingerprint check notices new rows. It then diffs the old and
+new catalog into change events: added asteroids, hazard flag changes, moved
+close approaches, and a final ``catalog`` version bump.
+
+Events fan out to a bounded asyncio queue per connection and are kept in a
+short history, so reconnecting clients resume from ``Last-Event-ID``. Event
+ids are ``<token>-<sequence>`` with a random token per process, so an id
+issued by another worker or before a restart is recognised as foreign. That
+client (or one whose last event has left the history) gets a single
+``catalog`` event with ``resync: true`` and reloads instead. The
+stream is served by a small ASGI app wrapped around Django
+(``with_event_stream``) rather than a view: an idle connection is only a
+queue and a suspended coroutine, and the app sees ``http.disconnect``
+itself, which Django 4.2's ASGI handler does not report to streaming views.
+"""
+import asyncio
+import itertools
+import json
+import os
+import time
+import uuid
+from collections import deque, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .catalog import get_catalog, reload_catalog
+
+EVENTS_PATH = '/api/events/'
+EVENT_HISTORY = 1000
+SUBSCRIBER_QUEUE_SIZE = 256
+MAX_CHANGES_PER_EVENT = 500
+KEEPALIVE_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+APPROACH_FIELDS = ('close_approach_date', 'velocity_kms', 'miss_distance_km')
+
+Event = namedtuple('Event', 'sequence payload')
+
+
+def format_event(name, data, event_id=None):
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines += [f'event: {name}', f'data: {json.dumps(data)}']
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+def notify_catalog_changed():
+    """Tell running servers the Asteroid table changed; called by ingestion commands"""
+    path = str(settings.CATALOG_NOTIFY_FILE)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'at': time.time(), 'pid': os.getpid()}, f)
+    os.replace(tmp_path, path)
+
+
+def _notify_mtime():
+    try:
+        return os.stat(settings.CATALOG_NOTIFY_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def catalog_changes(old, new):
+    """(event name, data) pairs describing how catalog ``new`` differs from ``old``"""
+    added, hazard, approaches = [], [], []
+    for record in new:
+        before = old.get(record['id'])
+        if before is None:
+            added.append({'id': record['id'], 'name': record['name'], 'is_hazardous': record['is_hazardous']})
+            continue
+        if before['is_hazardous'] != record['is_hazardous']:
+            hazard.append({'id': record['id'], 'name': record['name'], 'is_hazardous': record['is_hazardous']})
+        if any(before.get(field) != record.get(field) for field in APPROACH_FIELDS):
+            approaches.append({
+                'id': record['id'],
+                'name': record['name'],
+                **{field: record.get(field) for field in APPROACH_FIELDS},
+            })
+
+    events = []
+    for name, items in (('asteroid_added', added), ('hazard_changed', hazard), ('close_approach', approaches)):
+        if items:
+            events.append((name, {
+                'count': len(items),
+                'truncated': len(items) > MAX_CHANGES_PER_EVENT,
+                'items': items[:MAX_CHANGES_PER_EVENT],
+            }))
+    events.append(('catalog', {**catalog_summary(new), 'previous_version': old.version}))
+    return events
+
+
+def catalog_summary(catalog):
+    return {
+        'version': catalog.version,
+        'total_count': len(catalog),
+        'hazardous_count': len(catalog.hazardous()),
+    }
+
+
+class EventBroker:
+    """Fans published events out to subscriber queues on one event loop"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._history = deque(maxlen=EVENT_HISTORY)
+        self.token = uuid.uuid4().hex[:12]
+        self._sequences = itertools.count(1)
+        self.last_sequence = 0
+        self._watcher = None
+
+    def event_id(self, sequence):
+        return f'{self.token}-{sequence}'
+
+    def subscribe(self, last_event_id=None):
+        """(queue, events missed since ``last_event_id``, or None if the client must resync)"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        self._ensure_watcher()
+        if last_event_id is None:
+            return queue, []
+        token, _, sequence = last_event_id.rpartition('-')
+        if token != self.token or not sequence.isdigit() or int(sequence) > self.last_sequence:
+            # Issued by another process or before a restart
+            return queue, None
+        sequence = int(sequence)
+        missed = [event for event in self._history if event.sequence > sequence]
+        if sequence < self.last_sequence and missed[0].sequence != sequence + 1:
+            # Events after the client's last one have already left the history
+            return queue, None
+        return queue, missed
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, name, data):
+        sequence = self.last_sequence = next(self._sequences)
+        event = Event(sequence, format_event(name, data, self.event_id(sequence)))
+        self._history.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up: end its stream; it resumes from Last-Event-ID
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _ensure_watcher(self):
+        loop = asyncio.get_running_loop()
+        if self._watcher is None or self._watcher.done() or self._watcher.get_loop() is not loop:
+            self._watcher = loop.create_task(self._watch())
+
+    async def _watch(self):
+        poll_seconds = getattr(settings, 'EVENTS_POLL_SECONDS', 2)
+        catalog = await sync_to_async(get_catalog, thread_sensitive=False)()
+        notified = _notify_mtime()
+        while self._subscribers:
+            await asyncio.sleep(poll_seconds)
+            mtime = _notify_mtime()
+            if mtime != notified:
+                notified = mtime
+                latest = await sync_to_async(reload_catalog, thread_sensitive=False)()
+            else:
+                latest = await sync_to_async(get_catalog, thread_sensitive=False)()
+            if latest.version != catalog.version:
+                changes = await sync_to_async(catalog_changes, thread_sensitive=False)(catalog, latest)
+                for name, data in changes:
+                    self.publish(name, data)
+                catalog = latest
+
+
+broker = EventBroker()
+
+
+def _last_event_id(scope):
+    for name, value in scope.get('headers', ()):
+        if name == b'last-event-id':
+            return value.decode('latin-1')
+    return None
+
+
+async def stream_events(scope, receive, send):
+    """ASGI handler for the event stream"""
+    if scope['method'] != 'GET':
+        await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    queue, backlog = broker.subscribe(_last_event_id(scope))
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        catalog = await sync_to_async(get_catalog, thread_sensitive=False)()
+        summary = catalog_summary(catalog)
+        if backlog is None:
+            # The missed events are unknown: send the current state under the latest id
+            catch_up = format_event('catalog', {**summary, 'previous_version': None, 'resync': True},
+                                    broker.event_id(broker.last_sequence))
+        else:
+            catch_up = b''.join(event.payload for event in backlog)
+        body = f'retry: {RETRY_MILLISECONDS}\n\n'.encode() + format_event('hello', summary) + catch_up
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        while True:
+            next_event = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({next_event, disconnected}, timeout=KEEPALIVE_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_event.cancel()
+                return
+            if next_event not in done:
+                next_event.cancel()
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                continue
+            event = next_event.result()
+            if event is None:
+                break
+            await send({'type': 'http.response.body', 'body': event.payload, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        broker.unsubscribe(queue)
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def with_event_stream(application):
+    """Serve ``EVENTS_PATH`` directly and hand every other request to ``application``"""
+    async def app(scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+            await stream_events(scope, receive, send)
+        else:
+            await application(scope, receive, send)
+    return app
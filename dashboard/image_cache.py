@@ -0,0 +1,82 @@
+"""On-demand procedural asteroid images.
+
+``/images/asteroid/<id>.svg`` renders the catalog object with the same
+renderer as ``generate_accurate_images`` the first time it is requested.
+Images are addressed by the hash of their inputs (renderer version, style,
+id, shape/size/texture/crater data), which doubles as the ETag. Rendered
+bodies are kept in a bounded per-process LRU and written to
+``ASTEROID_IMAGE_CACHE_DIR`` so other workers and restarts read them instead
+of rendering again. A changed catalog record hashes differently and gets a
+new file; deleting the directory is always safe.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .compression import Payload
+from .imagegen import input_hash, render_svg, write_if_changed
+
+IMAGE_STYLE = 'accurate'
+IMAGE_CACHE_ENTRIES = 1024
+# Browsers and proxies reuse an image for a week, then revalidate by ETag
+IMAGE_MAX_AGE = 7 * 24 * 3600
+IMAGE_STALE_WHILE_REVALIDATE = 24 * 3600
+
+
+def image_cache_control(response):
+    response['Cache-Control'] = (
+        f'public, max-age={IMAGE_MAX_AGE}, stale-while-revalidate={IMAGE_STALE_WHILE_REVALIDATE}'
+    )
+    return response
+
+
+class ImageCache:
+    """Rendered SVG payloads by input hash: memory LRU, then disk, then render"""
+
+    def __init__(self, style=IMAGE_STYLE, max_entries=IMAGE_CACHE_ENTRIES, directory=None):
+        self.style = style
+        self.max_entries = max_entries
+        self._directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.renders = 0
+
+    @property
+    def directory(self):
+        return str(self._directory or settings.ASTEROID_IMAGE_CACHE_DIR)
+
+    def etag(self, key, data):
+        return input_hash(self.style, key, data)[:20]
+
+    def path(self, inputs):
+        return os.path.join(self.directory, inputs[:2], f'{inputs}.svg')
+
+    def get(self, key, data):
+        inputs = input_hash(self.style, key, data)
+        with self._lock:
+            payload = self._entries.get(inputs)
+            if payload is not None:
+                self._entries.move_to_end(inputs)
+                return payload
+
+        path = self.path(inputs)
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            body = render_svg(self.style, key, data).encode()
+            self.renders += 1
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_if_changed(path, body.decode())
+            except OSError:
+                pass  # A read-only disk only costs a render per process
+
+        payload = Payload(body, inputs[:20], content_type='image/svg+xml')
+        with self._lock:
+            self._entries[inputs] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
@@ -0,0 +1,437 @@
+"""Procedural SVG images of asteroids, rendered in parallel and incrementally.
+
+Every image is a pure function of its key, its data dict and the renderer
+style: randomness (star field, craters, ice) comes from a ``random.Random``
+seeded by the style and key, so the same inputs always give byte-identical
+output. A manifest in the output directory records the input hash and the
+content hash of every file; unchanged inputs are skipped without rendering,
+and a rendered image only touches the disk when its content hash differs.
+
+Jobs are split into chunks that pool workers render and write themselves.
+The module imports no Django code so forkserver workers start light.
+"""
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from xml.sax.saxutils import escape
+
+MANIFEST_NAME = 'svg-manifest.json'
+# Bump when a renderer changes so every image is regenerated
+RENDERER_VERSION = 2
+
+SIZE_MAP = {'tiny': 40, 'small': 60, 'medium': 80, 'large': 100, 'huge': 120, 'massive': 140}
+
+CATALOG_SHAPES = ('round', 'elongated', 'diamond', 'peanut', 'irregular', 'binary')
+CATALOG_TEXTURES = ('rocky', 'carbon', 'rubble', 'regolith', 'metallic', 'basaltic')
+CATALOG_COLORS = ('#696969', '#8B7355', '#A0522D', '#708090', '#4A4A4A', '#CD853F', '#778899')
+HAZARDOUS_COLORS = ('#8B0000', '#FF4500', '#FF6347', '#B22222')
+# (upper diameter bound in km, size name)
+CATALOG_SIZES = ((0.05, 'tiny'), (0.3, 'small'), (1.0, 'medium'), (5.0, 'large'), (100.0, 'huge'))
+
+
+def _seed(*parts):
+    return int.from_bytes(hashlib.sha256(':'.join(map(str, parts)).encode()).digest()[:8], 'big')
+
+
+def object_rng(style, key):
+    """Random generator seeded by the renderer style and object key"""
+    return random.Random(_seed(style, key))
+
+
+def lighten_color(hex_color, factor=1.4):
+    hex_color = hex_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    lighter_rgb = tuple(min(255, int(c * factor)) for c in rgb)
+    return f"#{lighter_rgb[0]:02x}{lighter_rgb[1]:02x}{lighter_rgb[2]:02x}"
+
+
+def darken_color(hex_color, factor=0.6):
+    hex_color = hex_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    darker_rgb = tuple(max(0, int(c * factor)) for c in rgb)
+    return f"#{darker_rgb[0]:02x}{darker_rgb[1]:02x}{darker_rgb[2]:02x}"
+
+
+def catalog_image_data(record):
+    """Renderer data for a catalog record: type and size drive the shape, hazard the palette"""
+    choice = random.Random(_seed('catalog', record['id']))
+    diameter = record.get('diameter_max') or 0.0
+    size = next((name for bound, name in CATALOG_SIZES if diameter < bound), 'massive')
+    object_type = (record.get('type') or '').lower()
+    if 'comet' in object_type:
+        shape, texture = 'comet', 'icy'
+    elif 'meteor' in object_type:
+        shape, texture = 'fragment', 'stony'
+    else:
+        shape, texture = choice.choice(CATALOG_SHAPES), choice.choice(CATALOG_TEXTURES)
+    palette = HAZARDOUS_COLORS if record.get('is_hazardous') else CATALOG_COLORS
+    return {
+        'name': record['name'],
+        'color': choice.choice(palette),
+        'shape': shape,
+        'size': size,
+        'texture': texture,
+        'craters': 0 if shape in ('comet', 'fragment') else min(2 + SIZE_MAP[size] // 20, 12),
+    }
+
+
+# "accurate" style: size, texture and surface features
+
+def render_accurate_svg(key, data):
+    """Accurate SVG based on real asteroid characteristics"""
+    rng = object_rng('accurate', key)
+    name = escape(data['name'])
+    color = data['color']
+    shape = data['shape']
+    size = data['size']
+    texture = data['texture']
+    craters = data['craters']
+    base_size = SIZE_MAP.get(size, 80)
+
+    return f'''<svg width="400" height="300" xmlns="http://www.w3.org/2000/svg">
+    <defs>
+        <radialGradient id="spaceGrad" cx="50%" cy="50%" r="50%">
+            <stop offset="0%" style="stop-color:#0a0a1a;stop-opacity:1" />
+            <stop offset="100%" style="stop-color:#000000;stop-opacity:1" />
+        </radialGradient>
+        <radialGradient id="asteroidGrad" cx="30%" cy="30%" r="70%">
+            <stop offset="0%" style="stop-color:{lighten_color(color)};stop-opacity:1" />
+            <stop offset="70%" style="stop-color:{color};stop-opacity:1" />
+            <stop offset="100%" style="stop-color:{darken_color(color)};stop-opacity:1" />
+        </radialGradient>
+        <filter id="glow">
+            <feGaussianBlur stdDeviation="2" result="coloredBlur"/>
+            <feMerge>
+                <feMergeNode in="coloredBlur"/>
+                <feMergeNode in="SourceGraphic"/>
+            </feMerge>
+        </filter>
+        <filter id="roughness">
+            <feTurbulence baseFrequency="0.9" numOctaves="4" result="noise"/>
+            <feDisplacementMap in="SourceGraphic" in2="noise" scale="3"/>
+        </filter>
+    </defs>
+
+    <!-- Deep space background -->
+    <rect width="100%" height="100%" fill="url(#spaceGrad)"/>
+
+    <!-- Realistic stars -->
+    {realistic_stars(rng)}
+
+    <!-- Main asteroid shape -->
+    {accurate_shape(shape, color, base_size)}
+
+    <!-- Surface features -->
+    {surface_features(rng, craters, shape, base_size, texture)}
+
+    <!-- Name label with glow -->
+    <text x="200" y="280" text-anchor="middle" fill="#ffffff" font-family="Arial, sans-serif"
+          font-size="14" font-weight="bold" filter="url(#glow)">{name}</text>
+
+    <!-- Size indicator -->
+    <text x="200" y="295" text-anchor="middle" fill="#cccccc" font-family="Arial, sans-serif"
+          font-size="10">{size.title()} • {texture.title()}</text>
+</svg>'''
+
+
+def realistic_stars(rng):
+    stars = []
+    for i in range(30):
+        x = rng.randint(10, 390)
+        y = rng.randint(10, 250)
+        size = rng.choice([0.5, 1, 1.5, 2])
+        brightness = rng.uniform(0.3, 1.0)
+        color = rng.choice(['#ffffff', '#ffffcc', '#ccccff', '#ffcccc'])
+        stars.append(f'<circle cx="{x}" cy="{y}" r="{size}" fill="{color}" opacity="{brightness}"/>')
+    return '\n    '.join(stars)
+
+
+def accurate_shape(shape, color, base_size):
+    center_x, center_y = 200, 150
+    dark = darken_color(color)
+
+    if shape == 'round':
+        return f'<circle cx="{center_x}" cy="{center_y}" r="{base_size}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+    elif shape == 'elongated':
+        return f'<ellipse cx="{center_x}" cy="{center_y}" rx="{base_size * 1.4}" ry="{base_size * 0.7}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+    elif shape == 'diamond':
+        points = f"{center_x},{center_y - base_size} {center_x + base_size * 0.8},{center_y} {center_x},{center_y + base_size} {center_x - base_size * 0.8},{center_y}"
+        return f'<polygon points="{points}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+    elif shape == 'peanut':
+        return f'''<ellipse cx="{center_x - 25}" cy="{center_y - 20}" rx="{base_size * 0.6}" ry="{base_size * 0.8}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>
+                      <ellipse cx="{center_x + 25}" cy="{center_y + 20}" rx="{base_size * 0.6}" ry="{base_size * 0.8}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'''
+
+    elif shape == 'irregular':
+        points = f"{center_x - base_size},{center_y - 40} {center_x + base_size * 1.2},{center_y - 20} {center_x + base_size * 0.8},{center_y + 60} {center_x - 20},{center_y + base_size} {center_x - base_size * 1.1},{center_y + 20}"
+        return f'<polygon points="{points}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+    elif shape == 'comet':
+        nucleus = f'<ellipse cx="{center_x - 50}" cy="{center_y}" rx="{base_size * 0.4}" ry="{base_size * 0.5}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2"/>'
+        tail = f'<path d="M {center_x - 10} {center_y} Q {center_x + 80} {center_y - 30} {center_x + 150} {center_y - 10}" stroke="{color}" stroke-width="12" fill="none" opacity="0.6"/>'
+        tail2 = f'<path d="M {center_x - 10} {center_y} Q {center_x + 100} {center_y + 20} {center_x + 180} {center_y + 30}" stroke="{lighten_color(color)}" stroke-width="8" fill="none" opacity="0.4"/>'
+        return nucleus + tail + tail2
+
+    elif shape == 'fragment':
+        fragments = []
+        for i in range(3):
+            x = center_x + (i - 1) * 30
+            y = center_y + (i - 1) * 20
+            size = base_size * (0.3 + i * 0.2)
+            fragments.append(f'<polygon points="{x - size},{y - size * 0.5} {x + size},{y - size * 0.3} {x + size * 0.7},{y + size} {x - size * 0.8},{y + size * 0.6}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="1"/>')
+        return '\n                      '.join(fragments)
+
+    elif shape == 'binary':
+        primary = f'<circle cx="{center_x - 30}" cy="{center_y}" r="{base_size * 0.8}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+        secondary = f'<circle cx="{center_x + 40}" cy="{center_y}" r="{base_size * 0.4}" fill="{color}" opacity="0.8" stroke="{dark}" stroke-width="1"/>'
+        return primary + secondary
+
+    elif shape == 'cigar':
+        return f'<ellipse cx="{center_x}" cy="{center_y}" rx="{base_size * 2}" ry="{base_size * 0.3}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+    else:
+        return f'<circle cx="{center_x}" cy="{center_y}" r="{base_size}" fill="url(#asteroidGrad)" stroke="{dark}" stroke-width="2" filter="url(#roughness)"/>'
+
+
+def surface_features(rng, crater_count, shape, base_size, texture):
+    if crater_count == 0:
+        return ''
+
+    features = []
+    for i in range(crater_count):
+        if shape == 'round':
+            x = rng.randint(160, 240)
+            y = rng.randint(110, 190)
+        elif shape == 'elongated':
+            x = rng.randint(120, 280)
+            y = rng.randint(120, 180)
+        else:
+            x = rng.randint(150, 250)
+            y = rng.randint(120, 180)
+
+        crater_size = rng.randint(3, min(15, base_size // 6))
+
+        # Crater with rim and shadow
+        features.append(f'<circle cx="{x}" cy="{y}" r="{crater_size}" fill="#000000" opacity="0.6"/>')
+        features.append(f'<circle cx="{x}" cy="{y}" r="{crater_size + 1}" fill="none" stroke="#666666" stroke-width="0.5" opacity="0.8"/>')
+
+    # Add texture based on material
+    if texture == 'metallic':
+        features.append('<ellipse cx="180" cy="130" rx="20" ry="8" fill="#ffffff" opacity="0.3"/>')
+    elif texture == 'icy':
+        for i in range(5):
+            x = rng.randint(170, 230)
+            y = rng.randint(130, 170)
+            features.append(f'<circle cx="{x}" cy="{y}" r="2" fill="#ffffff" opacity="0.7"/>')
+
+    return '\n    '.join(features)
+
+
+# "classic" style: the original neon-labelled cards
+
+def render_classic_svg(key, data):
+    """Unique SVG for each asteroid in the original card style"""
+    rng = object_rng('classic', key)
+    name = escape(data['name'])
+    color = data['color']
+    shape = data['shape']
+    craters = data['craters']
+
+    return f'''<svg width="400" height="300" xmlns="http://www.w3.org/2000/svg">
+    <defs>
+        <radialGradient id="spaceGrad" cx="50%" cy="50%" r="50%">
+            <stop offset="0%" style="stop-color:#1a1a2e;stop-opacity:1" />
+            <stop offset="100%" style="stop-color:#0a0a0a;stop-opacity:1" />
+        </radialGradient>
+        <radialGradient id="asteroidGrad" cx="30%" cy="30%" r="70%">
+            <stop offset="0%" style="stop-color:{lighten_color(color, 1.3)};stop-opacity:1" />
+            <stop offset="100%" style="stop-color:{color};stop-opacity:1" />
+        </radialGradient>
+        <filter id="glow">
+            <feGaussianBlur stdDeviation="3" result="coloredBlur"/>
+            <feMerge>
+                <feMergeNode in="coloredBlur"/>
+                <feMergeNode in="SourceGraphic"/>
+            </feMerge>
+        </filter>
+    </defs>
+
+    <!-- Space background -->
+    <rect width="100%" height="100%" fill="url(#spaceGrad)"/>
+
+    <!-- Stars -->
+    {classic_stars(rng)}
+
+    <!-- Asteroid shape -->
+    {classic_shape(shape, color)}
+
+    <!-- Craters -->
+    {classic_craters(rng, craters, shape)}
+
+    <!-- Name label -->
+    <text x="200" y="280" text-anchor="middle" fill="#00ffff" font-family="Orbitron, monospace" font-size="16" font-weight="bold" filter="url(#glow)">{name}</text>
+</svg>'''
+
+
+def classic_stars(rng):
+    stars = []
+    for i in range(20):
+        x = rng.randint(10, 390)
+        y = rng.randint(10, 250)
+        size = rng.choice([1, 1.5, 2])
+        opacity = rng.uniform(0.3, 1.0)
+        stars.append(f'<circle cx="{x}" cy="{y}" r="{size}" fill="#ffffff" opacity="{opacity}"/>')
+    return '\n    '.join(stars)
+
+
+def classic_shape(shape, color):
+    if shape == 'round':
+        return f'<circle cx="200" cy="150" r="80" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+    elif shape == 'elongated':
+        return f'<ellipse cx="200" cy="150" rx="100" ry="60" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+    elif shape == 'diamond':
+        return f'<polygon points="200,70 280,150 200,230 120,150" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+    elif shape == 'peanut':
+        return f'''<ellipse cx="170" cy="130" rx="40" ry="60" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>
+                      <ellipse cx="230" cy="170" rx="40" ry="60" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'''
+    elif shape == 'irregular':
+        return f'<polygon points="150,100 250,90 280,140 260,200 180,220 120,180 130,120" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+    elif shape == 'comet':
+        return f'''<ellipse cx="180" cy="150" rx="30" ry="40" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>
+                      <path d="M 210 150 Q 300 120 350 100" stroke="{color}" stroke-width="8" fill="none" opacity="0.6"/>
+                      <path d="M 210 150 Q 320 140 380 130" stroke="{lighten_color(color, 1.3)}" stroke-width="4" fill="none" opacity="0.4"/>'''
+    elif shape == 'fragment':
+        return f'''<polygon points="180,120 220,110 240,140 230,170 190,180 160,160" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>
+                      <polygon points="240,130 270,125 280,150 260,170 240,165" fill="{color}" opacity="0.8"/>'''
+    elif shape == 'metallic':
+        return f'<circle cx="200" cy="150" r="75" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="3" opacity="0.9"/>'
+    elif shape == 'binary':
+        return f'''<circle cx="170" cy="150" r="50" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>
+                      <circle cx="240" cy="150" r="25" fill="{color}" opacity="0.8"/>'''
+    elif shape == 'cigar':
+        return f'<ellipse cx="200" cy="150" rx="120" ry="25" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+    else:
+        return f'<circle cx="200" cy="150" r="70" fill="url(#asteroidGrad)" stroke="{color}" stroke-width="2"/>'
+
+
+def classic_craters(rng, count, shape):
+    if count == 0:
+        return ''
+
+    craters = []
+    for i in range(count):
+        if shape == 'round':
+            x = rng.randint(140, 260)
+            y = rng.randint(90, 210)
+        elif shape == 'elongated':
+            x = rng.randint(120, 280)
+            y = rng.randint(110, 190)
+        else:
+            x = rng.randint(150, 250)
+            y = rng.randint(100, 200)
+
+        size = rng.randint(5, 15)
+        craters.append(f'<circle cx="{x}" cy="{y}" r="{size}" fill="#000000" opacity="0.4"/>')
+
+    return '\n    '.join(craters)
+
+
+RENDERERS = {
+    'accurate': render_accurate_svg,
+    'classic': render_classic_svg,
+}
+
+
+def render_svg(style, key, data):
+    return RENDERERS[style](key, data)
+
+
+def input_hash(style, key, data):
+    """Hash of everything an image depends on"""
+    payload = json.dumps([RENDERER_VERSION, style, str(key), data], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, content, previous_hash=None):
+    """Write ``content`` atomically unless the file already holds it; returns (content hash, written)"""
+    data = content.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    if previous_hash == digest and os.path.exists(path):
+        return digest, False
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return digest, True
+
+
+def render_chunk(directory, style, jobs):
+    """Render and write [(key, filename, data, input hash, previous content hash)]; runs in pool workers"""
+    results = []
+    for key, filename, data, inputs, previous_hash in jobs:
+        digest, written = write_if_changed(os.path.join(directory, filename),
+                                           render_svg(style, key, data), previous_hash)
+        results.append((filename, inputs, digest, written))
+    return results
+
+
+def generate_images(directory, style, objects, workers=1, chunk_size=500, force=False, on_progress=None):
+    """Render ``{key: data}`` into ``<directory>/<key>.svg``; returns counts of written, unchanged and skipped"""
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    counts = {'written': 0, 'unchanged': 0, 'skipped': 0}
+    pending = []
+    for key, data in objects.items():
+        filename = f'{key}.svg'
+        inputs = input_hash(style, key, data)
+        entry = manifest.get(filename) or {}
+        if not force and entry.get('inputs') == inputs and os.path.exists(os.path.join(directory, filename)):
+            counts['skipped'] += 1
+            continue
+        pending.append((key, filename, data, inputs, entry.get('content')))
+
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+
+    def collect(results):
+        for filename, inputs, digest, written in results:
+            manifest[filename] = {'inputs': inputs, 'content': digest}
+            counts['written' if written else 'unchanged'] += 1
+        if on_progress is not None:
+            on_progress(counts, len(pending))
+
+    started = time.perf_counter()
+    try:
+        if workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                collect(render_chunk(directory, style, chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('forkserver')) as pool:
+                futures = [pool.submit(render_chunk, directory, style, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        save_manifest(directory, manifest)
+    counts['elapsed'] = time.perf_counter() - started
+    return counts
@@ -0,0 +1,200 @@
+"""Vectorized impact model.
+
+``impact_batch`` evaluates the same formulas as the per-asteroid analysis
+on whole columns at once, so ranking thousands of objects is one NumPy pass
+instead of a Python loop. ``calculate_impact_analysis`` is the single-object
+view of the same model.
+"""
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from .catalog import DEFAULT_MISS_DISTANCE_KM, DEFAULT_VELOCITY_KMS
+
+DEFAULT_DENSITY = 2.6  # g/cm³ typical asteroid density
+EARTH_RADIUS_KM = 6371
+GM_EARTH = 6.67e-11 * 5.97e24
+JOULES_PER_TON_TNT = 4.184e9
+
+# Size classes shared with the environmental scenarios; each bound is the
+# upper diameter (km) of the class at the same position
+SEVERITY_LEVELS = ('minimal', 'local', 'regional', 'continental', 'global')
+SEVERITY_DIAMETERS_KM = (0.01, 0.05, 0.15, 1.0)
+
+IMPACT_FIELDS = (
+    'mass_kg',
+    'kinetic_energy_joules',
+    'atmospheric_entry_energy_joules',
+    'tnt_equivalent_tons',
+    'crater_diameter_m',
+    'crater_depth_m',
+    'impact_probability',
+    'fireball_radius_km',
+    'radiation_radius_km',
+    'overpressure_radius_km',
+    'thermal_radius_km',
+    'richter_equivalent',
+    'airburst_altitude_km',
+    'gravitational_enhancement',
+)
+# Outputs also stored on each Asteroid row so SQL can sort and filter by them
+MATERIALIZED_FIELDS = (
+    'mass_kg',
+    'kinetic_energy_joules',
+    'tnt_equivalent_tons',
+    'crater_diameter_m',
+    'impact_probability',
+    'richter_equivalent',
+)
+
+
+def impact_batch(diameter_km, velocity_kms, density=DEFAULT_DENSITY, miss_distance_km=DEFAULT_MISS_DISTANCE_KM,
+                 entry_angle_deg=None):
+    """Impact outputs for every object; inputs are broadcastable arrays or scalars
+
+    ``entry_angle_deg`` (from the horizontal) scales the crater by
+    sin(angle)^(1/3); None means a vertical impact.
+    """
+    diameter = np.asarray(diameter_km, dtype=np.float64)
+    velocity = np.asarray(velocity_kms, dtype=np.float64)
+    density = np.asarray(density, dtype=np.float64)
+    miss_distance = np.asarray(miss_distance_km, dtype=np.float64)
+    diameter, velocity, density, miss_distance = np.broadcast_arrays(diameter, velocity, density, miss_distance)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Mass (kg) from a spherical body
+        volume = (4 / 3) * np.pi * ((diameter * 1000) / 2) ** 3  # m³
+        mass = volume * density * 1000
+        kinetic_energy = 0.5 * mass * (velocity * 1000) ** 2
+        tnt_equivalent = kinetic_energy / JOULES_PER_TON_TNT
+
+        # Melosh impact cratering
+        crater_diameter = 1.8 * (diameter * 1000) ** 0.78 * velocity ** 0.44 * (density / 2650) ** 0.33
+        if entry_angle_deg is not None:
+            crater_diameter = crater_diameter * np.sin(np.radians(entry_angle_deg)) ** (1 / 3)
+        crater_depth = crater_diameter / 5
+
+        # Gravitational focusing
+        gravitational_cross_section = np.pi * (EARTH_RADIUS_KM + (2 * GM_EARTH) / (velocity * 1000) ** 2) ** 2
+        geometric_cross_section = np.pi * EARTH_RADIUS_KM ** 2
+        gravitational_enhancement = gravitational_cross_section / geometric_cross_section
+
+        base = (EARTH_RADIUS_KM / miss_distance) ** 2
+        impact_probability = np.select(
+            [miss_distance < EARTH_RADIUS_KM, miss_distance < 100000],
+            [100.0, np.minimum(99.9, base * 100 * gravitational_enhancement)],
+            np.maximum(0.0001, base * 0.1),
+        )
+
+        # Damage radii (km)
+        fireball_radius = 0.28 * tnt_equivalent ** 0.33
+        radiation_radius = 1.24 * tnt_equivalent ** 0.38
+        overpressure_radius = 2.2 * tnt_equivalent ** 0.33
+        thermal_radius = 3.5 * tnt_equivalent ** 0.41
+
+        richter_equivalent = np.minimum(10.0, 4.0 + np.log10(np.maximum(1, tnt_equivalent)) / 2)
+
+    return {
+        'mass_kg': mass,
+        'kinetic_energy_joules': kinetic_energy,
+        'atmospheric_entry_energy_joules': kinetic_energy * 0.7,  # 70% survives atmosphere
+        'tnt_equivalent_tons': tnt_equivalent,
+        'crater_diameter_m': crater_diameter,
+        'crater_depth_m': crater_depth,
+        'impact_probability': impact_probability,
+        'fireball_radius_km': fireball_radius,
+        'radiation_radius_km': radiation_radius,
+        'overpressure_radius_km': overpressure_radius,
+        'thermal_radius_km': thermal_radius,
+        'richter_equivalent': richter_equivalent,
+        'airburst_altitude_km': np.maximum(0, 10 - diameter),
+        'gravitational_enhancement': gravitational_enhancement,
+    }
+
+
+def calculate_impact_analysis(asteroid):
+    """Calculate comprehensive impact analysis with enhanced accuracy"""
+    return dict(_impact_analysis(
+        (asteroid['diameter_min'] + asteroid['diameter_max']) / 2,
+        asteroid.get('velocity_kms', DEFAULT_VELOCITY_KMS),
+        asteroid.get('miss_distance_km', DEFAULT_MISS_DISTANCE_KM),
+    ))
+
+
+@lru_cache(maxsize=4096)
+def _impact_analysis(diameter, velocity, miss_distance):
+    result = impact_batch(diameter, velocity, DEFAULT_DENSITY, miss_distance)
+    return {field: float(values) for field, values in result.items()}
+
+
+def severity_levels(diameter_km):
+    return np.asarray(SEVERITY_LEVELS)[np.digitize(diameter_km, SEVERITY_DIAMETERS_KM)]
+
+
+def materialized_metrics(diameter_min, diameter_max, velocity_kms, miss_distance_km):
+    """Columns stored on Asteroid rows; None inputs get the same defaults as catalog records"""
+    def column(values, default):
+        return np.fromiter((default if v is None else v for v in values), dtype=np.float64)
+
+    diameter = (column(diameter_min, 0.0) + column(diameter_max, 0.0)) / 2
+    results = impact_batch(
+        diameter,
+        column(velocity_kms, DEFAULT_VELOCITY_KMS),
+        DEFAULT_DENSITY,
+        column(miss_distance_km, DEFAULT_MISS_DISTANCE_KM),
+    )
+    metrics = {field: results[field] for field in MATERIALIZED_FIELDS}
+    metrics['severity_level'] = severity_levels(diameter)
+    return metrics
+
+
+class CatalogImpact:
+    """Catalog columns and their impact outputs, computed once per catalog version"""
+
+    def __init__(self, catalog):
+        records = list(catalog)
+        self.version = catalog.version
+        self.ids = [record['id'] for record in records]
+        self.names = [record['name'] for record in records]
+        self.hazardous = np.fromiter((record['is_hazardous'] for record in records), dtype=bool, count=len(records))
+        self.diameter_km = np.fromiter(
+            ((record['diameter_min'] + record['diameter_max']) / 2 for record in records),
+            dtype=np.float64, count=len(records),
+        )
+        self.velocity_kms = np.fromiter(
+            (record['velocity_kms'] for record in records), dtype=np.float64, count=len(records)
+        )
+        self.miss_distance_km = np.fromiter(
+            (record['miss_distance_km'] for record in records), dtype=np.float64, count=len(records)
+        )
+        self.results = impact_batch(self.diameter_km, self.velocity_kms, DEFAULT_DENSITY, self.miss_distance_km)
+
+    def rank(self, field='kinetic_energy_joules', limit=50, hazardous=None, descending=True):
+        """Indices of the top ``limit`` objects by ``field``"""
+        values = self.results[field]
+        candidates = np.arange(len(values))
+        if hazardous is not None:
+            candidates = candidates[self.hazardous == hazardous]
+        keys = -values[candidates] if descending else values[candidates]
+        # Undefined results (NaN/inf) rank last in either direction
+        keys = np.where(np.isfinite(keys), keys, np.inf)
+        if limit < len(candidates):
+            top = np.argpartition(keys, limit)[:limit]
+            candidates, keys = candidates[top], keys[top]
+        return candidates[np.argsort(keys, kind='stable')]
+
+
+_catalog_impact = None
+_catalog_impact_lock = threading.Lock()
+
+
+def get_catalog_impact(catalog):
+    global _catalog_impact
+    current = _catalog_impact
+    if current is None or current.version != catalog.version:
+        with _catalog_impact_lock:
+            current = _catalog_impact
+            if current is None or current.version != catalog.version:
+                current = _catalog_impact = CatalogImpact(catalog)
+    return current
@@ -0,0 +1,193 @@
+"""Conservative JavaScript minifier for the page bundles.
+
+Removes comments, indentation and blank lines and collapses other
+whitespace, without rewriting any tokens. Strings, template literals
+(including nested ``${...}`` expressions) and regular expression literals are
+copied verbatim. A line break is kept wherever automatic semicolon insertion
+could depend on it, so the output behaves exactly like the source. This gets
+most of the saving of a real minifier without a Node toolchain; gzip takes
+care of the rest.
+"""
+# After these tokens a newline can never end a statement
+_NEWLINE_AFTER_OK = set('{([,;:=?&|*%<>!~^')
+# ...nor before these
+_NEWLINE_BEFORE_OK = set('})],;:.?=&|')
+# A "/" after one of these keywords starts a regular expression
+_REGEX_KEYWORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'instanceof', 'yield', 'await',
+}
+
+
+def _is_word(char):
+    return char.isalnum() or char in '_$\\' or ord(char) > 127
+
+
+class _Minifier:
+    def __init__(self, source):
+        self.source = source
+        self.pos = 0
+        self.out = []
+        # Brace depth inside each open ``${`` of a template literal
+        self.template_depths = []
+
+    def last(self):
+        return self.out[-1][-1] if self.out else ''
+
+    def last_token(self):
+        """The last word (or last character) written before the current position,
+        skipping the separator emitted for the whitespace in between"""
+        chunks = []
+        for chunk in reversed(self.out):
+            if not chunks and chunk in (' ', '\n'):
+                continue
+            if chunks and not (_is_word(chunk[-1]) and _is_word(chunks[-1][0])):
+                break
+            chunks.append(chunk)
+            if not _is_word(chunk[0]):
+                break
+        token = ''.join(reversed(chunks))
+        if not token or not _is_word(token[-1]):
+            return token[-1:]
+        start = len(token)
+        while start and _is_word(token[start - 1]):
+            start -= 1
+        return token[start:]
+
+    def regex_allowed(self):
+        token = self.last_token()
+        if not token:
+            return True
+        if _is_word(token[-1]):
+            return token in _REGEX_KEYWORDS
+        return token not in ')]'
+
+    def run(self):
+        source = self.source
+        length = len(source)
+        pending = None  # whitespace seen since the last token: None, ' ' or '\n'
+        while self.pos < length:
+            char = source[self.pos]
+            nxt = source[self.pos + 1] if self.pos + 1 < length else ''
+
+            if char in ' \t\r\n\f\v':
+                if char == '\n' or pending == '\n':
+                    pending = '\n'
+                else:
+                    pending = ' '
+                self.pos += 1
+                continue
+            if char == '/' and nxt == '/':
+                end = source.find('\n', self.pos)
+                self.pos = length if end == -1 else end
+                continue
+            if char == '/' and nxt == '*':
+                end = source.find('*/', self.pos + 2)
+                end = length if end == -1 else end + 2
+                if '\n' in source[self.pos:end]:
+                    pending = '\n'
+                elif pending is None:
+                    pending = ' '
+                self.pos = end
+                continue
+
+            if pending is not None:
+                self.separate(pending, char)
+                pending = None
+
+            if char in '\'"':
+                self.copy_string(char)
+            elif char == '`':
+                self.copy_template()
+            elif char == '/' and self.regex_allowed():
+                self.copy_regex()
+            elif char == '}' and self.template_depths and self.template_depths[-1] == 0:
+                # End of a ``${...}`` expression: back inside the template literal
+                self.template_depths.pop()
+                self.copy_template()
+            else:
+                if self.template_depths and char in '{}':
+                    self.template_depths[-1] += 1 if char == '{' else -1
+                self.out.append(char)
+                self.pos += 1
+        return ''.join(self.out).strip() + '\n'
+
+    def separate(self, whitespace, char):
+        last = self.last()
+        if not last:
+            return
+        if whitespace == '\n' and last not in _NEWLINE_AFTER_OK and char not in _NEWLINE_BEFORE_OK:
+            self.out.append('\n')
+        elif _is_word(last) and _is_word(char):
+            self.out.append(' ')
+        elif last in '+-' and char in '+-':
+            # a + +b, a - -b, a++ + b
+            self.out.append(' ')
+        elif last == '/' or char == '/':
+            # Never glue a division, regex or comment opener to another slash
+            self.out.append(' ')
+
+    def copy_until(self, start, end):
+        self.out.append(self.source[start:end])
+        self.pos = end
+
+    def copy_string(self, quote):
+        source = self.source
+        index = self.pos + 1
+        while index < len(source):
+            char = source[index]
+            if char == '\\':
+                index += 2
+                continue
+            index += 1
+            if char == quote or char == '\n':
+                break
+        self.copy_until(self.pos, index)
+
+    def copy_template(self):
+        """Copy template literal text from its backtick (or the ``}`` ending a ``${...}``)
+        to the closing backtick or the next ``${``"""
+        source = self.source
+        start = self.pos
+        index = start + 1
+        while index < len(source):
+            char = source[index]
+            if char == '\\':
+                index += 2
+                continue
+            if char == '`':
+                index += 1
+                break
+            if char == '$' and source[index + 1:index + 2] == '{':
+                index += 2
+                self.template_depths.append(0)
+                break
+            index += 1
+        self.copy_until(start, index)
+
+    def copy_regex(self):
+        source = self.source
+        index = self.pos + 1
+        in_class = False
+        while index < len(source):
+            char = source[index]
+            if char == '\\':
+                index += 2
+                continue
+            index += 1
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                break
+            elif char == '\n':
+                break
+        while index < len(source) and _is_word(source[index]):
+            index += 1  # flags
+        self.copy_until(self.pos, index)
+
+
+def minify(source):
+    """Minified ``source``; tokens and line breaks that matter are kept"""
+    return _Minifier(source).run()
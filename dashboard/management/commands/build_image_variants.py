@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.variants import VARIANT_WIDTHS, Image, build_variants, source_dir, variants_dir
+
+
+class Command(BaseCommand):
+    help = 'Build content-hashed WebP/JPEG width variants of static/images/asteroids for srcset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--widths', default=','.join(map(str, VARIANT_WIDTHS)),
+                            help='Comma-separated target widths in pixels')
+        parser.add_argument('--force', action='store_true', help='Re-encode images whose source is unchanged')
+
+    def handle(self, *args, **options):
+        if Image is None:
+            raise CommandError('Pillow is required to build image variants: pip install Pillow')
+        try:
+            widths = tuple(sorted({int(width) for width in options['widths'].split(',')}))
+        except ValueError:
+            raise CommandError('--widths must be comma-separated integers')
+
+        self.stdout.write(f'Building variants of {source_dir()} into {variants_dir()}...')
+        manifest = build_variants(widths=widths, force=options['force'], on_image=self.report)
+
+        source_bytes = sum(entry['bytes'] for entry in manifest.values())
+        smallest = sum(min(v['bytes'] for v in entry['variants']) for entry in manifest.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(manifest)} images: {source_bytes / 1024:,.0f} KiB of originals, '
+            f'{smallest / 1024:,.0f} KiB at the smallest variant'
+        ))
+
+    def report(self, filename, entry):
+        sizes = ', '.join(f'{v["width"]}w {v["format"]} {v["bytes"] / 1024:.0f} KiB' for v in entry['variants'])
+        self.stdout.write(f'  {filename} ({entry["bytes"] / 1024:.0f} KiB): {sizes}')
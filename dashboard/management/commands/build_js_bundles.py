@@ -0,0 +1,62 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.jsmin import minify
+
+# Outside static/, so collectstatic only publishes the built bundles
+SOURCE_DIR = ('assets', 'js')
+OUTPUT_DIR = ('static', 'js')
+
+
+class Command(BaseCommand):
+    help = 'Minify assets/js/*.js into the static/js/*.min.js bundles the templates load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if a bundle is missing or out of date instead of writing it')
+
+    def handle(self, *args, **options):
+        source = os.path.join(settings.BASE_DIR, *SOURCE_DIR)
+        output = os.path.join(settings.BASE_DIR, *OUTPUT_DIR)
+        stale = []
+        total = minified_total = compressed_total = 0
+        for filename in sorted(os.listdir(source)):
+            if not filename.endswith('.js'):
+                continue
+            with open(os.path.join(source, filename), encoding='utf-8') as f:
+                code = f.read()
+            minified = minify(code).encode()
+            path = os.path.join(output, filename[:-len('.js')] + '.min.js')
+            try:
+                with open(path, 'rb') as f:
+                    current = f.read()
+            except FileNotFoundError:
+                current = None
+
+            compressed = len(gzip.compress(minified, compresslevel=9, mtime=0))
+            total += len(code.encode())
+            minified_total += len(minified)
+            compressed_total += compressed
+            if current == minified:
+                continue
+            stale.append(filename)
+            if not options['check']:
+                with open(path, 'wb') as f:
+                    f.write(minified)
+                self.stdout.write(
+                    f'  {os.path.basename(path)}: {len(code.encode()) / 1024:.1f} KiB -> '
+                    f'{len(minified) / 1024:.1f} KiB ({compressed / 1024:.1f} KiB gzipped)'
+                )
+
+        if options['check']:
+            if stale:
+                raise CommandError(f'Out of date bundles, run build_js_bundles: {", ".join(stale)}')
+            self.stdout.write(self.style.SUCCESS('All bundles are up to date'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(stale)} bundles rebuilt; {total / 1024:.1f} KiB of source, '
+            f'{minified_total / 1024:.1f} KiB minified, {compressed_total / 1024:.1f} KiB gzipped'
+        ))
@@ -0,0 +1,58 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand
+
+from dashboard.events import notify_catalog_changed
+from dashboard.models import Asteroid, moid_rows, store_moid
+from dashboard.moid import compute_moid_rows
+
+
+class Command(BaseCommand):
+    help = 'Compute the Earth MOID of every Asteroid with orbital elements across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (1 computes in this process)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Objects per work unit and per write transaction')
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Only objects without a stored MOID')
+
+    def handle(self, *args, **options):
+        queryset = Asteroid.objects.filter(semi_major_axis_au__isnull=False)
+        if options['missing_only']:
+            queryset = queryset.filter(moid_au__isnull=True)
+        asteroid_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        chunk_size = options['chunk_size']
+        chunks = [moid_rows(asteroid_ids[start:start + chunk_size])
+                  for start in range(0, len(asteroid_ids), chunk_size)]
+
+        self.total = len(asteroid_ids)
+        self.done = 0
+        self.started = time.perf_counter()
+        if options['workers'] == 1 or len(chunks) <= 1:
+            for rows in chunks:
+                self.save(compute_moid_rows(rows))
+        else:
+            # forkserver: workers need only numpy and dashboard.moid, not this process's DB connection
+            with ProcessPoolExecutor(max_workers=options['workers'], mp_context=get_context('forkserver')) as pool:
+                for future in as_completed([pool.submit(compute_moid_rows, rows) for rows in chunks]):
+                    self.save(future.result())
+        notify_catalog_changed()
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Computed MOID for {self.done} asteroids in {elapsed:.2f}s '
+            f'({self.done / max(elapsed, 1e-9):,.0f} objects/s)'
+        ))
+
+    def save(self, results):
+        store_moid(results)
+        self.done += len(results)
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / max(elapsed, 1e-9)
+        self.stdout.write(f'  {self.done}/{self.total} objects, {rate:,.0f}/s, '
+                          f'ETA {(self.total - self.done) / rate:.0f}s')
@@ -1,97 +1,105 @@
+import hashlib
+import json
 import os
-import requests
-from django.core.management.base import BaseCommand
-from django.conf import settings
+import time
 
-class Command(BaseCommand):
-    help = 'Download real asteroid images from reliable sources'
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-    def handle(self, *args, **options):
-        # Real asteroid images from NASA, ESA, and other space agencies
-        asteroid_images = {
-            '99942': 'https://science.nasa.gov/wp-content/uploads/2023/09/apophis-16.jpg',
-            '101955': 'https://science.nasa.gov/wp-content/uploads/2023/09/bennu-osiris-rex.jpg',
-            '162173': 'https://science.nasa.gov/wp-content/uploads/2023/09/ryugu-hayabusa2.jpg',
-            '25143': 'https://science.nasa.gov/wp-content/uploads/2023/09/itokawa-hayabusa.jpg',
-            '433': 'https://science.nasa.gov/wp-content/uploads/2023/09/eros-near.jpg',
-            '4179': 'https://images-assets.nasa.gov/image/PIA04179/PIA04179~medium.jpg',
-            '1566': 'https://images-assets.nasa.gov/image/PIA03149/PIA03149~medium.jpg',
-            '4': 'https://images-assets.nasa.gov/image/PIA20350/PIA20350~medium.jpg',
-            '1': 'https://images-assets.nasa.gov/image/PIA20348/PIA20348~medium.jpg',
-            'HALLEY': 'https://images-assets.nasa.gov/image/PIA01467/PIA01467~medium.jpg',
-            'HALE_BOPP': 'https://images-assets.nasa.gov/image/PIA01329/PIA01329~medium.jpg',
-            'NEOWISE': 'https://images-assets.nasa.gov/image/PIA24023/PIA24023~medium.jpg',
-            'TUNGUSKA': 'https://images-assets.nasa.gov/image/PIA03570/PIA03570~medium.jpg',
-            'CHELYABINSK': 'https://images-assets.nasa.gov/image/PIA16892/PIA16892~medium.jpg',
-            '16': 'https://images-assets.nasa.gov/image/PIA24471/PIA24471~medium.jpg',
-            '2': 'https://images-assets.nasa.gov/image/PIA07781/PIA07781~medium.jpg',
-            '65803': 'https://images-assets.nasa.gov/image/PIA25002/PIA25002~medium.jpg',
-            '3200': 'https://images-assets.nasa.gov/image/PIA03149/PIA03149~medium.jpg',
-            '1950DA': 'https://images-assets.nasa.gov/image/PIA04913/PIA04913~medium.jpg',
-            'OUMUAMUA': 'https://images-assets.nasa.gov/image/PIA22357/PIA22357~medium.jpg'
-        }
+from dashboard.downloads import Downloader
 
-        # Fallback high-quality space images
-        fallback_images = {
-            '99942': 'https://picsum.photos/400/300?random=1',
-            '101955': 'https://picsum.photos/400/300?random=2',
-            '162173': 'https://picsum.photos/400/300?random=3',
-            '25143': 'https://picsum.photos/400/300?random=4',
-            '433': 'https://picsum.photos/400/300?random=5',
-            '4179': 'https://picsum.photos/400/300?random=6',
-            '1566': 'https://picsum.photos/400/300?random=7',
-            '4': 'https://picsum.photos/400/300?random=8',
-            '1': 'https://picsum.photos/400/300?random=9',
-            'HALLEY': 'https://picsum.photos/400/300?random=10',
-            'HALE_BOPP': 'https://picsum.photos/400/300?random=11',
-            'NEOWISE': 'https://picsum.photos/400/300?random=12',
-            'TUNGUSKA': 'https://picsum.photos/400/300?random=13',
-            'CHELYABINSK': 'https://picsum.photos/400/300?random=14',
-            '16': 'https://picsum.photos/400/300?random=15',
-            '2': 'https://picsum.photos/400/300?random=16',
-            '65803': 'https://picsum.photos/400/300?random=17',
-            '3200': 'https://picsum.photos/400/300?random=18',
-            '1950DA': 'https://picsum.photos/400/300?random=19',
-            'OUMUAMUA': 'https://picsum.photos/400/300?random=20'
-        }
+# Real asteroid images from NASA, ESA, and other space agencies
+ASTEROID_IMAGES = {
+    '99942': 'https://science.nasa.gov/wp-content/uploads/2023/09/apophis-16.jpg',
+    '101955': 'https://science.nasa.gov/wp-content/uploads/2023/09/bennu-osiris-rex.jpg',
+    '162173': 'https://science.nasa.gov/wp-content/uploads/2023/09/ryugu-hayabusa2.jpg',
+    '25143': 'https://science.nasa.gov/wp-content/uploads/2023/09/itokawa-hayabusa.jpg',
+    '433': 'https://science.nasa.gov/wp-content/uploads/2023/09/eros-near.jpg',
+    '4179': 'https://images-assets.nasa.gov/image/PIA04179/PIA04179~medium.jpg',
+    '1566': 'https://images-assets.nasa.gov/image/PIA03149/PIA03149~medium.jpg',
+    '4': 'https://images-assets.nasa.gov/image/PIA20350/PIA20350~medium.jpg',
+    '1': 'https://images-assets.nasa.gov/image/PIA20348/PIA20348~medium.jpg',
+    'HALLEY': 'https://images-assets.nasa.gov/image/PIA01467/PIA01467~medium.jpg',
+    'HALE_BOPP': 'https://images-assets.nasa.gov/image/PIA01329/PIA01329~medium.jpg',
+    'NEOWISE': 'https://images-assets.nasa.gov/image/PIA24023/PIA24023~medium.jpg',
+    'TUNGUSKA': 'https://images-assets.nasa.gov/image/PIA03570/PIA03570~medium.jpg',
+    'CHELYABINSK': 'https://images-assets.nasa.gov/image/PIA16892/PIA16892~medium.jpg',
+    '16': 'https://images-assets.nasa.gov/image/PIA24471/PIA24471~medium.jpg',
+    '2': 'https://images-assets.nasa.gov/image/PIA07781/PIA07781~medium.jpg',
+    '65803': 'https://images-assets.nasa.gov/image/PIA25002/PIA25002~medium.jpg',
+    '3200': 'https://images-assets.nasa.gov/image/PIA03149/PIA03149~medium.jpg',
+    '1950DA': 'https://images-assets.nasa.gov/image/PIA04913/PIA04913~medium.jpg',
+    'OUMUAMUA': 'https://images-assets.nasa.gov/image/PIA22357/PIA22357~medium.jpg',
+}
+# Placeholder images tried when the primary source fails
+FALLBACK_URL = 'https://picsum.photos/400/300?random={index}'
 
-        images_dir = os.path.join(settings.BASE_DIR, 'static', 'images', 'asteroids')
-        os.makedirs(images_dir, exist_ok=True)
 
-        self.stdout.write(self.style.SUCCESS(f'Downloading {len(asteroid_images)} real asteroid images...'))
+def default_sources():
+    """{key: [primary url, fallback url]} for the built-in image list"""
+    return {
+        key: [url, FALLBACK_URL.format(index=index)]
+        for index, (key, url) in enumerate(ASTEROID_IMAGES.items(), start=1)
+    }
 
-        for asteroid_id in asteroid_images.keys():
-            try:
-                filename = f'{asteroid_id}.jpg'
-                filepath = os.path.join(images_dir, filename)
 
-                if os.path.exists(filepath):
-                    self.stdout.write(f'Skipping {filename} (already exists)')
-                    continue
-
-                # Try NASA first, then fallback
-                success = False
-                for url_dict in [asteroid_images, fallback_images]:
-                    try:
-                        url = url_dict[asteroid_id]
-                        response = requests.get(url, timeout=5, headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        })
-                        response.raise_for_status()
+class Command(BaseCommand):
+    help = 'Download real asteroid images from reliable sources'
 
-                        with open(filepath, 'wb') as f:
-                            f.write(response.content)
+    def add_arguments(self, parser):
+        parser.add_argument('--sources',
+                            help='JSON file mapping image keys to a URL or a list of URLs to try in order '
+                                 '(defaults to the built-in NASA list)')
+        parser.add_argument('--output', help='Target directory (default: static/images/asteroids)')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent downloads')
+        parser.add_argument('--per-host', type=int, default=2, help='Concurrent downloads per host')
+        parser.add_argument('--timeout', type=float, default=10, help='Connect/read timeout in seconds')
 
-                        self.stdout.write(self.style.SUCCESS(f'Downloaded {filename}'))
-                        success = True
-                        break
-                    except:
-                        continue
+    def handle(self, *args, **options):
+        if options['sources']:
+            try:
+                with open(options['sources']) as f:
+                    sources = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read sources file: {e}')
+            sources = {key: [urls] if isinstance(urls, str) else urls for key, urls in sources.items()}
+        else:
+            sources = default_sources()
+        images_dir = options['output'] or os.path.join(settings.BASE_DIR, 'static', 'images', 'asteroids')
+        jobs = {key: (f'{key}.jpg', urls) for key, urls in sources.items()}
+        # The manifest (upstream URLs and ETags) and partial files stay out of the
+        # output, which collectstatic would otherwise publish
+        state_dir = os.path.join(
+            settings.IMAGE_DOWNLOAD_STATE_DIR, hashlib.sha1(os.path.abspath(images_dir).encode()).hexdigest()[:12]
+        )
 
-                if not success:
-                    self.stdout.write(self.style.WARNING(f'Failed to download {asteroid_id}, keeping SVG'))
+        self.stdout.write(self.style.SUCCESS(f'Downloading {len(jobs)} real asteroid images...'))
+        downloader = Downloader(images_dir, workers=options['workers'], per_host=options['per_host'],
+                                timeout=options['timeout'], state_dir=state_dir)
+        started = time.perf_counter()
+        results = downloader.run(jobs, on_result=self.report)
+        elapsed = time.perf_counter() - started
 
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'Error with {asteroid_id}: {str(e)}'))
+        counts = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        total_bytes = sum(result.bytes for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'Real image download complete: {counts.get("downloaded", 0)} downloaded, '
+            f'{counts.get("resumed", 0)} resumed, {counts.get("not_modified", 0)} unchanged, '
+            f'{counts.get("existing", 0)} already present, '
+            f'{counts.get("failed", 0)} failed; {total_bytes / 1024:,.1f} KiB in {elapsed:.2f}s '
+            f'({total_bytes / 1024 / max(elapsed, 1e-9):,.1f} KiB/s)'
+        ))
 
-        self.stdout.write(self.style.SUCCESS('Real image download complete!'))
\ No newline at end of file
+    def report(self, result):
+        if result.status == 'failed':
+            self.stdout.write(self.style.WARNING(f'Failed to download {result.key}, keeping SVG ({result.error})'))
+        elif result.status == 'not_modified':
+            self.stdout.write(f'Skipping {result.filename} (unchanged)')
+        elif result.status == 'existing':
+            self.stdout.write(f'Skipping {result.filename} (already present)')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'{result.status.capitalize()} {result.filename} ({result.bytes:,} bytes from {result.url})'
+            ))
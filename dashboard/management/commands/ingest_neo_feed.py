@@ -0,0 +1,268 @@
+import glob
+import json
+import os
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.events import notify_catalog_changed
+from dashboard.models import Asteroid, CloseApproach, refresh_impact_metrics, refresh_primary_approaches
+from dashboard.orbits import ELEMENT_FIELDS
+
+ASTEROID_UPDATE_FIELDS = [
+    'name', 'diameter_min', 'diameter_max', 'is_potentially_hazardous',
+    'absolute_magnitude', 'updated_at',
+]
+# Feed pages carry no orbital_data; only overwrite stored elements when a page has them.
+# New elements also clear the stored MOID for compute_moid --missing-only to fill in
+ORBIT_UPDATE_FIELDS = ASTEROID_UPDATE_FIELDS + list(ELEMENT_FIELDS) + ['moid_au']
+ORBITAL_DATA_KEYS = {
+    'orbit_epoch_jd': 'epoch_osculation',
+    'semi_major_axis_au': 'semi_major_axis',
+    'eccentricity': 'eccentricity',
+    'inclination_deg': 'inclination',
+    'ascending_node_deg': 'ascending_node_longitude',
+    'perihelion_argument_deg': 'perihelion_argument',
+    'mean_anomaly_deg': 'mean_anomaly',
+}
+APPROACH_UPDATE_FIELDS = [
+    'velocity_kmh', 'velocity_kms', 'miss_distance_km', 'miss_distance_au',
+]
+# Keep IN (...) lookups under SQLite's default bound-parameter limit
+LOOKUP_CHUNK = 900
+
+
+def parse_approach_date(approach):
+    """Aware UTC datetime for a NeoWs close_approach_data entry"""
+    epoch_ms = approach.get('epoch_date_close_approach')
+    if epoch_ms is not None:
+        return datetime.fromtimestamp(epoch_ms / 1000, tz=dt_timezone.utc)
+    full = approach.get('close_approach_date_full')
+    if full:
+        return datetime.strptime(full, '%Y-%b-%d %H:%M').replace(tzinfo=dt_timezone.utc)
+    return datetime.strptime(approach['close_approach_date'], '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+
+
+def parse_orbital_elements(neo):
+    """Model field values from a NeoWs orbital_data block, or None if it is missing or incomplete"""
+    orbital_data = neo.get('orbital_data') or {}
+    try:
+        return {field: float(orbital_data[key]) for field, key in ORBITAL_DATA_KEYS.items()}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def iter_page_objects(page):
+    """Yield NEO objects from either a feed page (dict by date) or a browse page (list)"""
+    objects = page.get('near_earth_objects', [])
+    if isinstance(objects, dict):
+        for day in sorted(objects):
+            yield from objects[day]
+    else:
+        yield from objects
+
+
+class Command(BaseCommand):
+    help = 'Bulk-ingest NeoWs feed/browse JSON pages into Asteroid and CloseApproach'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources', nargs='+',
+            help='JSON page files, directories or globs, or an http(s) URL to a feed/browse page',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Close approaches to accumulate before each upsert transaction')
+        parser.add_argument('--follow-next', action='store_true',
+                            help='For URL sources, keep following links.next')
+        parser.add_argument('--max-pages', type=int, default=None,
+                            help='Stop after this many pages')
+        parser.add_argument('--resume', action='store_true',
+                            help='Skip pages recorded in the checkpoint and continue from the last next link')
+        parser.add_argument('--checkpoint', default=str(settings.NEO_FEED_CHECKPOINT),
+                            help='Checkpoint file used by --resume')
+        parser.add_argument('--api-key', default=settings.NASA_API_KEY,
+                            help='api_key appended to NASA URLs')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = self.load_checkpoint() if options['resume'] else {'completed': [], 'next_url': None}
+        self.completed = set(self.checkpoint['completed'])
+        self.session = requests.Session()
+        self.api_key = options['api_key']
+
+        self.pending_asteroids = {}
+        self.pending_approaches = []
+        self.pending_pages = []
+        self.asteroid_rows = 0
+        self.approach_rows = 0
+        self.moid_pending = False
+        pages = 0
+
+        started = time.perf_counter()
+        for page_id, page, next_url in self.iter_pages(options['sources'], options['follow_next']):
+            self.collect(page)
+            self.pending_pages.append((page_id, next_url))
+            pages += 1
+            if len(self.pending_approaches) >= self.batch_size:
+                self.flush()
+            if options['max_pages'] and pages >= options['max_pages']:
+                break
+        self.flush()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        total = self.asteroid_rows + self.approach_rows
+        self.stdout.write(self.style.SUCCESS(
+            f'Ingested {pages} pages: {self.asteroid_rows} asteroids, {self.approach_rows} close approaches '
+            f'in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)'
+        ))
+        if self.moid_pending:
+            self.stdout.write('Run compute_moid --missing-only to fill in the MOID of new orbits')
+
+    # Sources
+
+    def iter_pages(self, sources, follow_next):
+        """Yield (page_id, page, next_url) one page at a time"""
+        for source in sources:
+            if source.startswith(('http://', 'https://')):
+                yield from self.iter_url_pages(source, follow_next)
+            else:
+                for path in self.expand_paths(source):
+                    if path in self.completed:
+                        continue
+                    with open(path, 'rb') as f:
+                        yield path, json.load(f), None
+
+    def expand_paths(self, source):
+        if os.path.isdir(source):
+            return sorted(glob.glob(os.path.join(source, '*.json')))
+        paths = sorted(glob.glob(source))
+        if not paths:
+            raise CommandError(f'No JSON pages found at {source}')
+        return paths
+
+    def iter_url_pages(self, url, follow_next):
+        if self.checkpoint.get('next_url'):
+            url = self.checkpoint['next_url']
+        while url:
+            if url in self.completed:
+                break
+            response = self.session.get(url, params=self.url_params(url), timeout=30)
+            response.raise_for_status()
+            page = response.json()
+            next_url = page.get('links', {}).get('next') if follow_next else None
+            yield url, page, next_url
+            url = next_url
+
+    def url_params(self, url):
+        if 'api.nasa.gov' in url and 'api_key=' not in url:
+            return {'api_key': self.api_key}
+        return None
+
+    # Rows
+
+    def collect(self, page):
+        now = timezone.now()
+        for neo in iter_page_objects(page):
+            neo_id = str(neo['id'])
+            diameter = neo.get('estimated_diameter', {}).get('kilometers', {})
+            self.pending_asteroids[neo_id] = Asteroid(
+                neo_id=neo_id,
+                name=neo['name'],
+                diameter_min=diameter.get('estimated_diameter_min'),
+                diameter_max=diameter.get('estimated_diameter_max'),
+                is_potentially_hazardous=neo.get('is_potentially_hazardous_asteroid', False),
+                absolute_magnitude=neo.get('absolute_magnitude_h'),
+                updated_at=now,
+                **(parse_orbital_elements(neo) or {}),
+            )
+            for approach in neo.get('close_approach_data', []):
+                velocity = approach['relative_velocity']
+                miss = approach['miss_distance']
+                self.pending_approaches.append((neo_id, CloseApproach(
+                    approach_date=parse_approach_date(approach),
+                    velocity_kmh=float(velocity['kilometers_per_hour']),
+                    velocity_kms=float(velocity['kilometers_per_second']),
+                    miss_distance_km=float(miss['kilometers']),
+                    miss_distance_au=float(miss['astronomical']),
+                    orbiting_body=approach.get('orbiting_body', 'Earth'),
+                )))
+
+    def flush(self):
+        """Upsert everything collected so far in one transaction and checkpoint it"""
+        if not self.pending_pages:
+            return
+
+        with transaction.atomic():
+            asteroids = list(self.pending_asteroids.values())
+            with_orbits = [asteroid for asteroid in asteroids if asteroid.semi_major_axis_au is not None]
+            without_orbits = [asteroid for asteroid in asteroids if asteroid.semi_major_axis_au is None]
+            for group, update_fields in ((with_orbits, ORBIT_UPDATE_FIELDS),
+                                         (without_orbits, ASTEROID_UPDATE_FIELDS)):
+                if group:
+                    Asteroid.objects.bulk_create(
+                        group,
+                        batch_size=self.batch_size,
+                        update_conflicts=True,
+                        unique_fields=['neo_id'],
+                        update_fields=update_fields,
+                    )
+
+            # SQLite does not hand back primary keys for upserted rows
+            neo_ids = list(self.pending_asteroids)
+            pk_by_neo_id = {}
+            for start in range(0, len(neo_ids), LOOKUP_CHUNK):
+                chunk = neo_ids[start:start + LOOKUP_CHUNK]
+                pk_by_neo_id.update(Asteroid.objects.filter(neo_id__in=chunk).values_list('neo_id', 'id'))
+
+            approaches = {}
+            for neo_id, approach in self.pending_approaches:
+                approach.asteroid_id = pk_by_neo_id[neo_id]
+                approaches[(approach.asteroid_id, approach.approach_date, approach.orbiting_body)] = approach
+            CloseApproach.objects.bulk_create(
+                list(approaches.values()),
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=['asteroid', 'approach_date', 'orbiting_body'],
+                update_fields=APPROACH_UPDATE_FIELDS,
+            )
+
+        # Bulk UPDATEs of the derived columns, each its own short write after the upsert committed
+        refresh_primary_approaches(pk_by_neo_id.values())
+        refresh_impact_metrics(pk_by_neo_id.values())
+        notify_catalog_changed()
+        self.asteroid_rows += len(asteroids)
+        self.moid_pending = self.moid_pending or bool(with_orbits)
+        self.approach_rows += len(approaches)
+        for page_id, next_url in self.pending_pages:
+            self.completed.add(page_id)
+            self.checkpoint['next_url'] = next_url
+        self.save_checkpoint()
+        self.stdout.write(f'  committed {len(self.pending_pages)} pages, '
+                          f'{self.asteroid_rows} asteroids / {self.approach_rows} approaches so far')
+
+        self.pending_asteroids = {}
+        self.pending_approaches = []
+        self.pending_pages = []
+
+    # Checkpoint
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'completed': [], 'next_url': None}
+
+    def save_checkpoint(self):
+        self.checkpoint['completed'] = sorted(self.completed)
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -1,15 +1,17 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-from dashboard.models import Asteroid, CloseApproach
+from dashboard.events import notify_catalog_changed
+from dashboard.models import Asteroid, CloseApproach, refresh_impact_metrics, refresh_primary_approaches
+
+# Columns a rerun refreshes on sample approaches it already wrote
+APPROACH_UPDATE_FIELDS = ['velocity_kmh', 'velocity_kms', 'miss_distance_km', 'miss_distance_au']
 
 class Command(BaseCommand):
     help = 'Populate database with sample asteroid data'
 
     def handle(self, *args, **options):
-        # Clear existing data
-        Asteroid.objects.all().delete()
-        
         # Sample asteroid data
         sample_asteroids = [
             {
@@ -21,7 +23,7 @@ class Command(BaseCommand):
                 'absolute_magnitude': 19.7
             },
             {
-                'neo_id': '2021002', 
+                'neo_id': '2021002',
                 'name': 'Bennu',
                 'diameter_min': 0.492,
                 'diameter_max': 0.565,
@@ -53,23 +55,41 @@ class Command(BaseCommand):
                 'absolute_magnitude': 10.4
             }
         ]
-        
-        for asteroid_data in sample_asteroids:
-            asteroid = Asteroid.objects.create(**asteroid_data)
-            
-            # Create sample close approaches
-            for i in range(3):
-                approach_date = timezone.now() + timedelta(days=30 + i*60)
-                CloseApproach.objects.create(
-                    asteroid=asteroid,
-                    approach_date=approach_date,
-                    velocity_kmh=50000 + i*10000,
-                    velocity_kms=15 + i*5,
-                    miss_distance_km=5000000 + i*2000000,
-                    miss_distance_au=0.033 + i*0.013,
-                    orbiting_body='Earth'
-                )
-        
+
+        # Whole days, so a rerun on the same day updates the same approaches
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        asteroid_ids = []
+        with transaction.atomic():
+            approaches = []
+            for asteroid_data in sample_asteroids:
+                neo_id = asteroid_data.pop('neo_id')
+                asteroid, _ = Asteroid.objects.update_or_create(neo_id=neo_id, defaults=asteroid_data)
+                asteroid_ids.append(asteroid.pk)
+
+                # Create sample close approaches
+                for i in range(3):
+                    approaches.append(CloseApproach(
+                        asteroid=asteroid,
+                        approach_date=today + timedelta(days=30 + i*60),
+                        velocity_kmh=50000 + i*10000,
+                        velocity_kms=15 + i*5,
+                        miss_distance_km=5000000 + i*2000000,
+                        miss_distance_au=0.033 + i*0.013,
+                        orbiting_body='Earth',
+                    ))
+            # Upserted on the same unique key as ingest_neo_feed
+            CloseApproach.objects.bulk_create(
+                approaches,
+                update_conflicts=True,
+                unique_fields=['asteroid', 'approach_date', 'orbiting_body'],
+                update_fields=APPROACH_UPDATE_FIELDS,
+            )
+
+            # Same derived columns ingest_neo_feed keeps current
+            refresh_primary_approaches(asteroid_ids)
+            refresh_impact_metrics(asteroid_ids)
+
+        notify_catalog_changed()
         self.stdout.write(
-            self.style.SUCCESS(f'Successfully created {len(sample_asteroids)} asteroids with close approaches')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Successfully populated {len(sample_asteroids)} asteroids with close approaches')
+        )
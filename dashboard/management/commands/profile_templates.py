@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from dashboard.catalog import get_catalog
+from dashboard.template_timing import template_stats, warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Render pages in-process and print the render-time breakdown per template'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Paths to render (default: dashboard, asteroid list and a few detail pages)')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per path after the first')
+        parser.add_argument('--detail-pages', type=int, default=3,
+                            help='Catalog objects whose detail page is profiled by default')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+        paths = options['paths'] or self.default_paths(options['detail_pages'])
+
+        started = time.perf_counter()
+        compiled = warm_templates()
+        self.stdout.write(f'Compiled {compiled} templates in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        client = Client()
+        template_stats.reset()
+        for path in paths:
+            timings = []
+            for _ in range(options['repeat'] + 1):
+                started = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} returned {response.status_code}')
+            warm = sorted(timings[1:])
+            self.stdout.write(
+                f'{path}: first {timings[0]:.1f} ms, then median {warm[len(warm) // 2]:.1f} ms, '
+                f'max {warm[-1]:.1f} ms'
+            )
+
+        self.stdout.write('')
+        self.stdout.write(f'{"template":<40} {"renders":>8} {"total ms":>10} {"self ms":>10} {"mean ms":>9} {"max ms":>9}')
+        for row in template_stats.snapshot():
+            self.stdout.write(
+                f'{row["template"]:<40} {row["count"]:>8} {row["total_ms"]:>10.1f} '
+                f'{row["self_ms"]:>10.1f} {row["mean_ms"]:>9.2f} {row["max_ms"]:>9.2f}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Profiled {len(paths)} pages'))
+
+    def default_paths(self, detail_pages):
+        paths = [reverse('dashboard:dashboard'), reverse('dashboard:asteroids')]
+        for record in list(get_catalog())[:detail_pages]:
+            paths.append(reverse('dashboard:asteroid_detail', args=[record['id']]))
+        return paths
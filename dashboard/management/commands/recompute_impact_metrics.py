@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.events import notify_catalog_changed
+from dashboard.models import refresh_impact_metrics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the impact metrics stored on every Asteroid, e.g. after the impact model changes'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = refresh_impact_metrics()
+        notify_catalog_changed()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recomputed impact metrics for {updated} asteroids in {elapsed:.2f}s'))
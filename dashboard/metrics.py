@@ -0,0 +1,323 @@
+"""Per-request timings, Server-Timing headers and cross-worker Prometheus metrics.
+
+``RequestTimingMiddleware`` times every request and, within it, database
+queries (through ``connection.execute_wrapper``), template renders (reported
+by ``template_timing``) and shared cache lookups (reported by
+``payload_cache``). The breakdown goes out as a ``Server-Timing`` header
+to staff users, or to everyone when ``DEBUG`` is on.
+
+The same numbers are aggregated per route into a float64 ``.npy`` array under
+``METRICS_DIR``. Every process memory-maps the array, as the ephemeris store
+does, and owns one slot of it: slot row 0 holds the owner's pid and the
+other rows hold one route each. Writers never share a slot, so updates need
+no cross-process locking. ``/metrics`` sums all slots into Prometheus text
+format for staff, addresses in ``METRICS_ALLOWED_IPS`` and scrapers that send
+``METRICS_TOKEN`` as a bearer token. A replacement worker takes over a dead worker's slot and keeps
+adding to its counters, so totals never go backwards. The file name includes
+a hash of the route table, so a deploy that changes the routes starts a new
+file.
+"""
+import contextvars
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.urls import URLResolver, get_resolver
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows): a single dev server needs no slot locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+PHASES = ('db', 'tpl', 'cache')
+PHASE_DESCRIPTIONS = {'db': 'Database', 'tpl': 'Templates', 'cache': 'Shared cache'}
+
+# Columns of one route row
+BUCKET_FIELDS = len(LATENCY_BUCKETS) + 1
+SUM_FIELD = BUCKET_FIELDS
+STATUS_FIELD = SUM_FIELD + 1
+PHASE_FIELD = STATUS_FIELD + len(STATUS_CLASSES)
+QUERIES_FIELD = PHASE_FIELD + len(PHASES)
+FIELDS = QUERIES_FIELD + 1
+# Column of slot row 0 holding the owning pid
+PID_FIELD = 0
+
+# Routes that are not a named URL pattern
+STATIC_ROUTE = 'static'
+ADMIN_ROUTE = 'admin'
+UNMATCHED_ROUTE = 'unmatched'
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Seconds and counts per phase for the request being handled"""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+
+    def add(self, phase, seconds):
+        self.seconds[phase] += seconds
+        self.counts[phase] += 1
+
+    def server_timing(self, total):
+        entries = []
+        for phase in PHASES:
+            if self.counts[phase]:
+                entries.append(
+                    f'{phase};dur={self.seconds[phase] * 1000:.2f};'
+                    f'desc="{PHASE_DESCRIPTIONS[phase]} ({self.counts[phase]})"'
+                )
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def record_phase(phase, seconds):
+    """Add ``seconds`` of ``phase`` to the current request, if any is being timed"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - start)
+
+
+def _time_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_phase('db', time.perf_counter() - start)
+
+
+def route_names(resolver=None, namespace=''):
+    """Every named route as ``namespace:name``; the admin counts as one route"""
+    resolver = resolver or get_resolver()
+    names = []
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == ADMIN_ROUTE:
+                names.append(ADMIN_ROUTE)
+            else:
+                prefix = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+                names.extend(route_names(pattern, prefix))
+        elif pattern.name:
+            names.append(namespace + pattern.name)
+    return names
+
+
+class MetricsStore:
+    """Per-route counters and latency histograms in a memory-mapped array shared by all workers"""
+
+    def __init__(self, directory, routes, max_workers):
+        self.routes = tuple(routes)
+        self.route_rows = {route: row for row, route in enumerate(self.routes, start=1)}
+        self.max_workers = max_workers
+        layout = json.dumps([self.routes, LATENCY_BUCKETS, STATUS_CLASSES, PHASES, max_workers])
+        self.path = os.path.join(directory, f'requests-{hashlib.sha1(layout.encode()).hexdigest()[:12]}.npy')
+        self._array = None
+        self._slot = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f'{self.path}.lock', 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def array(self):
+        if self._array is None:
+            with self._file_lock():
+                if not os.path.exists(self.path):
+                    tmp_path = f'{self.path}.{os.getpid()}.tmp'
+                    created = np.lib.format.open_memmap(
+                        tmp_path, mode='w+', dtype=np.float64,
+                        shape=(self.max_workers, len(self.routes) + 1, FIELDS),
+                    )
+                    created.flush()
+                    del created
+                    os.replace(tmp_path, self.path)
+                self._array = np.load(self.path, mmap_mode='r+')
+        return self._array
+
+    def slot(self):
+        """This process's slot, claimed on first use (after any fork); None if all are taken"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return self._slot
+        array = self.array()
+        with self._file_lock():
+            owners = array[:, 0, PID_FIELD].astype(np.int64).tolist()
+            slot = owners.index(pid) if pid in owners else None
+            if slot is None:
+                for index, owner in enumerate(owners):
+                    if owner == 0 or not _alive(owner):
+                        slot = index
+                        break
+            if slot is None:
+                logger.warning('All %d metrics slots are in use; process %d is not recorded', len(owners), pid)
+            else:
+                array[slot, 0, PID_FIELD] = pid
+        self._slot = slot
+        self._pid = pid
+        return slot
+
+    def record(self, route, seconds, status, timings):
+        slot = self.slot()
+        if slot is None:
+            return
+        row = self._array[slot, self.route_rows.get(route, self.route_rows[UNMATCHED_ROUTE])]
+        bucket = int(np.searchsorted(LATENCY_BUCKETS, seconds))
+        status_class = min(max(status // 100, 1), 5) - 1
+        with self._lock:
+            row[bucket] += 1
+            row[SUM_FIELD] += seconds
+            row[STATUS_FIELD + status_class] += 1
+            for index, phase in enumerate(PHASES):
+                row[PHASE_FIELD + index] += timings.seconds[phase]
+            row[QUERIES_FIELD] += timings.counts['db']
+
+    def totals(self):
+        """(routes, fields) sums over every slot"""
+        return np.asarray(self.array()[:, 1:, :]).sum(axis=0)
+
+    def prometheus(self):
+        totals = self.totals()
+        requests = ['# HELP meteormatrix_http_requests_total Requests by route and status class',
+                    '# TYPE meteormatrix_http_requests_total counter']
+        latency = ['# HELP meteormatrix_http_request_duration_seconds Request latency by route',
+                   '# TYPE meteormatrix_http_request_duration_seconds histogram']
+        phases = ['# HELP meteormatrix_http_phase_seconds_total Time spent per phase by route',
+                  '# TYPE meteormatrix_http_phase_seconds_total counter']
+        queries = ['# HELP meteormatrix_db_queries_total Database queries by route',
+                   '# TYPE meteormatrix_db_queries_total counter']
+        for route, row in zip(self.routes, totals):
+            count = row[:BUCKET_FIELDS].sum()
+            if not count:
+                continue
+            label = f'route="{route}"'
+            for index, status_class in enumerate(STATUS_CLASSES):
+                if row[STATUS_FIELD + index]:
+                    requests.append(
+                        f'meteormatrix_http_requests_total{{{label},status="{status_class}"}} '
+                        f'{int(row[STATUS_FIELD + index])}'
+                    )
+            cumulative = np.cumsum(row[:BUCKET_FIELDS])
+            for bound, value in zip((*map(repr, LATENCY_BUCKETS), '+Inf'), cumulative):
+                latency.append(f'meteormatrix_http_request_duration_seconds_bucket{{{label},le="{bound}"}} {int(value)}')
+            latency.append(f'meteormatrix_http_request_duration_seconds_sum{{{label}}} {float(row[SUM_FIELD])!r}')
+            latency.append(f'meteormatrix_http_request_duration_seconds_count{{{label}}} {int(count)}')
+            for index, phase in enumerate(PHASES):
+                phases.append(f'meteormatrix_http_phase_seconds_total{{{label},phase="{phase}"}} {float(row[PHASE_FIELD + index])!r}')
+            queries.append(f'meteormatrix_db_queries_total{{{label}}} {int(row[QUERIES_FIELD])}')
+        return '\n'.join(requests + latency + phases + queries) + '\n'
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store():
+    """Process-wide store for the current URLconf"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                routes = sorted(set(route_names())) + [STATIC_ROUTE, UNMATCHED_ROUTE]
+                _store = MetricsStore(
+                    str(settings.METRICS_DIR), routes, getattr(settings, 'METRICS_MAX_WORKERS', 64),
+                )
+    return _store
+
+
+def request_route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        if match.namespaces and match.namespaces[0] == ADMIN_ROUTE:
+            return ADMIN_ROUTE
+        if match.url_name:
+            return match.view_name
+    if request.path.startswith(settings.STATIC_URL):
+        return STATIC_ROUTE
+    return UNMATCHED_ROUTE
+
+
+def is_staff(request):
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+def metrics_allowed(request):
+    """Whether ``request`` may read the metrics: staff, an allowed address or the bearer token"""
+    if request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    return is_staff(request)
+
+
+class RequestTimingMiddleware:
+    """Time each request, record it in the shared metrics and add ``Server-Timing`` for staff"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+        # Timings reveal how pages are built; request.user is set by now (this runs outermost)
+        if settings.DEBUG or is_staff(request):
+            response['Server-Timing'] = timings.server_timing(total)
+        try:
+            get_metrics_store().record(request_route(request), total, response.status_code, timings)
+        except OSError:
+            logger.exception('Could not record request metrics')
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asteroid",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddConstraint(
+            model_name="closeapproach",
+            constraint=models.UniqueConstraint(
+                fields=("asteroid", "approach_date", "orbiting_body"),
+                name="unique_close_approach",
+            ),
+        ),
+    ]
@@ -0,0 +1,605 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:05
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+KM_PER_AU = 149597870.7
+
+# Snapshot of dashboard.catalog.BUILTIN_OBJECTS when this migration was
+# written; migrations must not depend on code that keeps changing
+SEED_OBJECTS = (
+    {
+        "id": "99942",
+        "name": "Apophis",
+        "type": "Asteroid",
+        "description": "Apophis is a potentially hazardous asteroid that will make an extremely close approach to Earth in 2029, passing closer than some satellites.",
+        "image_url": "/static/images/asteroids/Apophis.jpg",
+        "diameter_min": 0.325,
+        "diameter_max": 0.375,
+        "is_hazardous": True,
+        "absolute_magnitude": 19.7,
+        "close_approach_date": "April 13, 2029",
+        "velocity_kms": 7.42,
+        "miss_distance_km": 31000,
+    },
+    {
+        "id": "101955",
+        "name": "Bennu",
+        "type": "Asteroid",
+        "description": "Bennu is a carbonaceous asteroid visited by NASA OSIRIS-REx mission, with samples successfully returned to Earth in 2023.",
+        "image_url": "/static/images/asteroids/Bennu.jpg",
+        "diameter_min": 0.492,
+        "diameter_max": 0.565,
+        "is_hazardous": True,
+        "absolute_magnitude": 20.9,
+        "close_approach_date": "September 25, 2025",
+        "velocity_kms": 28.07,
+        "miss_distance_km": 334000,
+    },
+    {
+        "id": "162173",
+        "name": "Ryugu",
+        "type": "Asteroid",
+        "description": "Ryugu is a diamond-shaped asteroid explored by Japan Hayabusa2 mission, revealing its rubble-pile structure and organic compounds.",
+        "image_url": "/static/images/asteroids/Ryugu.jpg",
+        "diameter_min": 0.865,
+        "diameter_max": 0.915,
+        "is_hazardous": False,
+        "absolute_magnitude": 19.2,
+        "close_approach_date": "November 15, 2025",
+        "velocity_kms": 32.19,
+        "miss_distance_km": 1200000,
+    },
+    {
+        "id": "25143",
+        "name": "Itokawa",
+        "type": "Asteroid",
+        "description": "Itokawa is an elongated peanut-shaped asteroid, the first from which samples were successfully returned to Earth by Hayabusa mission.",
+        "image_url": "/static/images/asteroids/Itokawa.jpg",
+        "diameter_min": 0.318,
+        "diameter_max": 0.535,
+        "is_hazardous": False,
+        "absolute_magnitude": 19.4,
+        "close_approach_date": "August 10, 2025",
+        "velocity_kms": 25.36,
+        "miss_distance_km": 890000,
+    },
+    {
+        "id": "433",
+        "name": "Eros",
+        "type": "Asteroid",
+        "description": "Eros is a large S-type asteroid, the first to be orbited by a spacecraft (NEAR Shoemaker) and later landed upon.",
+        "image_url": "/static/images/asteroids/Eros.jpg",
+        "diameter_min": 16.84,
+        "diameter_max": 16.84,
+        "is_hazardous": False,
+        "absolute_magnitude": 10.4,
+        "close_approach_date": "January 31, 2025",
+        "velocity_kms": 23.04,
+        "miss_distance_km": 16700000,
+    },
+    {
+        "id": "4179",
+        "name": "Toutatis",
+        "type": "Asteroid",
+        "description": "Toutatis is an elongated potentially hazardous asteroid with a complex tumbling rotation, studied extensively by radar.",
+        "image_url": "/static/images/asteroids/Toutatis.jpg",
+        "diameter_min": 2.4,
+        "diameter_max": 4.6,
+        "is_hazardous": True,
+        "absolute_magnitude": 15.3,
+        "close_approach_date": "December 12, 2025",
+        "velocity_kms": 11.02,
+        "miss_distance_km": 7000000,
+    },
+    {
+        "id": "1566",
+        "name": "Icarus",
+        "type": "Asteroid",
+        "description": "Icarus is a potentially hazardous asteroid with a highly eccentric orbit that brings it very close to the Sun.",
+        "image_url": "/static/images/asteroids/Icarus.jpg",
+        "diameter_min": 1.0,
+        "diameter_max": 1.4,
+        "is_hazardous": True,
+        "absolute_magnitude": 16.9,
+        "close_approach_date": "June 16, 2025",
+        "velocity_kms": 27.36,
+        "miss_distance_km": 6400000,
+    },
+    {
+        "id": "4",
+        "name": "Vesta",
+        "type": "Asteroid",
+        "description": "Vesta is one of the largest asteroids in the asteroid belt, visited by NASA Dawn spacecraft, with a differentiated interior.",
+        "image_url": "/static/images/asteroids/Vesta.jpg",
+        "diameter_min": 525.4,
+        "diameter_max": 525.4,
+        "is_hazardous": False,
+        "absolute_magnitude": 3.2,
+        "close_approach_date": "March 20, 2025",
+        "velocity_kms": 19.34,
+        "miss_distance_km": 234000000,
+    },
+    {
+        "id": "1",
+        "name": "Ceres",
+        "type": "Dwarf Planet",
+        "description": "Ceres is the largest object in the asteroid belt and the only dwarf planet in the inner solar system, with possible subsurface ocean.",
+        "image_url": "/static/images/asteroids/Ceres.jpg",
+        "diameter_min": 939.4,
+        "diameter_max": 939.4,
+        "is_hazardous": False,
+        "absolute_magnitude": 3.36,
+        "close_approach_date": "February 14, 2025",
+        "velocity_kms": 17.88,
+        "miss_distance_km": 263000000,
+    },
+    {
+        "id": "HALLEY",
+        "name": "Halley's Comet",
+        "type": "Comet",
+        "description": "Halley's Comet is the most famous comet, visible from Earth every 75-76 years, last seen in 1986, next return in 2061.",
+        "image_url": "/static/images/asteroids/Halley.jpg",
+        "diameter_min": 15.0,
+        "diameter_max": 15.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 5.1,
+        "close_approach_date": "July 28, 2061",
+        "velocity_kms": 70.56,
+        "miss_distance_km": 75000000,
+    },
+    {
+        "id": "HALE_BOPP",
+        "name": "Hale-Bopp",
+        "type": "Comet",
+        "description": "Hale-Bopp was one of the brightest comets of the 20th century, visible to the naked eye for 18 months in 1996-1997.",
+        "image_url": "/static/images/asteroids/Hale-bopp.jpg",
+        "diameter_min": 60.0,
+        "diameter_max": 60.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 1.0,
+        "close_approach_date": "April 1, 4385",
+        "velocity_kms": 44.0,
+        "miss_distance_km": 194000000,
+    },
+    {
+        "id": "NEOWISE",
+        "name": "NEOWISE",
+        "type": "Comet",
+        "description": "NEOWISE was a spectacular comet visible in 2020, won't return for about 6,800 years due to its long orbital period.",
+        "image_url": "/static/images/asteroids/Neowise.jpg",
+        "diameter_min": 5.0,
+        "diameter_max": 5.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 8.3,
+        "close_approach_date": "July 3, 8786",
+        "velocity_kms": 62.8,
+        "miss_distance_km": 103000000,
+    },
+    {
+        "id": "TUNGUSKA",
+        "name": "Tunguska Object",
+        "type": "Meteor/Asteroid",
+        "description": "The Tunguska event was a massive explosion in Siberia in 1908, likely caused by an asteroid or comet fragment, flattening 2,000 km² of forest.",
+        "image_url": "/static/images/asteroids/Tunguska.jpg",
+        "diameter_min": 0.06,
+        "diameter_max": 0.19,
+        "is_hazardous": True,
+        "absolute_magnitude": 22.0,
+        "close_approach_date": "June 30, 1908",
+        "velocity_kms": 27.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "CHELYABINSK",
+        "name": "Chelyabinsk Meteor",
+        "type": "Meteor",
+        "description": "The Chelyabinsk meteor exploded over Russia in 2013, injuring over 1,500 people and damaging thousands of buildings with its shockwave.",
+        "image_url": "/static/images/asteroids/Chelyabinsk.jpg",
+        "diameter_min": 0.017,
+        "diameter_max": 0.02,
+        "is_hazardous": True,
+        "absolute_magnitude": 24.4,
+        "close_approach_date": "February 15, 2013",
+        "velocity_kms": 19.16,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "16",
+        "name": "Psyche",
+        "type": "Asteroid",
+        "description": "Psyche is a metallic asteroid, possibly the exposed core of a protoplanet, target of NASA Psyche mission launching in 2023.",
+        "image_url": "/static/images/asteroids/Psyche.jpg",
+        "diameter_min": 226.0,
+        "diameter_max": 226.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 5.9,
+        "close_approach_date": "May 12, 2025",
+        "velocity_kms": 20.1,
+        "miss_distance_km": 298000000,
+    },
+    {
+        "id": "2",
+        "name": "Pallas",
+        "type": "Asteroid",
+        "description": "Pallas is the third-largest asteroid in the asteroid belt, with an unusual highly inclined orbit and possible organic compounds.",
+        "image_url": "/static/images/asteroids/Pallas.jpg",
+        "diameter_min": 512.0,
+        "diameter_max": 512.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 4.13,
+        "close_approach_date": "April 8, 2025",
+        "velocity_kms": 16.34,
+        "miss_distance_km": 287000000,
+    },
+    {
+        "id": "65803",
+        "name": "Didymos",
+        "type": "Asteroid",
+        "description": "Didymos is a binary asteroid system, target of NASA DART mission that successfully altered the orbit of its moonlet Dimorphos in 2022.",
+        "image_url": "/static/images/asteroids/Didymos.jpg",
+        "diameter_min": 0.78,
+        "diameter_max": 0.78,
+        "is_hazardous": True,
+        "absolute_magnitude": 18.16,
+        "close_approach_date": "October 5, 2025",
+        "velocity_kms": 23.92,
+        "miss_distance_km": 10500000,
+    },
+    {
+        "id": "3200",
+        "name": "Phaethon",
+        "type": "Asteroid",
+        "description": "Phaethon is a potentially hazardous asteroid that comes closer to the Sun than any other named asteroid, source of Geminid meteor shower.",
+        "image_url": "/static/images/asteroids/Phaethon.jpg",
+        "diameter_min": 5.1,
+        "diameter_max": 5.1,
+        "is_hazardous": True,
+        "absolute_magnitude": 14.6,
+        "close_approach_date": "December 14, 2025",
+        "velocity_kms": 30.18,
+        "miss_distance_km": 10312000,
+    },
+    {
+        "id": "1950DA",
+        "name": "1950 DA",
+        "type": "Asteroid",
+        "description": "1950 DA has a small chance of impacting Earth in 2880, making it one of the most closely monitored potentially hazardous asteroids.",
+        "image_url": "/static/images/asteroids/1950 DA.jpg",
+        "diameter_min": 1.1,
+        "diameter_max": 1.4,
+        "is_hazardous": True,
+        "absolute_magnitude": 17.1,
+        "close_approach_date": "March 16, 2880",
+        "velocity_kms": 15.1,
+        "miss_distance_km": 1800000,
+    },
+    {
+        "id": "OUMUAMUA",
+        "name": "Oumuamua",
+        "type": "Interstellar Object",
+        "description": "Oumuamua was the first confirmed interstellar object to visit our solar system, with an unusual elongated shape and mysterious acceleration.",
+        "image_url": "/static/images/asteroids/Oumuamua.jpg",
+        "diameter_min": 0.1,
+        "diameter_max": 1.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 22.0,
+        "close_approach_date": "October 19, 2017",
+        "velocity_kms": 87.3,
+        "miss_distance_km": 24000000,
+    },
+    {
+        "id": "LEONIDS",
+        "name": "Leonids Meteor Shower",
+        "type": "Meteor Shower",
+        "description": "The Leonids are a prolific meteor shower associated with comet Tempel-Tuttle, producing spectacular meteor storms every 33 years.",
+        "image_url": "/static/images/asteroids/Leonids.jpg",
+        "diameter_min": 0.001,
+        "diameter_max": 0.01,
+        "is_hazardous": False,
+        "absolute_magnitude": 25.0,
+        "close_approach_date": "November 17, 2024",
+        "velocity_kms": 71.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "PERSEIDS",
+        "name": "Perseids Meteor Shower",
+        "type": "Meteor Shower",
+        "description": "The Perseids are the most popular meteor shower, originating from comet Swift-Tuttle and producing up to 100 meteors per hour.",
+        "image_url": "/static/images/asteroids/Perseids.jpg",
+        "diameter_min": 0.001,
+        "diameter_max": 0.005,
+        "is_hazardous": False,
+        "absolute_magnitude": 26.0,
+        "close_approach_date": "August 12, 2024",
+        "velocity_kms": 59.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "GEMINIDS",
+        "name": "Geminids Meteor Shower",
+        "type": "Meteor Shower",
+        "description": "The Geminids are the most active meteor shower, originating from asteroid 3200 Phaethon and producing colorful, slow-moving meteors.",
+        "image_url": "/static/images/asteroids/Geminids.jpg",
+        "diameter_min": 0.001,
+        "diameter_max": 0.008,
+        "is_hazardous": False,
+        "absolute_magnitude": 25.5,
+        "close_approach_date": "December 14, 2024",
+        "velocity_kms": 35.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "QUADRANTIDS",
+        "name": "Quadrantids Meteor Shower",
+        "type": "Meteor Shower",
+        "description": "The Quadrantids have a sharp peak lasting only a few hours, originating from asteroid 2003 EH1 and producing bright blue meteors.",
+        "image_url": "/static/images/asteroids/Quadrantors.jpg",
+        "diameter_min": 0.001,
+        "diameter_max": 0.006,
+        "is_hazardous": False,
+        "absolute_magnitude": 25.8,
+        "close_approach_date": "January 4, 2025",
+        "velocity_kms": 41.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "DRACONIDS",
+        "name": "Draconids Meteor Shower",
+        "type": "Meteor Shower",
+        "description": "The Draconids are associated with comet 21P/Giacobini-Zinner and occasionally produce meteor storms with thousands of meteors per hour.",
+        "image_url": "/static/images/asteroids/Draconids.jpg",
+        "diameter_min": 0.001,
+        "diameter_max": 0.004,
+        "is_hazardous": False,
+        "absolute_magnitude": 26.5,
+        "close_approach_date": "October 8, 2024",
+        "velocity_kms": 20.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "3",
+        "name": "Juno",
+        "type": "Asteroid",
+        "description": "Juno is one of the largest asteroids in the main belt, discovered in 1804 and named after the Roman goddess.",
+        "image_url": "/static/images/asteroids/Juno.jpg",
+        "diameter_min": 233.9,
+        "diameter_max": 233.9,
+        "is_hazardous": False,
+        "absolute_magnitude": 5.33,
+        "close_approach_date": "March 15, 2025",
+        "velocity_kms": 18.2,
+        "miss_distance_km": 298000000,
+    },
+    {
+        "id": "10",
+        "name": "Hygiea",
+        "type": "Asteroid",
+        "description": "Hygiea is the fourth-largest asteroid and the largest C-type asteroid, potentially qualifying as a dwarf planet.",
+        "image_url": "/static/images/asteroids/Hygiea.jpg",
+        "diameter_min": 407.12,
+        "diameter_max": 407.12,
+        "is_hazardous": False,
+        "absolute_magnitude": 5.43,
+        "close_approach_date": "April 22, 2025",
+        "velocity_kms": 16.8,
+        "miss_distance_km": 312000000,
+    },
+    {
+        "id": "243",
+        "name": "Ida",
+        "type": "Asteroid",
+        "description": "Ida was the first asteroid discovered to have a natural satellite (Dactyl), visited by the Galileo spacecraft.",
+        "image_url": "/static/images/asteroids/Ida.jpg",
+        "diameter_min": 31.4,
+        "diameter_max": 31.4,
+        "is_hazardous": False,
+        "absolute_magnitude": 9.94,
+        "close_approach_date": "June 8, 2025",
+        "velocity_kms": 22.1,
+        "miss_distance_km": 187000000,
+    },
+    {
+        "id": "951",
+        "name": "Gaspra",
+        "type": "Asteroid",
+        "description": "Gaspra was the first asteroid to be closely approached by a spacecraft (Galileo) and photographed in detail.",
+        "image_url": "/static/images/asteroids/Gaspara.jpg",
+        "diameter_min": 12.2,
+        "diameter_max": 12.2,
+        "is_hazardous": False,
+        "absolute_magnitude": 11.46,
+        "close_approach_date": "July 19, 2025",
+        "velocity_kms": 24.3,
+        "miss_distance_km": 156000000,
+    },
+    {
+        "id": "ENCKE",
+        "name": "Encke Comet",
+        "type": "Comet",
+        "description": "Comet Encke has the shortest orbital period of any known comet at 3.3 years, source of the Taurid meteor showers.",
+        "image_url": "/static/images/asteroids/Encke.jpg",
+        "diameter_min": 4.8,
+        "diameter_max": 4.8,
+        "is_hazardous": False,
+        "absolute_magnitude": 9.2,
+        "close_approach_date": "October 25, 2024",
+        "velocity_kms": 69.9,
+        "miss_distance_km": 64000000,
+    },
+    {
+        "id": "SHOEMAKER_LEVY",
+        "name": "Shoemaker-Levy 9",
+        "type": "Comet",
+        "description": "Shoemaker-Levy 9 famously collided with Jupiter in 1994, providing the first direct observation of an extraterrestrial collision.",
+        "image_url": "/static/images/asteroids/Shoemaker.jpg",
+        "diameter_min": 2.0,
+        "diameter_max": 2.0,
+        "is_hazardous": False,
+        "absolute_magnitude": 14.0,
+        "close_approach_date": "July 16, 1994",
+        "velocity_kms": 60.0,
+        "miss_distance_km": 0,
+    },
+    {
+        "id": "TEMPEL1",
+        "name": "Tempel 1",
+        "type": "Comet",
+        "description": "Tempel 1 was the target of NASA Deep Impact mission, which deliberately crashed an impactor into the comet in 2005.",
+        "image_url": "/static/images/asteroids/Tempel.jpg",
+        "diameter_min": 7.6,
+        "diameter_max": 7.6,
+        "is_hazardous": False,
+        "absolute_magnitude": 8.5,
+        "close_approach_date": "July 5, 2025",
+        "velocity_kms": 28.6,
+        "miss_distance_km": 133000000,
+    },
+    {
+        "id": "WILD2",
+        "name": "Wild 2",
+        "type": "Comet",
+        "description": "Wild 2 was visited by NASA Stardust mission, which collected samples from its coma and returned them to Earth.",
+        "image_url": "/static/images/asteroids/Wild2.jpg",
+        "diameter_min": 5.5,
+        "diameter_max": 5.5,
+        "is_hazardous": False,
+        "absolute_magnitude": 9.6,
+        "close_approach_date": "May 12, 2025",
+        "velocity_kms": 20.0,
+        "miss_distance_km": 240000000,
+    },
+    {
+        "id": "HARTLEY2",
+        "name": "Hartley 2",
+        "type": "Comet",
+        "description": "Hartley 2 was visited by NASA EPOXI mission, revealing a peanut-shaped nucleus with active jets of gas and dust.",
+        "image_url": "/static/images/asteroids/Hartley 2.jpg",
+        "diameter_min": 2.2,
+        "diameter_max": 2.2,
+        "is_hazardous": False,
+        "absolute_magnitude": 13.5,
+        "close_approach_date": "October 20, 2024",
+        "velocity_kms": 12.4,
+        "miss_distance_km": 18000000,
+    },
+)
+
+
+def seed_catalog(apps, schema_editor):
+    """Store the curated objects and denormalize approaches for existing rows"""
+    Asteroid = apps.get_model("dashboard", "Asteroid")
+    CloseApproach = apps.get_model("dashboard", "CloseApproach")
+
+    for record in SEED_OBJECTS:
+        approach_date = datetime.strptime(
+            record["close_approach_date"], "%B %d, %Y"
+        ).replace(tzinfo=timezone.utc)
+        asteroid, _ = Asteroid.objects.update_or_create(
+            neo_id=record["id"],
+            defaults={
+                "name": record["name"],
+                "object_type": record["type"],
+                "description": record["description"],
+                "image_url": record["image_url"],
+                "diameter_min": record["diameter_min"],
+                "diameter_max": record["diameter_max"],
+                "is_potentially_hazardous": record["is_hazardous"],
+                "absolute_magnitude": record["absolute_magnitude"],
+            },
+        )
+        CloseApproach.objects.update_or_create(
+            asteroid=asteroid,
+            approach_date=approach_date,
+            orbiting_body="Earth",
+            defaults={
+                "velocity_kms": record["velocity_kms"],
+                "velocity_kmh": record["velocity_kms"] * 3600,
+                "miss_distance_km": record["miss_distance_km"],
+                "miss_distance_au": record["miss_distance_km"] / KM_PER_AU,
+            },
+        )
+
+    now = datetime.now(timezone.utc)
+    primary = {}
+    for approach in CloseApproach.objects.order_by("asteroid_id", "approach_date"):
+        current = primary.get(approach.asteroid_id)
+        if current is None or current.approach_date < now:
+            primary[approach.asteroid_id] = approach
+    for asteroid_id, approach in primary.items():
+        Asteroid.objects.filter(pk=asteroid_id).update(
+            close_approach_date=approach.approach_date,
+            velocity_kms=approach.velocity_kms,
+            miss_distance_km=approach.miss_distance_km,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0002_asteroid_updated_at_unique_close_approach"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asteroid",
+            name="object_type",
+            field=models.CharField(db_index=True, default="Asteroid", max_length=50),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="description",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="image_url",
+            field=models.CharField(blank=True, max_length=300),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="close_approach_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="velocity_kms",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="miss_distance_km",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(
+                fields=["is_potentially_hazardous", "id"], name="asteroid_hazard_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(fields=["name", "id"], name="asteroid_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(fields=["diameter_max", "id"], name="asteroid_diameter_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(fields=["velocity_kms", "id"], name="asteroid_velocity_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(fields=["miss_distance_km", "id"], name="asteroid_miss_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(
+                fields=["close_approach_date", "id"], name="asteroid_approach_idx"
+            ),
+        ),
+        migrations.RunPython(seed_catalog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:20
+
+import math
+
+from django.db import migrations, models
+
+# The impact model (dashboard.impact) as it stood when this migration was
+# written; migrations must not depend on code that keeps changing
+DEFAULT_VELOCITY_KMS = 20.0
+DEFAULT_MISS_DISTANCE_KM = 5000000
+DEFAULT_DENSITY = 2.6
+EARTH_RADIUS_KM = 6371
+GM_EARTH = 6.67e-11 * 5.97e24
+JOULES_PER_TON_TNT = 4.184e9
+SEVERITY_LEVELS = ("minimal", "local", "regional", "continental", "global")
+SEVERITY_DIAMETERS_KM = (0.01, 0.05, 0.15, 1.0)
+
+
+def impact_metrics(diameter_min, diameter_max, velocity_kms, miss_distance_km):
+    """Stored impact columns for one row; undefined values become None"""
+    diameter = ((diameter_min or 0.0) + (diameter_max or 0.0)) / 2
+    velocity = DEFAULT_VELOCITY_KMS if velocity_kms is None else velocity_kms
+    miss_distance = DEFAULT_MISS_DISTANCE_KM if miss_distance_km is None else miss_distance_km
+
+    volume = (4 / 3) * math.pi * ((diameter * 1000) / 2) ** 3
+    mass = volume * DEFAULT_DENSITY * 1000
+    kinetic_energy = 0.5 * mass * (velocity * 1000) ** 2
+    tnt_equivalent = kinetic_energy / JOULES_PER_TON_TNT
+    crater_diameter = (
+        1.8 * (diameter * 1000) ** 0.78 * velocity ** 0.44 * (DEFAULT_DENSITY / 2650) ** 0.33
+    )
+
+    if miss_distance < EARTH_RADIUS_KM:
+        impact_probability = 100.0
+    elif miss_distance < 100000:
+        if velocity:
+            focusing = (
+                math.pi * (EARTH_RADIUS_KM + (2 * GM_EARTH) / (velocity * 1000) ** 2) ** 2
+            ) / (math.pi * EARTH_RADIUS_KM ** 2)
+            impact_probability = min(99.9, (EARTH_RADIUS_KM / miss_distance) ** 2 * 100 * focusing)
+        else:
+            impact_probability = 99.9
+    else:
+        impact_probability = max(0.0001, (EARTH_RADIUS_KM / miss_distance) ** 2 * 0.1)
+
+    richter_equivalent = min(10.0, 4.0 + math.log10(max(1, tnt_equivalent)) / 2)
+    severity = sum(diameter >= bound for bound in SEVERITY_DIAMETERS_KM)
+
+    def finite(value):
+        return value if isinstance(value, float) and math.isfinite(value) else None
+
+    return {
+        "mass_kg": finite(float(mass)),
+        "kinetic_energy_joules": finite(float(kinetic_energy)),
+        "tnt_equivalent_tons": finite(float(tnt_equivalent)),
+        "crater_diameter_m": finite(float(crater_diameter)),
+        "impact_probability": finite(float(impact_probability)),
+        "richter_equivalent": finite(float(richter_equivalent)),
+        "severity_level": SEVERITY_LEVELS[severity],
+    }
+
+
+def backfill_impact_metrics(apps, schema_editor):
+    Asteroid = apps.get_model("dashboard", "Asteroid")
+
+    asteroids = list(Asteroid.objects.only(
+        "pk", "diameter_min", "diameter_max", "velocity_kms", "miss_distance_km"
+    ))
+    for asteroid in asteroids:
+        metrics = impact_metrics(
+            asteroid.diameter_min, asteroid.diameter_max,
+            asteroid.velocity_kms, asteroid.miss_distance_km,
+        )
+        for field, value in metrics.items():
+            setattr(asteroid, field, value)
+    Asteroid.objects.bulk_update(
+        asteroids,
+        ["mass_kg", "kinetic_energy_joules", "tnt_equivalent_tons", "crater_diameter_m",
+         "impact_probability", "richter_equivalent", "severity_level"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0003_asteroid_catalog_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asteroid",
+            name="mass_kg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="kinetic_energy_joules",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="tnt_equivalent_tons",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="crater_diameter_m",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="impact_probability",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="richter_equivalent",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="severity_level",
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(
+                fields=["kinetic_energy_joules", "id"], name="asteroid_energy_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_impact_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0004_asteroid_impact_metrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asteroid",
+            name="orbit_epoch_jd",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="semi_major_axis_au",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="eccentricity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="inclination_deg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="ascending_node_deg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="perihelion_argument_deg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="asteroid",
+            name="mean_anomaly_deg",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0005_asteroid_orbital_elements"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asteroid",
+            name="moid_au",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="asteroid",
+            index=models.Index(
+                fields=["moid_au", "id"], name="asteroid_moid_idx"
+            ),
+        ),
+    ]
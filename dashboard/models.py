@@ -1,14 +1,59 @@
-from django.db import models
+import math
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 class Asteroid(models.Model):
     neo_id = models.CharField(max_length=20, unique=True)
     name = models.CharField(max_length=200)
+    object_type = models.CharField(max_length=50, default='Asteroid', db_index=True)
+    description = models.TextField(blank=True)
+    image_url = models.CharField(max_length=300, blank=True)
     diameter_min = models.FloatField(null=True, blank=True)
     diameter_max = models.FloatField(null=True, blank=True)
     is_potentially_hazardous = models.BooleanField(default=False)
     absolute_magnitude = models.FloatField(null=True, blank=True)
+    # Denormalized from the primary (next upcoming, else most recent) close
+    # approach so the API can filter and keyset-paginate on plain columns
+    close_approach_date = models.DateTimeField(null=True, blank=True)
+    velocity_kms = models.FloatField(null=True, blank=True)
+    miss_distance_km = models.FloatField(null=True, blank=True)
+    # Impact model outputs for the fields above, kept current by
+    # refresh_impact_metrics so the catalog can be sorted by them in SQL
+    mass_kg = models.FloatField(null=True, blank=True)
+    kinetic_energy_joules = models.FloatField(null=True, blank=True)
+    tnt_equivalent_tons = models.FloatField(null=True, blank=True)
+    crater_diameter_m = models.FloatField(null=True, blank=True)
+    impact_probability = models.FloatField(null=True, blank=True)
+    richter_equivalent = models.FloatField(null=True, blank=True)
+    severity_level = models.CharField(max_length=20, blank=True, db_index=True)
+    # Osculating orbital elements (heliocentric ecliptic J2000) from NeoWs
+    # orbital_data; dashboard.orbits propagates them
+    orbit_epoch_jd = models.FloatField(null=True, blank=True)
+    semi_major_axis_au = models.FloatField(null=True, blank=True)
+    eccentricity = models.FloatField(null=True, blank=True)
+    inclination_deg = models.FloatField(null=True, blank=True)
+    ascending_node_deg = models.FloatField(null=True, blank=True)
+    perihelion_argument_deg = models.FloatField(null=True, blank=True)
+    mean_anomaly_deg = models.FloatField(null=True, blank=True)
+    # Minimum orbit intersection distance with Earth, from dashboard.moid
+    moid_au = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_potentially_hazardous', 'id'], name='asteroid_hazard_idx'),
+            models.Index(fields=['name', 'id'], name='asteroid_name_idx'),
+            models.Index(fields=['diameter_max', 'id'], name='asteroid_diameter_idx'),
+            models.Index(fields=['velocity_kms', 'id'], name='asteroid_velocity_idx'),
+            models.Index(fields=['miss_distance_km', 'id'], name='asteroid_miss_idx'),
+            models.Index(fields=['close_approach_date', 'id'], name='asteroid_approach_idx'),
+            models.Index(fields=['kinetic_energy_joules', 'id'], name='asteroid_energy_idx'),
+            models.Index(fields=['moid_au', 'id'], name='asteroid_moid_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -24,7 +69,131 @@ class CloseApproach(models.Model):
     
     class Meta:
         ordering = ['approach_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['asteroid', 'approach_date', 'orbiting_body'],
+                name='unique_close_approach',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.asteroid.name} - {self.approach_date.date()}"
 
+
+class RequestProfile(models.Model):
+    """One request profiled on demand by ``dashboard.profiling``; the stats live on disk"""
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=200)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    # Name of the pstats dump under PROFILE_DIR
+    filename = models.CharField(max_length=200)
+    # Top functions by cumulative time, for reading without downloading the dump
+    summary = models.TextField(blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+def _primary_approach_value(field, now):
+    """Subquery for ``field`` of the next upcoming approach, else the latest past one"""
+    upcoming = CloseApproach.objects.filter(
+        asteroid=models.OuterRef('pk'), approach_date__gte=now
+    ).order_by('approach_date').values(field)[:1]
+    latest = CloseApproach.objects.filter(
+        asteroid=models.OuterRef('pk'), approach_date__lt=now
+    ).order_by('-approach_date').values(field)[:1]
+    return Coalesce(models.Subquery(upcoming), models.Subquery(latest))
+
+
+def refresh_primary_approaches(asteroid_ids):
+    """Copy each asteroid's next upcoming (else latest) approach onto its row"""
+    now = timezone.now()
+    asteroid_ids = list(asteroid_ids)
+    updated = 0
+    for start in range(0, len(asteroid_ids), 900):
+        updated += Asteroid.objects.filter(pk__in=asteroid_ids[start:start + 900]).update(
+            close_approach_date=_primary_approach_value('approach_date', now),
+            velocity_kms=_primary_approach_value('velocity_kms', now),
+            miss_distance_km=_primary_approach_value('miss_distance_km', now),
+        )
+    return updated
+
+
+IMPACT_METRIC_FIELDS = (
+    'mass_kg', 'kinetic_energy_joules', 'tnt_equivalent_tons', 'crater_diameter_m',
+    'impact_probability', 'richter_equivalent', 'severity_level',
+)
+
+
+def refresh_impact_metrics(asteroid_ids=None):
+    """Recompute the stored impact columns in bulk (every row when ``asteroid_ids`` is None)"""
+    from .impact import materialized_metrics
+
+    if asteroid_ids is None:
+        asteroid_ids = Asteroid.objects.order_by('pk').values_list('pk', flat=True)
+    asteroid_ids = list(asteroid_ids)
+
+    quote = connection.ops.quote_name
+    columns = [Asteroid._meta.get_field(name).column for name in (*IMPACT_METRIC_FIELDS, 'updated_at')]
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(Asteroid._meta.db_table),
+        ', '.join(f'{quote(column)} = %s' for column in columns),
+        quote(Asteroid._meta.pk.column),
+    )
+    updated_at = Asteroid._meta.get_field('updated_at').get_db_prep_value(timezone.now(), connection)
+
+    updated = 0
+    # One transaction: committing each executemany row separately is ~10x slower
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(asteroid_ids), 900):
+            rows = list(Asteroid.objects.filter(pk__in=asteroid_ids[start:start + 900]).values_list(
+                'pk', 'diameter_min', 'diameter_max', 'velocity_kms', 'miss_distance_km',
+            ))
+            if not rows:
+                continue
+            pks, diameter_min, diameter_max, velocity, miss_distance = zip(*rows)
+            metrics = materialized_metrics(diameter_min, diameter_max, velocity, miss_distance)
+            values = [metrics[name].tolist() for name in IMPACT_METRIC_FIELDS]
+            cursor.executemany(sql, [
+                (*(_finite(column[i]) for column in values), updated_at, pk)
+                for i, pk in enumerate(pks)
+            ])
+            updated += len(rows)
+    return updated
+
+
+def _finite(value):
+    # NaN/inf (e.g. a zero velocity) are stored as NULL
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def moid_rows(asteroid_ids):
+    """(pk, *MOID_ELEMENT_FIELDS) tuples for objects that have orbital elements"""
+    from .moid import MOID_ELEMENT_FIELDS
+
+    return list(Asteroid.objects.filter(pk__in=asteroid_ids, semi_major_axis_au__isnull=False)
+                .order_by('pk').values_list('pk', *MOID_ELEMENT_FIELDS))
+
+
+def store_moid(results):
+    """Write (pk, moid_au) pairs in one transaction"""
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} = %s, {} = %s WHERE {} = %s'.format(
+        quote(Asteroid._meta.db_table),
+        quote(Asteroid._meta.get_field('moid_au').column),
+        quote(Asteroid._meta.get_field('updated_at').column),
+        quote(Asteroid._meta.pk.column),
+    )
+    updated_at = Asteroid._meta.get_field('updated_at').get_db_prep_value(timezone.now(), connection)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, [(moid, updated_at, pk) for pk, moid in results])
+    return len(results)
@@ -0,0 +1,171 @@
+"""Monte Carlo impact uncertainty.
+
+Instead of the point estimate (midpoint diameter, density 2.6, catalog
+velocity, vertical entry) each sample draws:
+
+- diameter uniformly between ``diameter_min`` and ``diameter_max``;
+- density from a log-normal around 2.6 g/cm³, clipped to 1-8;
+- velocity from a normal with 5% spread, clipped to ±4 sigma;
+- entry angle from the sin(2θ) distribution (most likely 45°), floored at 5°.
+
+Samples are evaluated by ``impact_batch`` in fixed-size chunks. Each chunk
+gets its own ``SeedSequence.spawn`` child, so a seed gives identical results
+however many processes run the chunks. Chunks return fixed-edge log
+histograms rather than raw samples; percentiles are read off the merged fine
+histogram (about 0.5% resolution) and reported with a coarser one.
+"""
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from django.conf import settings
+
+from .impact import DEFAULT_DENSITY, impact_batch
+
+MC_METRICS = (
+    'kinetic_energy_joules',
+    'tnt_equivalent_tons',
+    'crater_diameter_m',
+    'fireball_radius_km',
+    'radiation_radius_km',
+    'overpressure_radius_km',
+    'thermal_radius_km',
+)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+CHUNK_SAMPLES = 125000
+FINE_BINS = 4096
+HISTOGRAM_BINS = 64
+
+DENSITY_SIGMA = 0.35  # log-space spread of the density distribution
+DENSITY_RANGE = (1.0, 8.0)
+VELOCITY_REL_SIGMA = 0.05
+VELOCITY_SIGMAS = 4
+MIN_ENTRY_ANGLE_DEG = 5.0
+
+
+def input_bounds(diameter_min, diameter_max, velocity_kms):
+    """(low, high) corners of the sampled input space"""
+    spread = VELOCITY_REL_SIGMA * VELOCITY_SIGMAS
+    low = (diameter_min, DENSITY_RANGE[0], velocity_kms * (1 - spread), MIN_ENTRY_ANGLE_DEG)
+    high = (diameter_max, DENSITY_RANGE[1], velocity_kms * (1 + spread), 90.0)
+    return low, high
+
+
+def metric_edges(diameter_min, diameter_max, velocity_kms):
+    """log10 range per metric; every metric grows with every input, so the corners bound it"""
+    edges = {}
+    low, high = (impact_batch(d, v, rho, entry_angle_deg=angle)
+                 for d, rho, v, angle in input_bounds(diameter_min, diameter_max, velocity_kms))
+    for metric in MC_METRICS:
+        lo, hi = math.log10(low[metric]), math.log10(high[metric])
+        edges[metric] = (lo - 1e-9, max(hi, lo + 1e-6) + 1e-9)
+    return edges
+
+
+def sample_inputs(rng, size, diameter_min, diameter_max, velocity_kms):
+    diameter = rng.uniform(diameter_min, diameter_max, size)
+    density = np.clip(rng.lognormal(math.log(DEFAULT_DENSITY), DENSITY_SIGMA, size), *DENSITY_RANGE)
+    sigma = velocity_kms * VELOCITY_REL_SIGMA
+    velocity = np.clip(
+        rng.normal(velocity_kms, sigma, size),
+        velocity_kms - VELOCITY_SIGMAS * sigma, velocity_kms + VELOCITY_SIGMAS * sigma,
+    )
+    # p(θ) = sin 2θ has CDF sin²θ
+    angle = np.maximum(np.degrees(np.arcsin(np.sqrt(rng.random(size)))), MIN_ENTRY_ANGLE_DEG)
+    return diameter, density, velocity, angle
+
+
+def run_chunk(seed_sequence, size, diameter_min, diameter_max, velocity_kms, edges):
+    """Fine histogram counts and sums for one chunk of samples"""
+    rng = np.random.default_rng(seed_sequence)
+    diameter, density, velocity, angle = sample_inputs(rng, size, diameter_min, diameter_max, velocity_kms)
+    results = impact_batch(diameter, velocity, density, entry_angle_deg=angle)
+    counts, sums = {}, {}
+    for metric in MC_METRICS:
+        values = results[metric]
+        lo, hi = edges[metric]
+        index = ((np.log10(values) - lo) * (FINE_BINS / (hi - lo))).astype(np.int64)
+        np.clip(index, 0, FINE_BINS - 1, out=index)
+        counts[metric] = np.bincount(index, minlength=FINE_BINS)
+        sums[metric] = float(values.sum())
+    return counts, sums
+
+
+def chunk_sizes(samples):
+    full, rest = divmod(samples, CHUNK_SAMPLES)
+    return [CHUNK_SAMPLES] * full + ([rest] if rest else [])
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Shared worker pool; forkserver keeps children from inheriting request threads"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = getattr(settings, 'MONTE_CARLO_WORKERS', None) or os.cpu_count() or 1
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('forkserver'))
+    return _pool
+
+
+def simulate(diameter_min, diameter_max, velocity_kms, samples=1000000, seed=0, parallel=None):
+    """Percentiles, mean and histogram of each metric over ``samples`` draws"""
+    if diameter_max < diameter_min:
+        diameter_min, diameter_max = diameter_max, diameter_min
+    if diameter_min <= 0 or velocity_kms <= 0:
+        raise ValueError('Monte Carlo needs a positive diameter and velocity')
+
+    edges = metric_edges(diameter_min, diameter_max, velocity_kms)
+    sizes = chunk_sizes(samples)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(child, size, diameter_min, diameter_max, velocity_kms, edges) for child, size in zip(seeds, sizes)]
+
+    if parallel is None:
+        parallel = len(sizes) > 1 and getattr(settings, 'MONTE_CARLO_WORKERS', None) != 1
+    if parallel:
+        chunks = list(get_pool().map(run_chunk, *zip(*args)))
+    else:
+        chunks = [run_chunk(*chunk_args) for chunk_args in args]
+
+    return {metric: summarize(metric, edges[metric], chunks, samples) for metric in MC_METRICS}
+
+
+def summarize(metric, edges, chunks, samples):
+    counts = sum(counts[metric] for counts, _ in chunks)
+    total = sum(sums[metric] for _, sums in chunks)
+    lo, hi = edges
+    fine_edges = np.linspace(lo, hi, FINE_BINS + 1)
+
+    cumulative = np.cumsum(counts)
+    percentiles = {}
+    for q in PERCENTILES:
+        target = samples * q / 100
+        i = int(np.searchsorted(cumulative, target))
+        before = cumulative[i - 1] if i else 0
+        fraction = (target - before) / counts[i] if counts[i] else 0.0
+        percentiles[f'p{q}'] = float(10 ** (fine_edges[i] + fraction * (fine_edges[i + 1] - fine_edges[i])))
+
+    # Trim empty tails before rebinning so the histogram covers the observed range
+    occupied = np.flatnonzero(counts)
+    first, span = occupied[0], occupied[-1] + 1 - occupied[0]
+    group = math.ceil(span / HISTOGRAM_BINS)
+    width = group * math.ceil(span / group)  # at most FINE_BINS
+    first = min(first, FINE_BINS - width)
+    coarse = counts[first:first + width].reshape(-1, group).sum(axis=1)
+    coarse_edges = 10 ** fine_edges[first:first + width + 1:group]
+
+    return {
+        'mean': total / samples,
+        **percentiles,
+        'histogram': {
+            'edges': coarse_edges.tolist(),
+            'counts': coarse.tolist(),
+        },
+    }
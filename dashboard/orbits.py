@@ -0,0 +1,178 @@
+"""Two-body Keplerian orbit propagation.
+
+Objects are described by their six osculating elements (heliocentric,
+ecliptic and equinox J2000, as published by NeoWs ``orbital_data``) plus the
+epoch they refer to. Positions for any number of objects and epochs come
+from one vectorized pass: mean anomaly, Newton iteration on Kepler's
+equation over the whole array, then rotation from the orbital plane.
+Earth uses the low-precision mean elements of Standish (valid 1800-2050),
+which is plenty for geocentric distances of NEOs.
+
+Elements are dicts keyed by ``ELEMENT_FIELDS``; values may be scalars or
+arrays (one per object). Times are Julian dates. Positions are in AU with
+the last axis holding x, y, z.
+"""
+import math
+from datetime import timezone as dt_timezone
+
+import numpy as np
+
+ELEMENT_FIELDS = (
+    'orbit_epoch_jd',
+    'semi_major_axis_au',
+    'eccentricity',
+    'inclination_deg',
+    'ascending_node_deg',
+    'perihelion_argument_deg',
+    'mean_anomaly_deg',
+)
+
+GAUSSIAN_GRAVITATIONAL_CONSTANT = 0.01720209895  # rad/day for a = 1 AU
+J2000_JD = 2451545.0
+UNIX_EPOCH_JD = 2440587.5
+DAYS_PER_CENTURY = 36525.0
+# Julian dates of 1800-01-01 and 2050-01-01, the span Earth's mean elements are fitted for
+EARTH_ELEMENTS_MIN_JD = 2378496.5
+EARTH_ELEMENTS_MAX_JD = 2469807.5
+
+
+def julian_date(value):
+    """Julian date for an aware datetime"""
+    return value.astimezone(dt_timezone.utc).timestamp() / 86400 + UNIX_EPOCH_JD
+
+
+def within_earth_elements(jd):
+    """Whether ``jd`` is a finite Julian date inside the span Earth's elements are valid for"""
+    return math.isfinite(jd) and EARTH_ELEMENTS_MIN_JD <= jd <= EARTH_ELEMENTS_MAX_JD
+
+
+def time_grid(start_jd, end_jd, steps):
+    return np.linspace(start_jd, end_jd, steps)
+
+
+def has_elements(record):
+    """Whether ``record`` carries a complete elliptical orbit"""
+    return all(record.get(field) is not None for field in ELEMENT_FIELDS) and record['eccentricity'] < 1
+
+
+def mean_motion(semi_major_axis_au):
+    """Radians per day"""
+    return GAUSSIAN_GRAVITATIONAL_CONSTANT / np.power(semi_major_axis_au, 1.5)
+
+
+def orbital_period_days(semi_major_axis_au):
+    return 2 * math.pi / mean_motion(semi_major_axis_au)
+
+
+def solve_kepler(mean_anomaly, eccentricity, tolerance=1e-12, max_iterations=50):
+    """Eccentric anomaly E with E - e sin E = M, solved elementwise by Newton iteration"""
+    mean_anomaly = np.remainder(np.asarray(mean_anomaly, dtype=np.float64) + np.pi, 2 * np.pi) - np.pi
+    eccentricity = np.asarray(eccentricity, dtype=np.float64)
+    # Starting at M converges quickly for moderate e; start at ±pi for very eccentric orbits
+    anomaly = np.where(eccentricity < 0.8, mean_anomaly, np.pi * np.sign(mean_anomaly))
+    for _ in range(max_iterations):
+        delta = (anomaly - eccentricity * np.sin(anomaly) - mean_anomaly) / (1 - eccentricity * np.cos(anomaly))
+        anomaly = anomaly - delta
+        if np.max(np.abs(delta), initial=0.0) < tolerance:
+            break
+    return anomaly
+
+
+def orbit_basis(inclination, node, perihelion):
+    """Unit vectors toward perihelion (P) and 90° ahead in the orbit plane (Q); angles in radians"""
+    cos_node, sin_node = np.cos(node), np.sin(node)
+    cos_peri, sin_peri = np.cos(perihelion), np.sin(perihelion)
+    cos_inc, sin_inc = np.cos(inclination), np.sin(inclination)
+    p = np.stack(np.broadcast_arrays(
+        cos_node * cos_peri - sin_node * sin_peri * cos_inc,
+        sin_node * cos_peri + cos_node * sin_peri * cos_inc,
+        sin_peri * sin_inc,
+    ), axis=-1)
+    q = np.stack(np.broadcast_arrays(
+        -cos_node * sin_peri - sin_node * cos_peri * cos_inc,
+        -sin_node * sin_peri + cos_node * cos_peri * cos_inc,
+        cos_peri * sin_inc,
+    ), axis=-1)
+    return p, q
+
+
+def orbit_points(semi_major_axis, eccentricity, p, q, eccentric_anomaly):
+    """Positions at the given eccentric anomalies of an orbit with basis ``p``, ``q``"""
+    x_orbit = semi_major_axis * (np.cos(eccentric_anomaly) - eccentricity)
+    y_orbit = semi_major_axis * np.sqrt(1 - eccentricity ** 2) * np.sin(eccentric_anomaly)
+    return x_orbit[..., np.newaxis] * p + y_orbit[..., np.newaxis] * q
+
+
+def _positions(semi_major_axis, eccentricity, inclination, node, perihelion, mean_anomaly):
+    """Heliocentric ecliptic positions; angles in radians, inputs broadcast together"""
+    p, q = orbit_basis(inclination, node, perihelion)
+    anomaly = solve_kepler(mean_anomaly, eccentricity)
+    semi_major_axis, eccentricity, anomaly = np.broadcast_arrays(semi_major_axis, eccentricity, anomaly)
+    return orbit_points(semi_major_axis, eccentricity, p, q, anomaly)
+
+
+def heliocentric_positions(elements, jd):
+    """Positions at Julian dates ``jd``: shape (len(jd), 3), or (objects, len(jd), 3) for array elements"""
+    def column(field):
+        return np.asarray(elements[field], dtype=np.float64)[..., np.newaxis]
+
+    jd = np.asarray(jd, dtype=np.float64)
+    semi_major_axis = column('semi_major_axis_au')
+    eccentricity = column('eccentricity')
+    if np.any(eccentricity >= 1):
+        raise ValueError('Only elliptical orbits (eccentricity < 1) can be propagated')
+    mean_anomaly = (np.radians(column('mean_anomaly_deg'))
+                    + mean_motion(semi_major_axis) * (jd - column('orbit_epoch_jd')))
+    return _positions(
+        semi_major_axis, eccentricity,
+        np.radians(column('inclination_deg')),
+        np.radians(column('ascending_node_deg')),
+        np.radians(column('perihelion_argument_deg')),
+        mean_anomaly,
+    )
+
+
+def earth_elements(jd=J2000_JD):
+    """Earth-Moon barycenter (a, e, i, node, perihelion argument, mean anomaly) at ``jd``; angles in radians"""
+    centuries = (np.asarray(jd, dtype=np.float64) - J2000_JD) / DAYS_PER_CENTURY
+    semi_major_axis = 1.00000261 + 0.00000562 * centuries
+    eccentricity = 0.01671123 - 0.00004392 * centuries
+    inclination = np.radians(-0.00001531 - 0.01294668 * centuries)
+    mean_longitude = np.radians(100.46457166 + 35999.37244981 * centuries)
+    perihelion_longitude = np.radians(102.93768193 + 0.32327364 * centuries)
+    node = np.zeros_like(centuries)
+    return (semi_major_axis, eccentricity, inclination, node,
+            perihelion_longitude - node, mean_longitude - perihelion_longitude)
+
+
+def earth_positions(jd):
+    """Heliocentric Earth-Moon barycenter positions at ``jd``, shape (len(jd), 3)"""
+    return _positions(*earth_elements(jd))
+
+
+def geocentric_positions(elements, jd):
+    """Positions relative to Earth, same shape as ``heliocentric_positions``"""
+    return heliocentric_positions(elements, jd) - earth_positions(jd)
+
+
+def propagate(elements, jd):
+    """Heliocentric and geocentric positions plus Earth distance (AU) at each epoch"""
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    heliocentric = heliocentric_positions(elements, jd)
+    geocentric = heliocentric - earth_positions(jd)
+    return {
+        'jd': jd,
+        'heliocentric_au': heliocentric,
+        'geocentric_au': geocentric,
+        'earth_distance_au': np.linalg.norm(geocentric, axis=-1),
+    }
+
+
+def elements_from_records(records):
+    """Element columns for the records that have a complete elliptical orbit, plus their indices"""
+    indices = [i for i, record in enumerate(records) if has_elements(record)]
+    columns = {
+        field: np.fromiter((records[i][field] for i in indices), dtype=np.float64, count=len(indices))
+        for field in ELEMENT_FIELDS
+    }
+    return columns, np.asarray(indices, dtype=np.int64)
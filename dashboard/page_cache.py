@@ -0,0 +1,48 @@
+"""Versions for the whole-page cache of asteroid detail pages.
+
+A detail page is a pure function of the object's catalog record, the
+analysis ``MODEL_VERSION``, the image variant manifest (for ``srcset``), the
+templates and the static files manifest (for hashed script names).
+``detail_page_version`` hashes exactly those, so the rendered page is cached
+per object: an ingest that changes one row only changes that object's
+version, and every other page stays valid. The version doubles as the page's
+ETag.
+"""
+import hashlib
+import json
+import os
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import engines
+
+from .analysis import MODEL_VERSION
+from .template_timing import template_names
+
+_templates_version = None
+
+
+def record_digest(record):
+    """Stable hash of a catalog record, ignoring the catalog-wide ``last_updated``"""
+    payload = {key: value for key, value in record.items() if key != 'last_updated'}
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def templates_version(alias='django'):
+    """Hash of the project's template sources, computed once per process"""
+    global _templates_version
+    if _templates_version is None:
+        digest = hashlib.sha1()
+        for directory in engines[alias].template_dirs:
+            for name in template_names([directory]):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    digest.update(name.encode() + b'\0' + f.read())
+        _templates_version = digest.hexdigest()
+    return _templates_version
+
+
+def detail_page_version(record, variants_version):
+    """ETag-sized version of one object's detail page"""
+    # Hashed static names change with every collectstatic that changes a file
+    static_version = getattr(staticfiles_storage, 'manifest_hash', '')
+    parts = f'{MODEL_VERSION}:{variants_version}:{templates_version()}:{static_version}:{record_digest(record)}'
+    return hashlib.sha1(parts.encode()).hexdigest()[:20]
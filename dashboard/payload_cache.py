@@ -0,0 +1,188 @@
+"""Versioned, stampede-protected cache for catalog API payloads.
+
+Entries are keyed by catalog version and ETag, so a new catalog simply
+stops referring to old keys instead of needing a flush. Lookups go through
+a small per-process LRU first, then the shared ``catalog`` cache alias (a
+file-based or memcached backend lets every gunicorn worker reuse one
+build). Regeneration is single-flight: threads in a worker wait on a
+striped lock, and workers race for a short-lived ``cache.add`` lock (an
+``O_EXCL`` lock file for the file backend) while the losers wait for the
+winner's result. Entries are refreshed early with
+probability that grows near expiry (XFetch), so hot keys are rebuilt by one
+request before they expire rather than by all of them at once.
+"""
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ('payload', 'expires', 'delta')
+
+    def __init__(self, payload, expires, delta):
+        self.payload = payload
+        self.expires = expires
+        self.delta = delta
+
+    def __getstate__(self):
+        return self.payload, self.expires, self.delta
+
+    def __setstate__(self, state):
+        self.payload, self.expires, self.delta = state
+
+
+class CatalogPayloadCache:
+    def __init__(self, prefix='neo', alias='catalog', local_entries=256, ttl=None, beta=1.0,
+                 lock_timeout=10, wait_timeout=5.0, poll_interval=0.02):
+        self.prefix = prefix
+        self.alias = alias
+        self.local_entries = local_entries
+        self.ttl = ttl
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._local = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(64)]
+        self.builds = 0
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def key(self, version, etag):
+        return f'{self.prefix}:{version}:{etag}'
+
+    def get_or_build(self, version, etag, build):
+        """Return the payload for ``etag`` under ``version``, building it at most once"""
+        key = self.key(version, etag)
+        entry = self._local_get(key)
+        if entry is not None and not self._refresh_early(entry):
+            return entry.payload
+
+        with self._stripes[hash(key) % len(self._stripes)]:
+            # Another thread in this worker may have just rebuilt it
+            fresh = self._local_get(key)
+            if fresh is not None and fresh is not entry and not self._refresh_early(fresh):
+                return fresh.payload
+
+            shared = self._shared_get(key)
+            if shared is not None and not self._refresh_early(shared):
+                self._local_set(key, shared)
+                return shared.payload
+
+            release = self._acquire(key)
+            if release is not None:
+                try:
+                    return self._build(key, build).payload
+                finally:
+                    release()
+
+            # Someone else is rebuilding: serve what we have, or wait for theirs
+            current = shared or entry or fresh
+            if current is not None:
+                return current.payload
+            waited = self._wait_for(key)
+            if waited is not None:
+                return waited.payload
+            logger.warning('Timed out waiting for %s, building it here', key)
+            return self._build(key, build).payload
+
+    def _shared_get(self, key):
+        with timed('cache'):
+            return self.shared.get(key)
+
+    def clear_local(self):
+        with self._local_lock:
+            self._local.clear()
+
+    def _ttl(self):
+        if self.ttl is not None:
+            return self.ttl
+        return getattr(settings, 'CATALOG_CACHE_TTL', 3600)
+
+    def _acquire(self, key):
+        """Take the cross-process rebuild lock for ``key``; returns a release callable or None"""
+        if isinstance(self.shared, FileBasedCache):
+            # FileBasedCache.add() is check-then-set, so race on an O_EXCL file instead
+            path = os.path.join(self.shared._dir, f'{self.shared.make_key(key).replace(":", "_")}.lock')
+            try:
+                if time.time() - os.path.getmtime(path) > self.lock_timeout:
+                    os.unlink(path)
+            except OSError:
+                pass
+            try:
+                os.makedirs(self.shared._dir, exist_ok=True)
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                return None
+            return lambda: os.unlink(path)
+
+        lock_key = f'{key}:lock'
+        token = uuid.uuid4().hex
+        if not self.shared.add(lock_key, token, self.lock_timeout):
+            return None
+
+        def release():
+            if self.shared.get(lock_key) == token:
+                self.shared.delete(lock_key)
+        return release
+
+    def _build(self, key, build):
+        started = time.monotonic()
+        payload = build()
+        payload.precompress()
+        delta = time.monotonic() - started
+        ttl = self._ttl()
+        entry = _Entry(payload, time.time() + ttl, delta)
+        self.shared.set(key, entry, ttl)
+        self._local_set(key, entry)
+        self.builds += 1
+        return entry
+
+    def _refresh_early(self, entry):
+        """XFetch: refresh with probability rising as expiry approaches"""
+        jitter = -entry.delta * self.beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= entry.expires
+
+    def _wait_for(self, key):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self._shared_get(key)
+            if entry is not None:
+                self._local_set(key, entry)
+                return entry
+        return None
+
+    def _local_get(self, key):
+        with self._local_lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.time():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _local_set(self, key, entry):
+        with self._local_lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_entries:
+                self._local.popitem(last=False)
@@ -0,0 +1,112 @@
+"""Opt-in profiling of single requests for staff users.
+
+A signed-in staff user adds ``?profile=1`` to any URL (or sends
+``X-Profile: 1``), and ``ProfilingMiddleware`` runs that one request under
+cProfile. The pstats dump is written to ``PROFILE_DIR``, named after the
+route and time. A ``RequestProfile`` row stores the top functions by
+cumulative time, and the admin lists recent profiles with a download link
+for ``snakeviz``/``pstats``. The response carries ``X-Profile-Id``. Requests
+without the trigger only pay for checking it, and only the newest
+``PROFILE_MAX_PROFILES`` profiles are kept.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+
+from .metrics import request_route
+from .models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = 'profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_SUMMARY_LINES = 40
+
+
+def profile_requested(request):
+    return bool(request.GET.get(PROFILE_PARAM) or request.META.get(PROFILE_HEADER))
+
+
+def profile_path(filename):
+    return os.path.join(str(settings.PROFILE_DIR), filename)
+
+
+def save_profile(request, response, profiler, duration):
+    created_at = timezone.now()
+    route = request_route(request)
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '-', route).strip('-') or 'request'
+    filename = f'{created_at:%Y%m%d-%H%M%S}-{slug}-{uuid.uuid4().hex[:6]}.prof'
+    os.makedirs(str(settings.PROFILE_DIR), exist_ok=True)
+    profiler.dump_stats(profile_path(filename))
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+    profile = RequestProfile.objects.create(
+        created_at=created_at,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        route=route,
+        status_code=response.status_code,
+        duration_ms=duration * 1000,
+        filename=filename,
+        summary=summary.getvalue(),
+        user=request.user if request.user.is_authenticated else None,
+    )
+    prune_profiles(getattr(settings, 'PROFILE_MAX_PROFILES', 200))
+    return profile
+
+
+def delete_profile_files(profiles):
+    for profile in profiles:
+        try:
+            os.remove(profile_path(profile.filename))
+        except FileNotFoundError:
+            pass
+
+
+def prune_profiles(keep):
+    """Delete all but the newest ``keep`` profiles and their dumps"""
+    old = list(RequestProfile.objects.order_by('-created_at', '-id')[keep:])
+    if old:
+        delete_profile_files(old)
+        RequestProfile.objects.filter(pk__in=[profile.pk for profile in old]).delete()
+
+
+class ProfilingMiddleware:
+    """Profile requests from staff users that ask for it with ``?profile=1`` or ``X-Profile``"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profile_requested(request) or not request.user.is_staff:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already running in this process
+            return self.get_response(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        try:
+            profile = save_profile(request, response, profiler, duration)
+        except OSError:
+            logger.exception('Could not save the profile of %s', request.path)
+        else:
+            response['X-Profile-Id'] = str(profile.pk)
+        return response
@@ -0,0 +1,154 @@
+"""Spatial index of catalog positions for "what is near this point at epoch T".
+
+Every catalog object with orbital elements is propagated once per epoch
+bucket (``EPOCH_BUCKET_DAYS`` wide) and binned into a uniform grid of
+``CELL_SIZE_AU`` cubes. Objects are sorted by cell key, so each cell is a
+contiguous slice found with ``searchsorted`` and a query only touches the
+cells overlapping its sphere.
+
+Queries can ask for any epoch. The bucket's grid is searched with the radius
+widened by the farthest any object can move between the bucket epoch and
+the requested one (perihelion speed bound). Only those candidates are
+propagated to the exact epoch and filtered, so results are exact while the
+index is shared by every request in the bucket.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .orbits import GAUSSIAN_GRAVITATIONAL_CONSTANT, elements_from_records, heliocentric_positions
+
+EPOCH_BUCKET_DAYS = 1.0
+CELL_SIZE_AU = 0.05
+INDEX_CACHE_SIZE = 16
+
+
+class CatalogOrbits:
+    """Element columns of every catalog object with an orbit, built once per catalog version"""
+
+    def __init__(self, catalog):
+        records = list(catalog)
+        self.version = catalog.version
+        self.elements, indices = elements_from_records(records)
+        self.ids = np.array([records[i]['id'] for i in indices.tolist()], dtype=object)
+        self.names = np.array([records[i]['name'] for i in indices.tolist()], dtype=object)
+        # Vis-viva at perihelion bounds each object's heliocentric speed (AU/day)
+        a, e = self.elements['semi_major_axis_au'], self.elements['eccentricity']
+        speed = GAUSSIAN_GRAVITATIONAL_CONSTANT * np.sqrt((1 + e) / (a * (1 - e)))
+        self.max_speed = float(speed.max(initial=0.0))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, jd, rows=None):
+        """(objects, 3) heliocentric positions at one epoch, optionally for a subset of rows"""
+        elements = self.elements if rows is None else {field: values[rows] for field, values in self.elements.items()}
+        return heliocentric_positions(elements, [jd])[:, 0]
+
+
+class EpochIndex:
+    """Uniform grid over the catalog's positions at one bucket epoch"""
+
+    def __init__(self, orbits, epoch_jd, cell_size=CELL_SIZE_AU):
+        self.orbits = orbits
+        self.epoch_jd = epoch_jd
+        self.cell_size = cell_size
+        positions = orbits.positions(epoch_jd)
+        cells = np.floor(positions / cell_size).astype(np.int64)
+        self.origin = cells.min(axis=0, initial=0)
+        self.shape = cells.max(axis=0, initial=0) - self.origin + 1
+        keys = self._linear(cells - self.origin)
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+        self.positions = positions[self.order]
+        self.low = positions.min(axis=0, initial=0.0)
+        self.high = positions.max(axis=0, initial=0.0)
+
+    def _linear(self, cells):
+        return (cells[..., 0] * self.shape[1] + cells[..., 1]) * self.shape[2] + cells[..., 2]
+
+    def candidates(self, center, radius):
+        """Sorted-array positions of objects within ``radius`` of ``center`` at the bucket epoch"""
+        low = np.maximum(np.floor((center - radius) / self.cell_size).astype(np.int64) - self.origin, 0)
+        high = np.minimum(np.floor((center + radius) / self.cell_size).astype(np.int64) - self.origin, self.shape - 1)
+        if np.any(high < low):
+            return np.empty(0, dtype=np.int64)
+        if np.prod(high - low + 1) >= len(self.keys):
+            # The sphere spans more cells than there are objects: scanning is cheaper
+            found = np.arange(len(self.keys))
+        else:
+            grid = np.stack(np.meshgrid(*(np.arange(lo, hi + 1) for lo, hi in zip(low, high)), indexing='ij'), axis=-1)
+            cell_keys = self._linear(grid.reshape(-1, 3))
+            starts = np.searchsorted(self.keys, cell_keys, side='left')
+            lengths = np.searchsorted(self.keys, cell_keys, side='right') - starts
+            offsets = np.cumsum(lengths) - lengths
+            found = np.arange(lengths.sum()) - np.repeat(offsets - starts, lengths)
+        distance = np.linalg.norm(self.positions[found] - center, axis=1)
+        return found[distance <= radius]
+
+    def margin(self, jd):
+        return self.orbits.max_speed * abs(jd - self.epoch_jd)
+
+    def within(self, center, radius, jd):
+        """(catalog rows, exact distances, exact positions) within ``radius`` at ``jd``, nearest first"""
+        found = self.candidates(center, radius + self.margin(jd))
+        rows = self.order[found]
+        positions = self.orbits.positions(jd, rows)
+        distance = np.linalg.norm(positions - center, axis=1)
+        keep = distance <= radius
+        rows, distance, positions = rows[keep], distance[keep], positions[keep]
+        nearest = np.argsort(distance, kind='stable')
+        return rows[nearest], distance[nearest], positions[nearest]
+
+    def nearest(self, center, k, jd):
+        """The ``k`` objects closest to ``center`` at ``jd``, as ``within`` returns them"""
+        k = min(k, len(self.keys))
+        if k == 0:
+            return self.within(center, 0.0, jd)
+        # Farthest any object can be from the center; past this radius everything is a candidate
+        reach = np.linalg.norm(np.maximum(np.abs(center - self.low), np.abs(center - self.high)))
+        radius = self.cell_size
+        found = self.candidates(center, radius)
+        while len(found) < k and radius < reach:
+            radius *= 2
+            found = self.candidates(center, radius)
+        # The k-th exact distance among these bounds the true k-th nearest distance
+        exact = np.linalg.norm(self.orbits.positions(jd, self.order[found]) - center, axis=1)
+        bound = np.partition(exact, k - 1)[k - 1]
+        rows, distance, positions = self.within(center, bound, jd)
+        return rows[:k], distance[:k], positions[:k]
+
+
+_catalog_orbits = None
+_catalog_orbits_lock = threading.Lock()
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_catalog_orbits(catalog):
+    global _catalog_orbits
+    current = _catalog_orbits
+    if current is None or current.version != catalog.version:
+        with _catalog_orbits_lock:
+            current = _catalog_orbits
+            if current is None or current.version != catalog.version:
+                current = _catalog_orbits = CatalogOrbits(catalog)
+    return current
+
+
+def get_epoch_index(catalog, jd):
+    """Index for the bucket containing ``jd``, built on first use and kept in a small LRU"""
+    bucket = round(jd / EPOCH_BUCKET_DAYS)
+    key = (catalog.version, bucket)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = EpochIndex(get_catalog_orbits(catalog), bucket * EPOCH_BUCKET_DAYS)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,189 @@
+"""Production static files: hashed names, precompressed bodies, far-future caching.
+
+``collectstatic`` stores files with ``CompressedManifestStaticFilesStorage``:
+Django's manifest storage gives each file a content-hashed name, and every
+compressible file also gets ``.gz`` (and ``.br`` when brotli is installed)
+siblings so nothing is compressed per request.
+
+``PrecompressedStaticMiddleware`` answers ``STATIC_URL`` requests from
+``STATIC_ROOT`` before URL resolution, picking the precompressed sibling the
+client accepts. Hashed names are immutable and cached for a year; plain
+names (the catalog's hard-coded image paths) get a short max-age and an
+ETag. Bodies are sent as ``FileResponse`` so the server can use sendfile.
+With ``DEBUG`` on the middleware stays out of the way and the staticfiles
+finders serve the source files as usual.
+"""
+import json
+import mimetypes
+import os
+import threading
+from stat import S_ISREG
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.static import was_modified_since
+
+from .compression import MIN_COMPRESS_BYTES, compress, negotiate_encoding, supported_encodings
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+# Only keep a compressed sibling that saves at least this fraction
+MIN_SAVING = 0.05
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+STATIC_MAX_AGE = 3600
+# Stat results kept by the middleware before it starts over
+MAX_CACHED_FILES = 1024
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes .gz/.br siblings of compressible files"""
+
+    # Without a collected manifest (runserver, tests) names fall back to the
+    # unhashed ones instead of raising for every {% static %} tag
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not collected into STATIC_ROOT either: the finders still serve the source file
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            for compressed_name in self.compress_file(name):
+                yield name, compressed_name, True
+
+    def compress_file(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS) or not self.exists(name):
+            return []
+        with self.open(name) as f:
+            body = f.read()
+        if len(body) < MIN_COMPRESS_BYTES:
+            return []
+        written = []
+        for encoding in supported_encodings():
+            compressed_name = name + ENCODING_SUFFIXES[encoding]
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            data = compress(body, encoding)
+            if len(data) <= len(body) * (1 - MIN_SAVING):
+                with open(self.path(compressed_name), 'wb') as f:
+                    f.write(data)
+                written.append(compressed_name)
+        return written
+
+
+class StaticFile:
+    """Stat results for one file and its precompressed siblings"""
+
+    def __init__(self, path, immutable, stat):
+        self.path = path
+        self.immutable = immutable
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.mtime = stat.st_mtime
+        self.etag = f'{int(stat.st_mtime_ns):x}-{stat.st_size:x}'
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.variants = {None: path}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if os.path.exists(path + suffix):
+                self.variants[encoding] = path + suffix
+        self.encodings = tuple(encoding for encoding in ENCODING_SUFFIXES if encoding in self.variants)
+
+    def cache_headers(self, response, encoding):
+        if self.immutable:
+            response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}'
+        response['ETag'] = quote_etag(f'{self.etag}-{encoding}' if encoding else self.etag)
+        response['Last-Modified'] = http_date(self.mtime)
+        if self.encodings:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def response(self, request):
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.encodings)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            ours = {quote_etag(f'{self.etag}-{e}' if e else self.etag) for e in self.variants}
+            if '*' in parse_etags(if_none_match) or not ours.isdisjoint(parse_etags(if_none_match)):
+                return self.cache_headers(HttpResponseNotModified(), encoding)
+        elif not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), self.mtime):
+            return self.cache_headers(HttpResponseNotModified(), encoding)
+
+        response = FileResponse(open(self.variants[encoding], 'rb'), content_type=self.content_type)
+        # FileResponse names the file it was given (x.css.gz); this is an inline asset
+        del response['Content-Disposition']
+        if encoding:
+            response['Content-Encoding'] = encoding
+        return self.cache_headers(response, encoding)
+
+
+class PrecompressedStaticMiddleware:
+    """Serve files under ``STATIC_URL`` from ``STATIC_ROOT`` without reaching a view"""
+
+    def __init__(self, get_response):
+        if settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = str(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+        # Stat results per name, checked against the file on every request so
+        # a later collectstatic is picked up without a restart
+        self._files = {}
+        self._hashed = None
+        self._manifest_version = None
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        if self.root and request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            static_file = self.find(request.path[len(self.prefix):])
+            if static_file is not None:
+                return static_file.response(request)
+        return self.get_response(request)
+
+    def hashed_names(self):
+        """Names written by the manifest storage, which never change content"""
+        manifest = os.path.join(self.root, ManifestStaticFilesStorage.manifest_name)
+        try:
+            stat = os.stat(manifest)
+            version = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            version = None
+        if self._hashed is None or version != self._manifest_version:
+            try:
+                with open(manifest) as f:
+                    hashed = frozenset(json.load(f).get('paths', {}).values())
+            except (FileNotFoundError, ValueError):
+                hashed = frozenset()
+            self._hashed, self._manifest_version = hashed, version
+        return self._hashed
+
+    def find(self, name):
+        if name.endswith(tuple(ENCODING_SUFFIXES.values())):
+            return None
+        try:
+            path = safe_join(self.root, name)
+            stat = os.stat(path)
+        except (SuspiciousFileOperation, OSError):
+            return None
+        if not S_ISREG(stat.st_mode):
+            return None
+        static_file = self._files.get(name)
+        if static_file is not None and static_file.version == (stat.st_mtime_ns, stat.st_size):
+            return static_file
+        static_file = StaticFile(path, name in self.hashed_names(), stat)
+        with self._lock:
+            if len(self._files) >= MAX_CACHED_FILES:
+                self._files.clear()
+            self._files[name] = static_file
+        return static_file
@@ -0,0 +1,165 @@
+"""Compiled-once templates with a per-template render-time breakdown.
+
+``TimingLoader`` is Django's cached loader: each template is parsed and
+compiled once per process and reused for every request. It also times every
+template it hands out, including the base templates and includes reached
+through ``{% extends %}`` and ``{% include %}``, so ``template_stats`` can
+split a page's render time into the templates and blocks it is built from.
+``self`` time excludes nested templates and blocks; slow top-level renders
+are logged, and every top-level render counts towards the request's ``tpl``
+Server-Timing entry. The timing lives in the ``TimedTemplate`` class the
+loader compiles, so nothing is patched onto cached instances and Django's
+test instrumentation of ``Template._render`` keeps working.
+
+``warm_templates`` compiles every project template at startup so the first
+request to each page does not pay for parsing.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.template import Template, TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.base import NodeList
+from django.template.loader_tags import BlockNode
+from django.template.loaders import base, cached
+
+from .metrics import record_phase
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+_local = threading.local()
+
+
+class TemplateStats:
+    """Render count and total/self/max milliseconds per template name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, elapsed, own):
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                entry = self._stats[name] = {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0}
+            entry['count'] += 1
+            entry['total_ms'] += elapsed * 1000
+            entry['self_ms'] += own * 1000
+            entry['max_ms'] = max(entry['max_ms'], elapsed * 1000)
+
+    def snapshot(self):
+        """Per-template rows, slowest total first"""
+        with self._lock:
+            rows = [dict(entry, template=name) for name, entry in self._stats.items()]
+        for row in rows:
+            row['mean_ms'] = row['total_ms'] / row['count']
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+template_stats = TemplateStats()
+
+
+def _timed_render(name, render, context):
+    """``render(context)``, recording its time under ``name``"""
+    stack = _local.__dict__.setdefault('stack', [])
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return render(context)
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        else:
+            record_phase('tpl', elapsed)
+            slow_ms = getattr(settings, 'TEMPLATE_SLOW_RENDER_MS', None)
+            if slow_ms is not None and elapsed * 1000 >= slow_ms:
+                logger.warning('Rendering %s took %.1f ms', name, elapsed * 1000)
+        template_stats.record(name, elapsed, elapsed - nested)
+
+
+class TimedNodeList(NodeList):
+    """A block's body, timed under ``<template>#<block>``"""
+
+    def __init__(self, nodelist, timing_name):
+        super().__init__(nodelist)
+        self.contains_nontext = nodelist.contains_nontext
+        self.timing_name = timing_name
+
+    def render(self, context):
+        return _timed_render(self.timing_name, super().render, context)
+
+
+class TimedTemplate(Template):
+    """Template that records the time of each render and of each of its blocks"""
+
+    @property
+    def timing_name(self):
+        return self.origin.template_name or self.name
+
+    def compile_nodelist(self):
+        nodelist = super().compile_nodelist()
+        # A child's blocks are rendered from inside its parent's body, so without
+        # their own rows the parent's self time would include the child's content
+        for block in nodelist.get_nodes_by_type(BlockNode):
+            block.nodelist = TimedNodeList(block.nodelist, f'{self.timing_name}#{block.name}')
+        return nodelist
+
+    def _render(self, context):
+        return _timed_render(self.timing_name, super()._render, context)
+
+
+class _TimedTemplateLoader(base.Loader):
+    def get_template(self, template_name, skip=None):
+        """``base.Loader.get_template``, compiling a ``TimedTemplate``"""
+        tried = []
+        for origin in self.get_template_sources(template_name):
+            if skip is not None and origin in skip:
+                tried.append((origin, 'Skipped to avoid recursion'))
+                continue
+            try:
+                contents = self.get_contents(origin)
+            except TemplateDoesNotExist:
+                tried.append((origin, 'Source does not exist'))
+                continue
+            return TimedTemplate(contents, origin, origin.template_name, self.engine)
+        raise TemplateDoesNotExist(template_name, tried=tried)
+
+
+class TimingLoader(cached.Loader, _TimedTemplateLoader):
+    """Cached loader whose templates record their render times"""
+
+
+def template_names(directories):
+    """Every template name under the given directories"""
+    names = set()
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    names.add(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates(alias='django'):
+    """Compile every template into the cached loader; returns how many compiled"""
+    backend = engines[alias]
+    compiled = 0
+    # DIRS only (APP_DIRS is off): the project's pages, not every admin template
+    for name in template_names(backend.template_dirs):
+        try:
+            backend.engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception('Could not compile template %s', name)
+        else:
+            compiled += 1
+    return compiled
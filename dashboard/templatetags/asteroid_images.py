@@ -0,0 +1,22 @@
+from django import template
+from django.utils.html import format_html
+
+from dashboard.variants import get_variant_index
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(url, alt='', css_class='', sizes='100vw', loading='lazy'):
+    """<picture> with WebP and JPEG srcsets when variants exist, else a plain <img>"""
+    info = get_variant_index().lookup(url)
+    if info is None:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+                           url, alt, css_class, loading)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async"></picture>',
+        info['webp_srcset'], sizes, url, info['srcset'], sizes,
+        info['width'], info['height'], alt, css_class, loading,
+    )
@@ -0,0 +1,33 @@
+from django import template
+from django.templatetags.cache import CacheNode
+
+register = template.Library()
+
+
+class FragmentCacheNode(CacheNode):
+    def render(self, context):
+        if not context.get('cache_fragments', True):
+            return self.nodelist.render(context)
+        return super().render(context)
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """``{% cache %}`` (same arguments, closed by ``{% endfragment_cache %}``) that
+    renders its body uncached when the context sets ``cache_fragments`` to False"""
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 3:
+        raise template.TemplateSyntaxError(f"'{tokens[0]}' tag requires at least 2 arguments.")
+    cache_name = None
+    if len(tokens) > 3 and tokens[-1].startswith('using='):
+        cache_name = parser.compile_filter(tokens[-1][len('using='):])
+        tokens = tokens[:-1]
+    return FragmentCacheNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        [parser.compile_filter(t) for t in tokens[3:]],
+        cache_name,
+    )
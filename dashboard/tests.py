@@ -1,3 +1,1721 @@
-from django.test import TestCase
+import asyncio
+import errno
+import gzip
+import importlib
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from multiprocessing import get_context
+from unittest import mock, skipIf
+from xml.etree import ElementTree
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.finders import get_finders
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from meteormatrix.testing import TEST_ROOT, isolated_paths
+
+from .analysis import (
+    _environmental_impact, calculate_environmental_impact, calculate_trajectory_data, seeded_random,
+)
+from .catalog import BUILTIN_OBJECTS, AsteroidCatalog, get_catalog, load_catalog, reload_catalog
+from .compression import Payload, negotiate_encoding
+from .downloads import Downloader, load_manifest, save_manifest
+from .events import (
+    EVENT_HISTORY, EVENTS_PATH, SUBSCRIBER_QUEUE_SIZE, EventBroker, catalog_changes, catalog_summary,
+    stream_events, with_event_stream,
+)
+from .events import broker as events_broker
+from .image_cache import IMAGE_MAX_AGE, ImageCache
+from .imagegen import RENDERERS, catalog_image_data, generate_images, input_hash, render_svg
+from .imagegen import load_manifest as imagegen_manifest
+from .impact import (
+    DEFAULT_DENSITY, IMPACT_FIELDS, CatalogImpact, calculate_impact_analysis, impact_batch, materialized_metrics,
+)
+from .jsmin import minify
+from .management.commands.ingest_neo_feed import parse_approach_date, parse_orbital_elements
+from .metrics import (
+    BUCKET_FIELDS, QUERIES_FIELD, STATUS_FIELD, SUM_FIELD, UNMATCHED_ROUTE, MetricsStore, RequestTimings,
+)
+from .models import (
+    IMPACT_METRIC_FIELDS, Asteroid, CloseApproach, RequestProfile, refresh_impact_metrics,
+    refresh_primary_approaches,
+)
+from .moid import MOID_ELEMENT_FIELDS, compute_moid_rows, earth_orbit, moid_batch
+from .montecarlo import CHUNK_SAMPLES, MC_METRICS, PERCENTILES, simulate
+from .orbits import (
+    ELEMENT_FIELDS, J2000_JD, earth_positions, heliocentric_positions, orbit_basis, orbit_points, orbital_period_days,
+    solve_kepler,
+)
+from .page_cache import detail_page_version, record_digest
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+from .payload_cache import CatalogPayloadCache
+from .profiling import profile_path, prune_profiles
+from .spatial import CatalogOrbits, EpochIndex, get_catalog_orbits
+from .staticfiles import STATIC_MAX_AGE, CompressedManifestStaticFilesStorage
+from .template_timing import TemplateStats, template_names, template_stats, warm_templates
+from .threaded_wsgi import ThreadedWSGI
+from .variants import Image, VariantIndex, build_variants, with_srcsets
+from .variants import load_manifest as variants_manifest
+from .views import IMPACT_BATCH_MAX_ROWS, detail_pages, neo_payloads
+
+# A complete elliptical orbit (Apollo-type, 1.5 AU) for orbit, MOID and spatial tests
+ORBIT_ELEMENTS = {
+    'orbit_epoch_jd': 2461000.5, 'semi_major_axis_au': 1.5, 'eccentricity': 0.25, 'inclination_deg': 4.0,
+    'ascending_node_deg': 80.0, 'perihelion_argument_deg': 30.0, 'mean_anomaly_deg': 10.0,
+}
+
+
+def make_asteroid(neo_id, name=None, hazardous=False, diameter=(0.1, 0.2), days=30, velocity_kms=12.5,
+                  miss_distance_km=4000000.0, **fields):
+    """An Asteroid with one close approach and its derived columns filled in, like an ingest writes"""
+    asteroid = Asteroid.objects.create(
+        neo_id=neo_id,
+        name=name or f'({neo_id})',
+        diameter_min=diameter[0],
+        diameter_max=diameter[1],
+        is_potentially_hazardous=hazardous,
+        absolute_magnitude=21.0,
+        **fields,
+    )
+    CloseApproach.objects.create(
+        asteroid=asteroid,
+        approach_date=timezone.now() + timedelta(days=days),
+        velocity_kms=velocity_kms,
+        velocity_kmh=velocity_kms * 3600,
+        miss_distance_km=miss_distance_km,
+        miss_distance_au=miss_distance_km / 149597870.7,
+    )
+    refresh_primary_approaches([asteroid.pk])
+    refresh_impact_metrics([asteroid.pk])
+    return asteroid
+
+
+@isolated_paths
+class CatalogTests(TestCase):
+    def test_curated_objects_are_seeded(self):
+        catalog = reload_catalog()
+        for record in BUILTIN_OBJECTS:
+            self.assertIn(record['id'], catalog)
+        self.assertEqual(catalog.get('99942')['name'], 'Apophis')
+
+    def test_indexes(self):
+        catalog = reload_catalog()
+        self.assertEqual([record['id'] for record in catalog.by_name('APOPHIS')], ['99942'])
+        self.assertTrue(all(record['is_hazardous'] for record in catalog.hazardous()))
+        self.assertIn('Comet', catalog.types())
+        self.assertTrue(all(record['type'] == 'Comet' for record in catalog.by_type('Comet')))
+        self.assertIsNone(catalog.get('missing'))
+
+    def test_records_are_immutable(self):
+        record = reload_catalog().get('99942')
+        with self.assertRaises(TypeError):
+            record['name'] = 'Changed'
+
+    def test_duplicate_ids_keep_the_first_record(self):
+        catalog = AsteroidCatalog([
+            {'id': '1', 'name': 'First', 'type': 'Asteroid', 'is_hazardous': False},
+            {'id': '1', 'name': 'Second', 'type': 'Asteroid', 'is_hazardous': False},
+        ])
+        self.assertEqual(len(catalog), 1)
+        self.assertEqual(catalog.get('1')['name'], 'First')
+
+    def test_version_follows_content(self):
+        record = {'id': '1', 'name': 'First', 'type': 'Asteroid', 'is_hazardous': False}
+        same = AsteroidCatalog([record]).version
+        self.assertEqual(same, AsteroidCatalog([dict(record)]).version)
+        self.assertNotEqual(same, AsteroidCatalog([dict(record, name='Renamed')]).version)
+
+    def test_catalog_is_built_once(self):
+        catalog = reload_catalog()
+        self.assertIs(get_catalog(), catalog)
+
+    def test_reload_sees_new_rows(self):
+        reload_catalog()
+        make_asteroid('3000001', name='Fresh Rock')
+        self.assertEqual(reload_catalog().get('3000001')['name'], 'Fresh Rock')
+
+    def test_curated_objects_fill_in_missing_rows(self):
+        Asteroid.objects.filter(neo_id='99942').delete()
+        catalog = load_catalog()
+        self.assertEqual(catalog.get('99942')['name'], 'Apophis')
+        self.assertIsNotNone(catalog.get('99942')['kinetic_energy_joules'])
+
+
+@isolated_paths
+class PageTests(TestCase):
+    def test_pages_render(self):
+        for path in ('/', '/asteroids/', '/education/', '/quiz/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_detail_page(self):
+        reload_catalog()
+        response = self.client.get('/asteroid/99942/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Apophis')
+
+    def test_unknown_detail_page_renders_placeholder(self):
+        response = self.client.get('/asteroid/no-such-object/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Asteroid no-such-object')
+
+
+def neo_object(neo_id, name, approach_date='2030-01-15', velocity_kms=10.0, miss_distance_km=2000000.0,
+               hazardous=False, diameter=(0.2, 0.4), orbital_data=None):
+    """One object as NeoWs feed and browse pages return it"""
+    neo = {
+        'id': neo_id,
+        'name': name,
+        'absolute_magnitude_h': 20.5,
+        'is_potentially_hazardous_asteroid': hazardous,
+        'estimated_diameter': {'kilometers': {
+            'estimated_diameter_min': diameter[0], 'estimated_diameter_max': diameter[1],
+        }},
+        'close_approach_data': [{
+            'close_approach_date': approach_date,
+            'relative_velocity': {
+                'kilometers_per_second': str(velocity_kms),
+                'kilometers_per_hour': str(velocity_kms * 3600),
+            },
+            'miss_distance': {
+                'kilometers': str(miss_distance_km),
+                'astronomical': str(miss_distance_km / 149597870.7),
+            },
+            'orbiting_body': 'Earth',
+        }],
+    }
+    if orbital_data is not None:
+        neo['orbital_data'] = orbital_data
+    return neo
+
+
+@isolated_paths
+class IngestNeoFeedTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=TEST_ROOT)
+        self.checkpoint = os.path.join(self.directory, 'checkpoint.json')
+
+    def write_page(self, name, objects):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            json.dump({'near_earth_objects': {'2030-01-15': objects}}, f)
+        return path
+
+    def ingest(self, *args):
+        call_command('ingest_neo_feed', *args, '--checkpoint', self.checkpoint, stdout=StringIO())
+
+    def test_upserts_rows_and_derived_columns(self):
+        self.write_page('page1.json', [
+            neo_object('3001', 'Rock A', hazardous=True, orbital_data={
+                'epoch_osculation': '2461000.5', 'semi_major_axis': '1.2', 'eccentricity': '0.2',
+                'inclination': '5', 'ascending_node_longitude': '80', 'perihelion_argument': '30',
+                'mean_anomaly': '10',
+            }),
+            neo_object('3002', 'Rock B'),
+        ])
+        self.ingest(self.directory)
+
+        rock = Asteroid.objects.get(neo_id='3001')
+        self.assertTrue(rock.is_potentially_hazardous)
+        self.assertEqual(rock.velocity_kms, 10.0)
+        self.assertEqual(rock.close_approach_date.date().isoformat(), '2030-01-15')
+        self.assertIsNotNone(rock.kinetic_energy_joules)
+        self.assertEqual(rock.semi_major_axis_au, 1.2)
+        # Left for compute_moid, outside the upsert transaction
+        self.assertIsNone(rock.moid_au)
+        call_command('compute_moid', '--workers', '1', '--missing-only', stdout=StringIO())
+        self.assertIsNotNone(Asteroid.objects.get(neo_id='3001').moid_au)
+        self.assertIsNone(Asteroid.objects.get(neo_id='3002').semi_major_axis_au)
+        self.assertTrue(os.path.exists(settings.CATALOG_NOTIFY_FILE))
+
+    def test_reingest_updates_in_place(self):
+        self.write_page('page1.json', [neo_object('3001', 'Rock A')])
+        self.ingest(self.directory)
+        self.write_page('page1.json', [neo_object('3001', 'Rock A renamed', velocity_kms=20.0)])
+        self.ingest(self.directory)
+
+        self.assertEqual(Asteroid.objects.filter(neo_id='3001').count(), 1)
+        rock = Asteroid.objects.get(neo_id='3001')
+        self.assertEqual(rock.name, 'Rock A renamed')
+        self.assertEqual(rock.close_approaches.count(), 1)
+        self.assertEqual(rock.velocity_kms, 20.0)
+
+    def test_resume_skips_completed_pages(self):
+        self.write_page('page1.json', [neo_object('3001', 'Rock A')])
+        self.ingest(self.directory)
+        Asteroid.objects.filter(neo_id='3001').delete()
+        self.write_page('page2.json', [neo_object('3002', 'Rock B')])
+        self.ingest(self.directory, '--resume')
+
+        self.assertFalse(Asteroid.objects.filter(neo_id='3001').exists())
+        self.assertTrue(Asteroid.objects.filter(neo_id='3002').exists())
+
+    def test_missing_source(self):
+        with self.assertRaises(CommandError):
+            self.ingest(os.path.join(self.directory, 'nothing-*.json'))
+
+    def test_parse_approach_date(self):
+        self.assertEqual(parse_approach_date({'epoch_date_close_approach': 0}).year, 1970)
+        self.assertEqual(parse_approach_date({'close_approach_date_full': '2030-Jan-15 12:30'}).hour, 12)
+        self.assertEqual(parse_approach_date({'close_approach_date': '2030-01-15'}).day, 15)
+
+    def test_incomplete_orbital_data_is_ignored(self):
+        self.assertIsNone(parse_orbital_elements({'orbital_data': {'eccentricity': '0.1'}}))
+        self.assertIsNone(parse_orbital_elements({}))
+
+
+@isolated_paths
+class NeoDataApiTests(TestCase):
+    def setUp(self):
+        for i in range(12):
+            make_asteroid(
+                f'{31000 + i}', name=f'Rock {i:02d}', hazardous=i % 3 == 0, diameter=(0.05 * i, 0.1 * i + 0.01),
+                days=10 + i, velocity_kms=5.0 + (i * 7) % 12,
+            )
+        reload_catalog()
+
+    def get(self, **params):
+        return self.client.get('/api/neo-data/', params)
+
+    def walk(self, **params):
+        ids, cursor = [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            data = self.get(**query).json()
+            self.assertTrue(data['success'], data)
+            ids += [record['id'] for record in data['asteroids']]
+            cursor = data['next_cursor']
+            self.assertEqual(data['has_more'], cursor is not None)
+            if cursor is None:
+                return ids
+
+    def test_cursor_pages_cover_every_row_once_in_order(self):
+        expected = {
+            'id': list(Asteroid.objects.order_by('id').values_list('neo_id', flat=True)),
+            '-velocity': [row.neo_id for row in sorted(
+                Asteroid.objects.all(), key=lambda row: (-(row.velocity_kms or 0), -row.pk))],
+            'name': list(Asteroid.objects.order_by('name', 'id').values_list('neo_id', flat=True)),
+        }
+        for sort, ids in expected.items():
+            with self.subTest(sort=sort):
+                self.assertEqual(self.walk(sort=sort, limit=7), ids)
+
+    def test_null_sort_values_come_last(self):
+        make_asteroid('31999', name='Orbit rock', moid_au=0.01)
+        reload_catalog()
+        ids = self.walk(sort='moid', limit=5)
+        self.assertEqual(ids[0], '31999')
+        self.assertEqual(len(ids), Asteroid.objects.count())
+
+    def test_filters_and_counts(self):
+        data = self.get(hazardous='true', search='rock', limit=2).json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['total_count'], 4)
+        self.assertEqual(data['hazardous_count'], 4)
+        self.assertTrue(all(record['is_hazardous'] for record in data['asteroids']))
+
+        data = self.get(min_diameter='0.5', type='Asteroid').json()
+        self.assertTrue(all(record['diameter_max'] >= 0.5 for record in data['asteroids']))
+        self.assertEqual(data['total_count'], Asteroid.objects.filter(diameter_max__gte=0.5, object_type='Asteroid').count())
+
+        start = (timezone.now() + timedelta(days=12)).date().isoformat()
+        end = (timezone.now() + timedelta(days=14)).date().isoformat()
+        data = self.get(approach_start=start, approach_end=end, search='Rock').json()
+        self.assertEqual(data['total_count'], len(data['asteroids']))
+        self.assertGreaterEqual(data['total_count'], 2)
+
+    def test_severity_filter(self):
+        severity = Asteroid.objects.get(neo_id='31011').severity_level
+        data = self.get(severity=severity).json()
+        self.assertTrue(data['asteroids'])
+        self.assertTrue(all(record['severity_level'] == severity for record in data['asteroids']))
+
+    def test_invalid_parameters(self):
+        cursor = self.get(sort='name', limit=2).json()['next_cursor']
+        for params in (
+            {'hazardous': 'maybe'}, {'sort': 'colour'}, {'limit': '0'}, {'limit': '501'}, {'limit': 'ten'},
+            {'min_diameter': 'nan'}, {'max_diameter': 'inf'}, {'min_energy': '-inf'}, {'max_moid': 'far'},
+            {'severity': 'apocalyptic'}, {'approach_start': '2030-13-40'},
+            {'cursor': 'not-a-cursor'}, {'cursor': cursor, 'sort': 'id'},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+    def test_cursor_round_trip(self):
+        moment = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor('approach_date', moment, 7), 'approach_date'), (moment, 7))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor('name', 'x', 7), '-name')
+
+
+@isolated_paths
+class ConditionalResponseTests(TestCase):
+    def setUp(self):
+        reload_catalog()
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get('/api/neo-data/', {'sort': 'name'})
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = self.client.get('/api/neo-data/', {'sort': 'name'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get('/api/neo-data/', {'sort': 'name'}, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/neo-data/', {'sort': '-name'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get('/api/neo-data/')['Last-Modified']
+        response = self.client.get('/api/neo-data/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/neo-data/', HTTP_IF_MODIFIED_SINCE='Thu, 01 Jan 1970 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_catalog_change_invalidates_etag(self):
+        etag = self.client.get('/api/neo-data/')['ETag']
+        make_asteroid('3000002', name='New Rock')
+        reload_catalog()
+        response = self.client.get('/api/neo-data/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_rows_written_after_the_catalog_loaded(self):
+        neo_payloads.clear_local()
+        caches['catalog'].clear()
+        stale = get_catalog()
+        make_asteroid('3000003', name='Late Rock')
+        # get_catalog() still returns the stale catalog, but the build notices the table moved on
+        self.assertIs(get_catalog(), stale)
+        response = self.client.get('/api/neo-data/', {'search': 'Late Rock'})
+        self.assertEqual(response.json()['total_count'], 1)
+        current = get_catalog()
+        self.assertNotEqual(current.version, stale.version)
+        self.assertFalse([key for key in neo_payloads._local if stale.version in key])
+        self.assertEqual(self.client.get('/api/neo-data/', {'search': 'Late Rock'})['ETag'], response['ETag'])
+
+        with mock.patch.object(AsteroidCatalog, 'is_current', return_value=False):
+            response = self.client.get('/api/neo-data/', {'search': 'Late Rock', 'limit': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertEqual(response.json()['total_count'], 1)
+
+    def test_gzip_body_matches_identity(self):
+        plain = self.client.get('/api/neo-data/')
+        self.assertNotIn('Content-Encoding', plain)
+        compressed = self.client.get('/api/neo-data/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+        # The gzip variant's ETag revalidates the identity request too
+        response = self.client.get('/api/neo-data/', HTTP_IF_NONE_MATCH=compressed['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_query_is_rejected_before_revalidation(self):
+        response = self.client.get('/api/neo-data/', {'limit': '-1'}, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 400)
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip, deflate', ('gzip',)), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip;q=0', ('gzip',)), None)
+        self.assertEqual(negotiate_encoding('*', ('gzip',)), 'gzip')
+        self.assertEqual(negotiate_encoding('deflate', ('gzip',)), None)
+        self.assertEqual(negotiate_encoding('', ('gzip',)), None)
+
+
+@isolated_paths
+class PayloadCacheTests(TestCase):
+    def concurrent_builds(self, cache, threads=8):
+        started = threading.Barrier(threads)
+
+        def build():
+            time.sleep(0.1)
+            return Payload(b'{"success": true}', 'etag')
+
+        def fetch():
+            started.wait()
+            results.append(cache.get_or_build('v1', 'etag', build).body)
+
+        results = []
+        workers = [threading.Thread(target=fetch) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(results, [b'{"success": true}'] * threads)
+
+    def test_concurrent_requests_build_once(self):
+        cache = CatalogPayloadCache(prefix='test-locmem')
+        self.concurrent_builds(cache)
+        self.assertEqual(cache.builds, 1)
+
+    def test_workers_share_builds_through_the_file_cache(self):
+        location = os.path.join(TEST_ROOT, 'catalog-cache')
+        with override_settings(CACHES=dict(settings.CACHES, catalog={
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        })):
+            first = CatalogPayloadCache(prefix='test-file')
+            self.concurrent_builds(first)
+            # A second process has its own local cache but finds the shared entry
+            second = CatalogPayloadCache(prefix='test-file')
+            self.assertEqual(second.get_or_build('v1', 'etag', lambda: self.fail('rebuilt')).body,
+                             b'{"success": true}')
+            self.assertEqual(first.builds + second.builds, 1)
+
+    def test_new_version_is_a_new_key(self):
+        cache = CatalogPayloadCache(prefix='test-version')
+        cache.get_or_build('v1', 'etag', lambda: Payload(b'one', 'etag'))
+        self.assertEqual(cache.get_or_build('v2', 'etag', lambda: Payload(b'two', 'etag')).body, b'two')
+        self.assertEqual(cache.builds, 2)
+
+    def test_entries_are_precompressed(self):
+        cache = CatalogPayloadCache(prefix='test-compressed')
+        payload = cache.get_or_build('v1', 'etag', lambda: Payload(b'x' * 1000, 'etag'))
+        self.assertEqual(gzip.decompress(payload.encoded('gzip')[1]), b'x' * 1000)
+        # Bodies under MIN_COMPRESS_BYTES are always sent as identity
+        self.assertEqual(Payload(b'small', 'etag').encoded('gzip'), (None, b'small'))
+
+
+@isolated_paths
+class ImpactBatchTests(TestCase):
+    def setUp(self):
+        reload_catalog()
+
+    def post(self, data):
+        body = data if isinstance(data, (bytes, str)) else json.dumps(data)
+        return self.client.post('/api/impact/batch/', body, content_type='application/json')
+
+    def test_batch_matches_single_object_model(self):
+        records = list(get_catalog())[:10]
+        results = impact_batch(
+            [(record['diameter_min'] + record['diameter_max']) / 2 for record in records],
+            [record['velocity_kms'] for record in records],
+            DEFAULT_DENSITY,
+            [record['miss_distance_km'] for record in records],
+        )
+        for i, record in enumerate(records):
+            expected = calculate_impact_analysis(record)
+            for field in IMPACT_FIELDS:
+                with self.subTest(id=record['id'], field=field):
+                    self.assertAlmostEqual(results[field][i], expected[field], delta=abs(expected[field]) * 1e-12)
+
+    def test_get_ranks_the_catalog(self):
+        data = self.client.get('/api/impact/batch/', {'limit': 5}).json()
+        energies = [row['kinetic_energy_joules'] for row in data['results']]
+        self.assertEqual(data['sort'], '-kinetic_energy_joules')
+        self.assertEqual(len(energies), 5)
+        self.assertEqual(energies, sorted(energies, reverse=True))
+
+        data = self.client.get('/api/impact/batch/', {'sort': 'crater_diameter_m', 'hazardous': 'true'}).json()
+        craters = [row['crater_diameter_m'] for row in data['results']]
+        self.assertEqual(craters, sorted(craters))
+        self.assertTrue(all(row['is_hazardous'] for row in data['results']))
+
+    def test_post_columns(self):
+        data = self.post({'diameter_km': [0.1, 1.0], 'velocity_kms': [20, 0], 'density': 3.0}).json()
+        self.assertEqual(data['count'], 2)
+        expected = impact_batch([0.1, 1.0], [20, 0], 3.0)
+        self.assertAlmostEqual(data['results']['kinetic_energy_joules'][0], expected['kinetic_energy_joules'][0])
+        # Zero velocity gives an infinite gravitational enhancement, sent as null
+        self.assertIsNone(data['results']['gravitational_enhancement'][1])
+
+    def test_invalid_requests(self):
+        for body in (
+            b'not json', [1, 2], {'diameter_km': [0.1]}, {'diameter_km': [0.1, 0.2], 'velocity_kms': [20]},
+            {'diameter_km': [[0.1]], 'velocity_kms': [[20]]}, {'diameter_km': ['big'], 'velocity_kms': [20]},
+            {'diameter_km': [0.1] * (IMPACT_BATCH_MAX_ROWS + 1), 'velocity_kms': 20},
+        ):
+            with self.subTest(body=str(body)[:40]):
+                response = self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+        response = self.post('[' + '0.1,' * settings.DATA_UPLOAD_MAX_MEMORY_SIZE + '0.1]')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', response.json()['error'])
+
+        for params in ({'sort': 'size'}, {'limit': '0'}, {'hazardous': 'perhaps'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/impact/batch/', params).status_code, 400)
+
+    def test_undefined_values_rank_last(self):
+        impact = CatalogImpact(get_catalog())
+        impact.results = dict(impact.results, mass_kg=np.array([np.nan] + [1.0] * (len(impact.ids) - 1)))
+        for descending in (True, False):
+            with self.subTest(descending=descending):
+                self.assertEqual(impact.rank('mass_kg', len(impact.ids), descending=descending)[-1], 0)
+                self.assertNotIn(0, impact.rank('mass_kg', 3, descending=descending))
+
+
+@isolated_paths
+class MonteCarloTests(TestCase):
+    def test_seed_makes_runs_repeatable(self):
+        first = simulate(0.3, 0.4, 12.0, samples=20000, seed=7)
+        self.assertEqual(simulate(0.3, 0.4, 12.0, samples=20000, seed=7), first)
+        self.assertNotEqual(simulate(0.3, 0.4, 12.0, samples=20000, seed=8), first)
+
+    def test_worker_pool_gives_the_same_result(self):
+        samples = CHUNK_SAMPLES + 5000
+        self.assertEqual(
+            simulate(0.3, 0.4, 12.0, samples=samples, seed=3, parallel=True),
+            simulate(0.3, 0.4, 12.0, samples=samples, seed=3, parallel=False),
+        )
+
+    def test_summary_is_consistent(self):
+        results = simulate(0.3, 0.4, 12.0, samples=20000, seed=1)
+        self.assertEqual(set(results), set(MC_METRICS))
+        for metric, summary in results.items():
+            with self.subTest(metric=metric):
+                percentiles = [summary[f'p{q}'] for q in PERCENTILES]
+                self.assertEqual(percentiles, sorted(percentiles))
+                self.assertEqual(sum(summary['histogram']['counts']), 20000)
+                self.assertEqual(len(summary['histogram']['edges']), len(summary['histogram']['counts']) + 1)
+        # The point estimate lies inside the sampled energy range
+        point = calculate_impact_analysis({'diameter_min': 0.3, 'diameter_max': 0.4, 'velocity_kms': 12.0})
+        energy = results['kinetic_energy_joules']
+        self.assertLess(energy['p5'], point['kinetic_energy_joules'])
+        self.assertGreater(energy['p95'], point['kinetic_energy_joules'])
+
+    def test_rejects_degenerate_inputs(self):
+        with self.assertRaises(ValueError):
+            simulate(0.0, 0.0, 12.0, samples=1000)
+        with self.assertRaises(ValueError):
+            simulate(0.3, 0.4, 0.0, samples=1000)
+
+    def test_api(self):
+        reload_catalog()
+        url = '/api/impact/monte-carlo/99942/'
+        data = self.client.get(url, {'samples': 2000, 'seed': 5}).json()
+        self.assertTrue(data['success'])
+        self.assertEqual((data['id'], data['samples'], data['seed']), ('99942', 2000, 5))
+        self.assertEqual(self.client.get(url, {'samples': 2000, 'seed': 5}).json(), data)
+
+        for params in ({'samples': '999'}, {'samples': '5000001'}, {'samples': 'many'}, {'seed': '-1'},
+                       {'seed': '1.5'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+        self.assertEqual(self.client.get('/api/impact/monte-carlo/no-such-object/').status_code, 404)
+
+
+class AnalysisTests(TestCase):
+    asteroid = {'id': '3000003', 'diameter_min': 0.2, 'diameter_max': 0.3, 'velocity_kms': 14.0,
+                'miss_distance_km': 5000000.0, 'close_approach_date': '2031-02-03'}
+
+    def test_results_are_stable_per_object(self):
+        copy = dict(self.asteroid)
+        self.assertEqual(calculate_environmental_impact(self.asteroid), calculate_environmental_impact(copy))
+        self.assertEqual(calculate_trajectory_data(self.asteroid), calculate_trajectory_data(copy))
+        self.assertEqual(seeded_random('3000003', 'trajectory').random(), seeded_random('3000003', 'trajectory').random())
+        other = dict(self.asteroid, id='3000004')
+        self.assertNotEqual(calculate_trajectory_data(other), calculate_trajectory_data(self.asteroid))
+
+    def test_results_are_memoized_and_isolated(self):
+        calculate_environmental_impact(self.asteroid)
+        hits = _environmental_impact.cache_info().hits
+        result = calculate_environmental_impact(self.asteroid)
+        self.assertEqual(_environmental_impact.cache_info().hits, hits + 1)
+        # Callers get copies, so mutating one never leaks into the cache
+        for value in result.values():
+            if isinstance(value, dict):
+                value.clear()
+        self.assertEqual(calculate_environmental_impact(self.asteroid), _environmental_impact('3000003', 0.25, 14.0))
+        self.assertNotEqual(calculate_environmental_impact(self.asteroid), result)
+
+    def test_known_elements_are_used(self):
+        trajectory = calculate_trajectory_data(dict(self.asteroid, **ORBIT_ELEMENTS))
+        self.assertEqual(trajectory['orbit_source'], 'elements')
+        self.assertEqual(trajectory['semi_major_axis_au'], 1.5)
+        self.assertAlmostEqual(trajectory['perihelion_distance_au'], 1.125)
+        self.assertEqual(calculate_trajectory_data(self.asteroid)['orbit_source'], 'estimated')
+
+
+@isolated_paths
+class ImpactMetricsTests(TestCase):
+    def test_stored_columns_match_the_model(self):
+        asteroid = make_asteroid('3000005', diameter=(0.4, 0.6), velocity_kms=18.0, miss_distance_km=90000.0)
+        asteroid.refresh_from_db()
+        expected = materialized_metrics([0.4], [0.6], [18.0], [90000.0])
+        for field in IMPACT_METRIC_FIELDS:
+            with self.subTest(field=field):
+                self.assertEqual(getattr(asteroid, field), expected[field][0].item())
+
+    def test_refresh_follows_changed_inputs(self):
+        asteroid = make_asteroid('3000006')
+        energy = Asteroid.objects.get(pk=asteroid.pk).kinetic_energy_joules
+        Asteroid.objects.filter(pk=asteroid.pk).update(diameter_max=2.0)
+        self.assertEqual(refresh_impact_metrics([asteroid.pk]), 1)
+        asteroid.refresh_from_db()
+        self.assertGreater(asteroid.kinetic_energy_joules, energy)
+        self.assertEqual(asteroid.severity_level, 'global')
+
+    def test_migration_backfill_matches_the_model(self):
+        migration = importlib.import_module('dashboard.migrations.0004_asteroid_impact_metrics')
+        for inputs in ((0.1, 0.2, 12.5, 4000000.0), (1.0, 1.4, 30.0, 50000.0), (0.001, 0.002, None, None),
+                       (None, 0.5, 0.0, 5000.0)):
+            expected = materialized_metrics(*([value] for value in inputs))
+            with self.subTest(inputs=inputs):
+                self.assertEqual(migration.impact_metrics(*inputs), {
+                    field: expected[field][0].item() for field in IMPACT_METRIC_FIELDS
+                })
+
+    def test_populate_sample_data_upserts(self):
+        Asteroid.objects.create(neo_id='2021001', name='Old sample', diameter_min=0.1, diameter_max=0.2,
+                                is_potentially_hazardous=False, absolute_magnitude=20.0)
+        count = Asteroid.objects.count()
+        call_command('populate_sample_data', stdout=StringIO())
+        approaches = CloseApproach.objects.count()
+        # Same-day reruns update the approaches in place on their unique key
+        CloseApproach.objects.filter(asteroid__neo_id='2021002').update(velocity_kms=1.0)
+        call_command('populate_sample_data', stdout=StringIO())
+
+        self.assertEqual(Asteroid.objects.count(), count + 4)
+        self.assertEqual(CloseApproach.objects.count(), approaches)
+        self.assertEqual(Asteroid.objects.get(neo_id='2021001').name, 'Apophis')
+        for neo_id in ('2021001', '2021002', '2021003', '2021004', '2021005'):
+            with self.subTest(neo_id=neo_id):
+                asteroid = Asteroid.objects.get(neo_id=neo_id)
+                self.assertEqual(sorted(asteroid.close_approaches.values_list('velocity_kms', flat=True)),
+                                 [15, 20, 25])
+                self.assertIsNotNone(asteroid.close_approach_date)
+                self.assertIsNotNone(asteroid.kinetic_energy_joules)
+        self.assertTrue(os.path.exists(settings.CATALOG_NOTIFY_FILE))
+
+    def test_populate_sample_data_leaves_curated_objects(self):
+        fields = ('diameter_min', 'absolute_magnitude', 'close_approach_date', 'velocity_kms',
+                  'miss_distance_km', 'severity_level')
+        curated = ('99942', '101955', '162173', '25143', '433')
+        before = {row['neo_id']: row for row in Asteroid.objects.filter(neo_id__in=curated).values('neo_id', *fields)}
+        self.assertEqual(len(before), len(curated))
+        call_command('populate_sample_data', stdout=StringIO())
+
+        after = {row['neo_id']: row for row in Asteroid.objects.filter(neo_id__in=curated).values('neo_id', *fields)}
+        self.assertEqual(after, before)
+        self.assertEqual(after['99942']['velocity_kms'], 7.42)
+        self.assertEqual(after['99942']['miss_distance_km'], 31000)
+        self.assertFalse(CloseApproach.objects.filter(asteroid__neo_id__in=curated, velocity_kms__in=(15, 20, 25))
+                         .exists())
+
+
+@isolated_paths
+class OrbitTests(TestCase):
+    def test_solve_kepler(self):
+        mean_anomaly = np.linspace(-np.pi, np.pi, 101)
+        for eccentricity in (0.0, 0.3, 0.8, 0.97):
+            with self.subTest(eccentricity=eccentricity):
+                anomaly = solve_kepler(mean_anomaly, eccentricity)
+                np.testing.assert_allclose(anomaly - eccentricity * np.sin(anomaly),
+                                           np.remainder(mean_anomaly + np.pi, 2 * np.pi) - np.pi, atol=1e-10)
+
+    def test_orbit_repeats_after_one_period(self):
+        epoch = ORBIT_ELEMENTS['orbit_epoch_jd']
+        period = orbital_period_days(ORBIT_ELEMENTS['semi_major_axis_au'])
+        positions = heliocentric_positions(ORBIT_ELEMENTS, [epoch, epoch + period])
+        self.assertEqual(positions.shape, (2, 3))
+        np.testing.assert_allclose(positions[0], positions[1], atol=1e-9)
+
+        radius = np.linalg.norm(heliocentric_positions(ORBIT_ELEMENTS, epoch + np.linspace(0, period, 50)), axis=-1)
+        self.assertAlmostEqual(radius.min(), 1.5 * 0.75, places=2)
+        self.assertLessEqual(radius.max(), 1.5 * 1.25 + 1e-9)
+
+    def test_many_objects_in_one_pass(self):
+        columns = {field: [value, value] for field, value in ORBIT_ELEMENTS.items()}
+        columns['semi_major_axis_au'] = [1.5, 2.5]
+        jd = [2461000.5, 2461100.5, 2461200.5]
+        positions = heliocentric_positions(columns, jd)
+        self.assertEqual(positions.shape, (2, 3, 3))
+        np.testing.assert_allclose(positions[0], heliocentric_positions(ORBIT_ELEMENTS, jd))
+        with self.assertRaises(ValueError):
+            heliocentric_positions(dict(ORBIT_ELEMENTS, eccentricity=1.2), [2461000.5])
+
+    def test_earth_stays_near_one_au(self):
+        distance = np.linalg.norm(earth_positions(np.linspace(J2000_JD, J2000_JD + 365.25, 40)), axis=-1)
+        self.assertTrue(np.all((distance > 0.98) & (distance < 1.02)))
+
+    def test_api(self):
+        make_asteroid('3000007', name='Orbit Rock', **ORBIT_ELEMENTS)
+        reload_catalog()
+        data = self.client.get('/api/orbit/3000007/', {'start': '2030-01-01', 'end': '2030-07-01', 'steps': 10}).json()
+        self.assertTrue(data['success'])
+        self.assertEqual(len(data['jd']), 10)
+        self.assertEqual(len(data['geocentric_au']), 10)
+        self.assertEqual(data['closest_approach']['distance_au'], min(data['earth_distance_au']))
+
+        for params in (
+            {'start': '2030-02-30'}, {'start': '2030-01-01', 'end': '2029-01-01'}, {'steps': '1'},
+            {'steps': '100001'}, {'steps': 'many'}, {'start': '2030-01-01', 'end': '2131-01-01'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get('/api/orbit/3000007/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+        self.assertEqual(self.client.get('/api/orbit/no-such-object/').status_code, 404)
+        self.assertEqual(self.client.get('/api/orbit/99942/').status_code, 404)
+
+
+def brute_force_moid(semi_major_axis, eccentricity, inclination_deg, node_deg, perihelion_deg, samples=1500):
+    """Closest approach of two densely sampled orbits"""
+    grid = np.linspace(0, 2 * np.pi, samples, endpoint=False)
+    earth_a, earth_e, earth_p, earth_q = earth_orbit()
+    p, q = orbit_basis(np.radians(inclination_deg), np.radians(node_deg), np.radians(perihelion_deg))
+    points = orbit_points(semi_major_axis, eccentricity, p, q, grid)
+    earth = orbit_points(earth_a, earth_e, earth_p, earth_q, grid)
+    squared = (points ** 2).sum(axis=1)[:, np.newaxis] + (earth ** 2).sum(axis=1) - 2 * points @ earth.T
+    return float(np.sqrt(max(squared.min(), 0.0)))
+
+
+@isolated_paths
+class MoidTests(TestCase):
+    def test_coplanar_circular_orbit(self):
+        earth_a, earth_e, _, _ = earth_orbit()
+        moid = moid_batch([1.5], [0.0], [0.0], [0.0], [0.0])[0]
+        self.assertAlmostEqual(moid, 1.5 - earth_a * (1 + earth_e), places=6)
+
+    def test_matches_brute_force(self):
+        orbits = [
+            (1.5, 0.25, 4.0, 80.0, 30.0),  # Apollo
+            (0.92, 0.19, 3.3, 204.0, 126.0),  # Aten, Apophis-like
+            (1.13, 0.2, 6.0, 2.0, 66.0),  # Bennu-like
+            (2.77, 0.08, 10.6, 80.3, 73.6),  # main belt, Ceres-like
+            (17.8, 0.967, 162.3, 58.4, 111.3),  # retrograde, Halley-like
+        ]
+        moid = moid_batch(*zip(*orbits))
+        for orbit, value in zip(orbits, moid):
+            with self.subTest(orbit=orbit):
+                brute = brute_force_moid(*orbit)
+                self.assertLessEqual(value, brute + 1e-6)
+                self.assertGreaterEqual(value, brute - 5e-3)
+
+    def test_unusable_orbits_have_no_moid(self):
+        moid = moid_batch([1.5, 1.5, np.nan, -1.0], [0.2, 1.0, 0.2, 0.2], [4.0] * 4, [80.0] * 4, [30.0] * 4)
+        self.assertTrue(np.isfinite(moid[0]))
+        self.assertTrue(np.isnan(moid[1:]).all())
+        self.assertEqual(compute_moid_rows([(1, 1.5, 1.0, 4.0, 80.0, 30.0), (2, None, 0.2, 4.0, 80.0, 30.0)]),
+                         [(1, None), (2, None)])
+
+    def test_compute_moid_command(self):
+        asteroid = make_asteroid('3000008', **ORBIT_ELEMENTS)
+        Asteroid.objects.filter(pk=asteroid.pk).update(moid_au=None)
+        call_command('compute_moid', '--workers', '1', '--missing-only', stdout=StringIO())
+        asteroid.refresh_from_db()
+        elements = [ORBIT_ELEMENTS[field] for field in MOID_ELEMENT_FIELDS]
+        self.assertAlmostEqual(asteroid.moid_au, moid_batch(*([value] for value in elements))[0])
+        self.assertTrue(os.path.exists(settings.CATALOG_NOTIFY_FILE))
+
+
+def random_orbits(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'id': f'{3200000 + i}', 'name': f'Orbit {i}', 'type': 'Asteroid', 'is_hazardous': False,
+            'orbit_epoch_jd': 2461000.5, 'semi_major_axis_au': rng.uniform(0.8, 3.0),
+            'eccentricity': rng.uniform(0.0, 0.6), 'inclination_deg': rng.uniform(0, 30),
+            'ascending_node_deg': rng.uniform(0, 360), 'perihelion_argument_deg': rng.uniform(0, 360),
+            'mean_anomaly_deg': rng.uniform(0, 360),
+        }
+        for i in range(count)
+    ]
+
+
+@isolated_paths
+class SpatialIndexTests(TestCase):
+    def setUp(self):
+        self.catalog = AsteroidCatalog(random_orbits(400))
+        self.orbits = CatalogOrbits(self.catalog)
+        self.index = EpochIndex(self.orbits, 2461500.0)
+
+    def brute_force(self, center, jd):
+        distance = np.linalg.norm(self.orbits.positions(jd) - center, axis=1)
+        return distance, np.argsort(distance, kind='stable')
+
+    def test_within_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        for jd in (2461500.0, 2461500.4, 2461499.6):
+            for radius in (0.05, 0.3, 1.0):
+                center = self.orbits.positions(jd, [int(rng.integers(len(self.orbits)))])[0]
+                with self.subTest(jd=jd, radius=radius):
+                    distance, _ = self.brute_force(center, jd)
+                    rows, found, _ = self.index.within(center, radius, jd)
+                    self.assertEqual(sorted(rows.tolist()), np.flatnonzero(distance <= radius).tolist())
+                    self.assertEqual(found.tolist(), sorted(found.tolist()))
+
+    def test_nearest_matches_brute_force(self):
+        center = np.array([1.0, 0.2, 0.0])
+        for k in (1, 7, 400, 1000):
+            with self.subTest(k=k):
+                distance, order = self.brute_force(center, 2461500.3)
+                rows, found, _ = self.index.nearest(center, k, 2461500.3)
+                self.assertEqual(len(rows), min(k, 400))
+                np.testing.assert_allclose(found, distance[order[:k]])
+
+    def test_far_point_finds_nothing_within(self):
+        rows, _, _ = self.index.within(np.array([50.0, 50.0, 50.0]), 0.5, 2461500.0)
+        self.assertEqual(len(rows), 0)
+
+    def test_near_api(self):
+        for record in random_orbits(30, seed=2):
+            make_asteroid(record['id'], name=record['name'], **{field: record[field] for field in ELEMENT_FIELDS})
+        catalog = reload_catalog()
+        orbits = get_catalog_orbits(catalog)
+        jd = 2461500.25
+        center = orbits.positions(jd, [0])[0]
+        data = self.client.get('/api/near/', {'jd': jd, 'point': ','.join(map(str, center)), 'radius': 1.0}).json()
+        distance = np.linalg.norm(orbits.positions(jd) - center, axis=1)
+        self.assertEqual(data['count'], int((distance <= 1.0).sum()))
+        self.assertEqual(data['objects'][0]['id'], orbits.ids[0])
+
+        data = self.client.get('/api/near/', {'date': '2027-03-01', 'k': 5}).json()
+        self.assertEqual(data['mode'], 'nearest')
+        self.assertEqual(data['count'], 5)
+
+        for params in (
+            {'jd': 'nan'}, {'jd': 'inf'}, {'jd': '1e300'}, {'date': '2051-01-01'}, {'date': '1799-12-31'},
+            {'date': 'tomorrow'}, {'point': '1,2'},
+            {'point': '1,2,nan'}, {'point': '1e9,0,0'}, {'radius': '0'}, {'radius': 'inf'}, {'k': '0'},
+            {'k': '1001'}, {'limit': '0'}, {'limit': 'all'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get('/api/near/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+
+def catalog_record(neo_id, name, hazardous=False, **fields):
+    return {'id': neo_id, 'name': name, 'type': 'Asteroid', 'is_hazardous': hazardous,
+            'close_approach_date': '2030-01-15', 'velocity_kms': 10.0, 'miss_distance_km': 2000000.0, **fields}
+
+
+async def read_stream(headers=()):
+    """Body sent by the event stream until its first chunk, then disconnect"""
+    sent, first_chunk = [], asyncio.Event()
+
+    async def receive():
+        await first_chunk.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+        if message['type'] == 'http.response.body':
+            first_chunk.set()
+
+    scope = {'type': 'http', 'method': 'GET', 'path': EVENTS_PATH, 'headers': list(headers)}
+    await asyncio.wait_for(stream_events(scope, receive, send), timeout=5)
+    return sent[0]['status'], b''.join(message.get('body', b'') for message in sent[1:])
+
+
+@isolated_paths
+class EventTests(TestCase):
+    def test_catalog_changes(self):
+        old = AsteroidCatalog([
+            catalog_record('1', 'Kept'), catalog_record('2', 'Flagged'), catalog_record('3', 'Moved'),
+        ])
+        new = AsteroidCatalog([
+            catalog_record('1', 'Kept'), catalog_record('2', 'Flagged', hazardous=True),
+            catalog_record('3', 'Moved', miss_distance_km=100000.0), catalog_record('4', 'Added'),
+        ])
+        events = dict(catalog_changes(old, new))
+        self.assertEqual(list(events), ['asteroid_added', 'hazard_changed', 'close_approach', 'catalog'])
+        self.assertEqual([item['id'] for item in events['asteroid_added']['items']], ['4'])
+        self.assertEqual([item['id'] for item in events['hazard_changed']['items']], ['2'])
+        self.assertEqual(events['close_approach']['items'][0]['miss_distance_km'], 100000.0)
+        self.assertEqual(events['catalog']['previous_version'], old.version)
+        self.assertEqual(events['catalog']['total_count'], 4)
+        unchanged = [('catalog', {**catalog_summary(old), 'previous_version': old.version})]
+        self.assertEqual(catalog_changes(old, old), unchanged)
+
+    def test_broker_resume(self):
+        async def scenario():
+            broker = EventBroker()
+            queue, missed = broker.subscribe()
+            self.assertEqual(missed, [])
+            for i in range(3):
+                broker.publish('catalog', {'n': i})
+            self.assertEqual([event.sequence for event in [queue.get_nowait() for _ in range(3)]], [1, 2, 3])
+
+            _, missed = broker.subscribe(broker.event_id(1))
+            self.assertEqual([event.sequence for event in missed], [2, 3])
+            self.assertIn(f'id: {broker.event_id(3)}'.encode(), missed[-1].payload)
+            self.assertEqual(broker.subscribe(broker.event_id(3))[1], [])
+            for last_event_id in ('other-1', broker.event_id(4), f'{broker.token}-x', 'garbage'):
+                self.assertIsNone(broker.subscribe(last_event_id)[1], last_event_id)
+
+            for i in range(EVENT_HISTORY):
+                broker.publish('catalog', {'n': i})
+            self.assertIsNone(broker.subscribe(broker.event_id(2))[1])
+            self.assertEqual(len(broker.subscribe(broker.event_id(3))[1]), EVENT_HISTORY)
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_is_dropped(self):
+        async def scenario():
+            broker = EventBroker()
+            queue, _ = broker.subscribe()
+            for i in range(SUBSCRIBER_QUEUE_SIZE + 1):
+                broker.publish('catalog', {'n': i})
+            self.assertIsNone(queue.get_nowait())
+            self.assertTrue(queue.empty())
+
+        asyncio.run(scenario())
+
+    def test_stream(self):
+        reload_catalog()
+        status, body = asyncio.run(read_stream())
+        self.assertEqual(status, 200)
+        self.assertTrue(body.startswith(b'retry: '))
+        self.assertIn(b'event: hello', body)
+        self.assertNotIn(b'resync', body)
+
+        # An id from another process gets the current state instead of a backlog
+        status, body = asyncio.run(read_stream([(b'last-event-id', b'0123456789ab-5')]))
+        self.assertIn(b'"resync": true', body)
+        self.assertIn(f'id: {events_broker.event_id(events_broker.last_sequence)}'.encode(), body)
+
+    def test_wsgi_fallback_stops_reconnects(self):
+        self.assertEqual(self.client.get(EVENTS_PATH).status_code, 204)
+
+    def test_other_requests_run_on_the_wsgi_pool(self):
+        seen, closed, both_running = [], [], threading.Barrier(2, timeout=5)
+
+        class Body(list):
+            def close(self):
+                closed.append(True)
+
+        def wsgi(environ, start_response):
+            seen.append(threading.current_thread().name)
+            both_running.wait()  # two requests in flight at once, so not serialized
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return Body([environ['PATH_INFO'].encode()])
+
+        application = with_event_stream(ThreadedWSGI(wsgi, threads=2))
+
+        async def get(path):
+            sent = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+                     'http_version': '1.1'}
+            await application(scope, receive, send)
+            return sent[0]['status'], b''.join(message.get('body', b'') for message in sent[1:])
+
+        async def scenario():
+            return await asyncio.gather(get('/a/'), get('/b/'))
+
+        self.assertEqual(asyncio.run(scenario()), [(200, b'/a/'), (200, b'/b/')])
+        self.assertEqual(len(closed), 2)
+        self.assertTrue(all(name.startswith('wsgi') for name in seen))
+
+
+class ImageServer(ThreadingHTTPServer):
+    """Local HTTP server with ETags and byte ranges for downloader tests"""
+
+    body = bytes(range(256)) * 200
+    etag = '"v1"'
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ImageRequestHandler)
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f'http://127.0.0.1:{self.server_address[1]}{path}'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        if self.path == '/missing.jpg':
+            self.send_error(404)
+            return
+        if self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body, status = server.body, 200
+        requested = self.headers.get('Range', '')
+        if requested.startswith('bytes=') and self.headers.get('If-Range') == server.etag:
+            start = int(requested[6:].rstrip('-'))
+            body, status = body[start:], 206
+        self.send_response(status)
+        self.send_header('ETag', server.etag)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{len(server.body) - 1}/{len(server.body)}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@isolated_paths
+class DownloaderTests(TestCase):
+    def setUp(self):
+        self.server = ImageServer()
+        self.addCleanup(self.server.close)
+        self.directory = tempfile.mkdtemp(dir=TEST_ROOT)
+        self.state_dir = tempfile.mkdtemp(dir=TEST_ROOT)
+
+    def download(self, jobs):
+        downloader = Downloader(self.directory, workers=4, state_dir=self.state_dir)
+        return {result.key: result for result in downloader.run(jobs)}
+
+    def test_download_then_revalidate(self):
+        jobs = {'a': ('a.jpg', [self.server.url('/a.jpg')]), 'b': ('b.jpg', [self.server.url('/b.jpg')])}
+        results = self.download(jobs)
+        self.assertEqual({result.status for result in results.values()}, {'downloaded'})
+        with open(os.path.join(self.directory, 'a.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), ImageServer.body)
+        self.assertEqual(load_manifest(self.state_dir)['a.jpg']['etag'], ImageServer.etag)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.jpg', 'b.jpg'])
+
+        results = self.download(jobs)
+        self.assertEqual({result.status for result in results.values()}, {'not_modified'})
+        self.assertEqual(self.server.requests[-1][1]['If-None-Match'], ImageServer.etag)
+
+    def test_keeps_files_without_a_manifest_entry(self):
+        with open(os.path.join(self.directory, 'a.jpg'), 'wb') as f:
+            f.write(b'curated')
+        jobs = {'a': ('a.jpg', [self.server.url('/a.jpg')]), 'b': ('b.jpg', [self.server.url('/b.jpg')])}
+        results = self.download(jobs)
+        self.assertEqual((results['a'].status, results['b'].status), ('existing', 'downloaded'))
+        self.assertEqual([path for path, headers in self.server.requests], ['/b.jpg'])
+        with open(os.path.join(self.directory, 'a.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), b'curated')
+
+    def test_interrupted_download_resumes(self):
+        url = self.server.url('/a.jpg')
+        with open(os.path.join(self.state_dir, 'a.jpg.part'), 'wb') as f:
+            f.write(ImageServer.body[:1000])
+        save_manifest(self.state_dir, {'a.jpg': {'url': url, 'etag': ImageServer.etag, 'partial': True}})
+
+        result = self.download({'a': ('a.jpg', [url])})['a']
+        self.assertEqual((result.status, result.bytes), ('resumed', len(ImageServer.body) - 1000))
+        self.assertEqual(self.server.requests[-1][1]['Range'], 'bytes=1000-')
+        with open(os.path.join(self.directory, 'a.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), ImageServer.body)
+        self.assertFalse(os.path.exists(os.path.join(self.state_dir, 'a.jpg.part')))
+
+    def test_state_dir_on_another_filesystem(self):
+        replace = os.replace
+        calls = []
+
+        def cross_device(source, target):
+            calls.append(source)
+            if source.endswith('.part'):
+                raise OSError(errno.EXDEV, 'Invalid cross-device link')
+            replace(source, target)
+
+        with mock.patch('os.replace', cross_device):
+            result = self.download({'a': ('a.jpg', [self.server.url('/a.jpg')])})['a']
+        self.assertEqual(result.status, 'downloaded')
+        self.assertTrue(calls[0].endswith('a.jpg.part'))
+        with open(os.path.join(self.directory, 'a.jpg'), 'rb') as f:
+            self.assertEqual(f.read(), ImageServer.body)
+        self.assertEqual(os.listdir(self.state_dir), ['manifest.json'])
+
+    def test_falls_back_to_the_next_url(self):
+        result = self.download({'a': ('a.jpg', [self.server.url('/missing.jpg'), self.server.url('/a.jpg')])})['a']
+        self.assertEqual((result.status, result.url), ('downloaded', self.server.url('/a.jpg')))
+
+        result = self.download({'b': ('b.jpg', [self.server.url('/missing.jpg')])})['b']
+        self.assertEqual(result.status, 'failed')
+        self.assertIn('404', result.error)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'b.jpg')))
+
+    def test_command(self):
+        sources = os.path.join(self.state_dir, 'sources.json')
+        with open(sources, 'w') as f:
+            json.dump({'a': self.server.url('/a.jpg'), 'b': [self.server.url('/missing.jpg')]}, f)
+        out = StringIO()
+        call_command('download_real_images', '--sources', sources, '--output', self.directory, stdout=out)
+        self.assertIn('1 downloaded', out.getvalue())
+        self.assertIn('1 failed', out.getvalue())
+        # Only the images end up where collectstatic would publish them
+        self.assertEqual(os.listdir(self.directory), ['a.jpg'])
+        [state_dir] = os.listdir(settings.IMAGE_DOWNLOAD_STATE_DIR)
+        state_dir = os.path.join(settings.IMAGE_DOWNLOAD_STATE_DIR, state_dir)
+        self.assertEqual(os.listdir(state_dir), ['manifest.json'])
+        self.assertIn('a.jpg', load_manifest(state_dir))
+        with self.assertRaises(CommandError):
+            call_command('download_real_images', '--sources', os.path.join(self.directory, 'none.json'),
+                         '--output', self.directory, stdout=StringIO())
+
+
+@isolated_paths
+class ImageGenerationTests(TestCase):
+    objects = {
+        '3000010': {'name': 'Rock', 'color': '#8B4513', 'shape': 'elongated', 'size': 'medium', 'texture': 'rocky',
+                    'craters': 3},
+        '3000011': {'name': 'Comet', 'color': '#4682B4', 'shape': 'comet', 'size': 'small', 'texture': 'icy',
+                    'craters': 0},
+        '3000012': {'name': 'Pair', 'color': '#696969', 'shape': 'binary', 'size': 'small', 'texture': 'rocky',
+                    'craters': 2},
+    }
+
+    def read_all(self, directory):
+        contents = {}
+        for key in self.objects:
+            with open(os.path.join(directory, f'{key}.svg')) as f:
+                contents[key] = f.read()
+        return contents
+
+    def test_rendering_is_deterministic(self):
+        for style in RENDERERS:
+            with self.subTest(style=style):
+                svg = render_svg(style, '3000010', self.objects['3000010'])
+                self.assertTrue(svg.lstrip().startswith('<svg'))
+                self.assertEqual(svg, render_svg(style, '3000010', dict(self.objects['3000010'])))
+                self.assertNotEqual(svg, render_svg(style, '3000013', self.objects['3000010']))
+
+    def test_incremental_generation(self):
+        directory = tempfile.mkdtemp(dir=TEST_ROOT)
+        counts = generate_images(directory, 'accurate', self.objects)
+        self.assertEqual((counts['written'], counts['unchanged'], counts['skipped']), (3, 0, 0))
+        path = os.path.join(directory, '3000010.svg')
+        mtime = os.stat(path).st_mtime_ns
+
+        counts = generate_images(directory, 'accurate', self.objects)
+        self.assertEqual((counts['written'], counts['skipped']), (0, 3))
+        counts = generate_images(directory, 'accurate', self.objects, force=True)
+        self.assertEqual((counts['written'], counts['unchanged']), (0, 3))
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+        changed = dict(self.objects, **{'3000011': dict(self.objects['3000011'], craters=4)})
+        counts = generate_images(directory, 'accurate', changed)
+        self.assertEqual((counts['written'], counts['skipped']), (1, 2))
+
+        os.remove(path)
+        self.assertEqual(generate_images(directory, 'accurate', changed)['written'], 1)
+
+    def test_worker_pool_writes_the_same_files(self):
+        serial, parallel = tempfile.mkdtemp(dir=TEST_ROOT), tempfile.mkdtemp(dir=TEST_ROOT)
+        generate_images(serial, 'accurate', self.objects)
+        generate_images(parallel, 'accurate', self.objects, workers=2, chunk_size=1)
+        self.assertEqual(self.read_all(parallel), self.read_all(serial))
+
+    def test_catalog_command(self):
+        directory = tempfile.mkdtemp(dir=TEST_ROOT)
+        reload_catalog()
+        call_command('generate_accurate_images', '--catalog', '--output', directory, '--workers', '1',
+                     stdout=StringIO())
+        self.assertTrue(os.path.exists(os.path.join(directory, '99942.svg')))
+        self.assertEqual(len(imagegen_manifest(directory)), len(get_catalog()))
+
+
+@isolated_paths
+class ImageEndpointTests(TestCase):
+    def setUp(self):
+        reload_catalog()
+
+    def test_endpoint(self):
+        response = self.client.get('/images/asteroid/99942.svg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn(f'max-age={IMAGE_MAX_AGE}', response['Cache-Control'])
+        self.assertIn(b'<svg', response.content)
+
+        revalidated = self.client.get('/images/asteroid/99942.svg', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn(f'max-age={IMAGE_MAX_AGE}', revalidated['Cache-Control'])
+
+        compressed = self.client.get('/images/asteroid/99942.svg', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip.decompress(compressed.content), response.content)
+        self.assertEqual(self.client.get('/images/asteroid/no-such-object.svg').status_code, 404)
+
+    def test_names_are_escaped(self):
+        name = 'Rock & <tspan>Roll</tspan>'
+        make_asteroid('3000014', name=name)
+        reload_catalog()
+        response = self.client.get('/images/asteroid/3000014.svg')
+        self.assertEqual(response.status_code, 200)
+        texts = [element.text for element in ElementTree.fromstring(response.content).iterfind('.//{*}text')]
+        self.assertIn(name, texts)
+        for style in RENDERERS:
+            with self.subTest(style=style):
+                svg = render_svg(style, '3000014', dict(ImageGenerationTests.objects['3000010'], name=name))
+                texts = [element.text for element in ElementTree.fromstring(svg).iterfind('.//{*}text')]
+                self.assertIn(name, texts)
+
+    def test_memory_then_disk_then_render(self):
+        data = catalog_image_data(get_catalog().get('99942'))
+        directory = tempfile.mkdtemp(dir=TEST_ROOT)
+        cache = ImageCache(max_entries=1, directory=directory)
+        body = cache.get('99942', data).body
+        self.assertIs(cache.get('99942', data), cache.get('99942', data))
+        self.assertEqual(cache.renders, 1)
+
+        # Another worker finds the file written by the first
+        other = ImageCache(directory=directory)
+        self.assertEqual(other.get('99942', data).body, body)
+        self.assertEqual(other.renders, 0)
+        self.assertTrue(os.path.exists(cache.path(input_hash('accurate', '99942', data))))
+
+        # Changed inputs hash to a new entry, and the LRU keeps only max_entries
+        changed = dict(data, craters=data['craters'] + 1)
+        self.assertNotEqual(cache.etag('99942', changed), cache.etag('99942', data))
+        cache.get('99942', changed)
+        self.assertEqual(cache.renders, 2)
+        self.assertEqual(len(cache._entries), 1)
+
+
+def write_test_image(path, size=(300, 200), color=(120, 80, 40)):
+    Image.new('RGB', size, color).save(path, 'JPEG')
+
+
+@skipIf(Image is None, 'Pillow is not installed')
+@isolated_paths
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp(dir=TEST_ROOT)
+        self.output = tempfile.mkdtemp(dir=TEST_ROOT)
+        write_test_image(os.path.join(self.source, 'Test Rock.jpg'))
+
+    def build(self, **options):
+        built = []
+        manifest = build_variants(self.source, self.output, widths=(100, 200, 640),
+                                  on_image=lambda filename, entry: built.append(filename), **options)
+        return manifest, built
+
+    def test_build_variants(self):
+        manifest, built = self.build()
+        self.assertEqual(built, ['Test Rock.jpg'])
+        entry = manifest['Test Rock.jpg']
+        self.assertEqual((entry['width'], entry['height']), (300, 200))
+        # Widths above the original are dropped
+        self.assertEqual(sorted({(v['width'], v['format']) for v in entry['variants']}),
+                         [(100, 'jpeg'), (100, 'webp'), (200, 'jpeg'), (200, 'webp')])
+        for variant in entry['variants']:
+            with Image.open(os.path.join(self.output, variant['file'])) as image:
+                self.assertEqual(image.width, variant['width'])
+                self.assertEqual(image.format, 'WEBP' if variant['format'] == 'webp' else 'JPEG')
+            self.assertTrue(variant['file'].startswith(f'Test-Rock-{variant["width"]}.'))
+        self.assertEqual(variants_manifest(self.output), manifest)
+
+    def test_rebuild_only_changed_sources(self):
+        manifest, _ = self.build()
+        self.assertEqual(self.build(), (manifest, []))
+
+        write_test_image(os.path.join(self.source, 'Test Rock.jpg'), color=(10, 200, 10))
+        changed, built = self.build()
+        self.assertEqual(built, ['Test Rock.jpg'])
+        old_files = {v['file'] for v in manifest['Test Rock.jpg']['variants']}
+        new_files = {v['file'] for v in changed['Test Rock.jpg']['variants']}
+        self.assertTrue(old_files.isdisjoint(new_files))
+        self.assertEqual(set(os.listdir(self.output)), new_files | {'variants.json'})
+
+    def test_srcsets(self):
+        manifest, _ = self.build()
+        index = VariantIndex(manifest)
+        records = with_srcsets([
+            {'image_url': f'{settings.STATIC_URL}images/asteroids/Test Rock.jpg'},
+            {'image_url': '/images/asteroid/99942.svg'},
+            {'image_url': None},
+        ], index)
+        self.assertIn('100w', records[0]['image_srcset'])
+        self.assertIn('.webp 200w', records[0]['image_webp_srcset'])
+        self.assertIsNone(records[1]['image_srcset'])
+        self.assertIsNone(records[2]['image_webp_srcset'])
+        self.assertNotEqual(index.version, VariantIndex({}).version)
+
+    def test_command_rejects_bad_widths(self):
+        with self.assertRaises(CommandError):
+            call_command('build_image_variants', '--widths', '160,big', stdout=StringIO())
+
+
+@isolated_paths
+class StaticFilesTests(TestCase):
+    stylesheet = 'body { color: #123456; }\n' * 100
+
+    def setUp(self):
+        source = tempfile.mkdtemp(dir=TEST_ROOT)
+        self.root = tempfile.mkdtemp(dir=TEST_ROOT)
+        with open(os.path.join(source, 'app.css'), 'w') as f:
+            f.write(self.stylesheet)
+        with open(os.path.join(source, 'tiny.js'), 'w') as f:
+            f.write('let x = 1;\n')
+        settings_override = override_settings(
+            STATIC_ROOT=self.root, STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(self.root, 'staticfiles.json')) as f:
+            self.hashed = json.load(f)['paths']['app.css']
+
+    def test_collectstatic_writes_compressed_siblings(self):
+        self.assertRegex(self.hashed, r'^app\.[0-9a-f]{12}\.css$')
+        with gzip.open(os.path.join(self.root, self.hashed + '.gz'), 'rt') as f:
+            self.assertEqual(f.read(), self.stylesheet)
+        # Too small to be worth compressing
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'tiny.js.gz')))
+
+    def test_middleware_serves_precompressed_files(self):
+        response = self.client.get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertNotIn('Content-Disposition', response)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).decode(), self.stylesheet)
+
+        revalidated = self.client.get(f'/static/{self.hashed}', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+        plain = self.client.get('/static/app.css')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain['Cache-Control'], f'public, max-age={STATIC_MAX_AGE}')
+        self.assertEqual(b''.join(plain.streaming_content).decode(), self.stylesheet)
+
+    def test_middleware_ignores_other_paths(self):
+        for path in (f'/static/{self.hashed}.gz', '/static/../manage.py', '/static/missing.css'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_middleware_picks_up_a_new_collectstatic(self):
+        before = self.client.get('/static/tiny.js')
+        self.assertEqual(self.client.get('/static/late.js').status_code, 404)
+        source = settings.STATICFILES_DIRS[0]
+        with open(os.path.join(source, 'tiny.js'), 'w') as f:
+            f.write('let x = 2;\n')
+        with open(os.path.join(source, 'late.js'), 'w') as f:
+            f.write('let y = 1;\n')
+        # collectstatic compares whole seconds before copying over a file
+        later = time.time() + 10
+        os.utime(os.path.join(source, 'tiny.js'), (later, later))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+        response = self.client.get('/static/tiny.js')
+        self.assertEqual(b''.join(response.streaming_content), b'let x = 2;\n')
+        self.assertNotEqual(response['ETag'], before['ETag'])
+        self.assertEqual(self.client.get('/static/tiny.js', HTTP_IF_NONE_MATCH=before['ETag']).status_code, 200)
+        self.assertEqual(self.client.get('/static/late.js').status_code, 200)
+
+    @override_settings(DEBUG=True)
+    def test_middleware_is_skipped_in_debug(self):
+        response = self.client.get(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('immutable', response.get('Cache-Control', ''))
+
+    def test_uncollected_names_fall_back(self):
+        storage = CompressedManifestStaticFilesStorage(location=self.root)
+        self.assertEqual(storage.stored_name('app.css'), self.hashed)
+        self.assertEqual(storage.stored_name('js/not-collected.js'), 'js/not-collected.js')
+
+
+@isolated_paths
+class TemplateTimingTests(TestCase):
+    def test_templates_are_compiled_once(self):
+        self.assertEqual(warm_templates(), len(template_names(engines['django'].template_dirs)))
+        engine = engines['django'].engine
+        self.assertIs(engine.get_template('education/education.html'),
+                      engine.get_template('education/education.html'))
+
+    def test_render_breakdown(self):
+        template_stats.reset()
+        self.client.get('/education/')
+        rows = {row['template']: row for row in template_stats.snapshot()}
+        self.assertIn('education/education.html', rows)
+        self.assertIn('base.html', rows)
+        self.assertIn('education/education.html#content', rows)
+        page = rows['education/education.html']
+        self.assertEqual(page['count'], 1)
+        self.assertLessEqual(page['self_ms'], page['total_ms'])
+        # The child's blocks render inside its parent's body, so the parent's total covers them
+        self.assertGreaterEqual(rows['base.html']['total_ms'], rows['education/education.html#content']['total_ms'])
+
+    def test_test_client_still_sees_templates(self):
+        warm_templates()
+        response = self.client.get('/education/')
+        self.assertTemplateUsed(response, 'education/education.html')
+        self.assertTemplateUsed(response, 'base.html')
+        template = engines['django'].engine.get_template('education/education.html')
+        self.assertNotIn('_render', vars(template))
+
+    def test_stats(self):
+        stats = TemplateStats()
+        stats.record('slow.html', 0.02, 0.01)
+        stats.record('slow.html', 0.04, 0.03)
+        stats.record('fast.html', 0.001, 0.001)
+        rows = stats.snapshot()
+        self.assertEqual([row['template'] for row in rows], ['slow.html', 'fast.html'])
+        self.assertAlmostEqual(rows[0]['mean_ms'], 30.0)
+        self.assertAlmostEqual(rows[0]['max_ms'], 40.0)
+        stats.reset()
+        self.assertEqual(stats.snapshot(), [])
+
+    @override_settings(TEMPLATE_SLOW_RENDER_MS=0)
+    def test_slow_renders_are_logged(self):
+        with self.assertLogs('dashboard.template_timing', 'WARNING') as logs:
+            self.client.get('/education/')
+        self.assertIn('education/education.html', '\n'.join(logs.output))
+
+    def test_profile_templates_command(self):
+        out = StringIO()
+        call_command('profile_templates', '/education/', '--repeat', '1', stdout=out)
+        self.assertIn('education/education.html', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('profile_templates', '/education/', '--repeat', '0', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('profile_templates', '/no-such-page/', '--repeat', '1', stdout=StringIO())
+
+
+@isolated_paths
+class DetailPageCacheTests(TestCase):
+    def setUp(self):
+        make_asteroid('3000020', name='Cached Rock')
+        make_asteroid('3000021', name='Other Rock')
+        reload_catalog()
+        detail_pages.clear_local()
+        caches['catalog'].clear()
+
+    def test_page_is_built_once_and_revalidated(self):
+        builds = detail_pages.builds
+        first = self.client.get('/asteroid/3000020/')
+        second = self.client.get('/asteroid/3000020/')
+        self.assertEqual(detail_pages.builds, builds + 1)
+        self.assertEqual(first.content, second.content)
+        self.assertContains(first, 'Cached Rock')
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        response = self.client.get('/asteroid/3000020/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        compressed = self.client.get('/asteroid/3000020/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip.decompress(compressed.content), first.content)
+        self.assertEqual(detail_pages.builds, builds + 1)
+
+    def test_only_changed_rows_get_a_new_version(self):
+        pages = {neo_id: self.client.get(f'/asteroid/{neo_id}/')['ETag'] for neo_id in ('3000020', '3000021')}
+        Asteroid.objects.filter(neo_id='3000020').update(name='Renamed Rock')
+        reload_catalog()
+
+        changed = self.client.get('/asteroid/3000020/', HTTP_IF_NONE_MATCH=pages['3000020'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertContains(changed, 'Renamed Rock')
+        unchanged = self.client.get('/asteroid/3000021/', HTTP_IF_NONE_MATCH=pages['3000021'])
+        self.assertEqual(unchanged.status_code, 304)
+
+    def test_version_inputs(self):
+        record = get_catalog().get('3000020')
+        version = detail_page_version(record, 'variants')
+        self.assertEqual(detail_page_version(dict(record, last_updated='later'), 'variants'), version)
+        self.assertNotEqual(detail_page_version(dict(record, diameter_max=3.0), 'variants'), version)
+        self.assertNotEqual(detail_page_version(record, 'rebuilt-variants'), version)
+        self.assertEqual(record_digest(record), record_digest(dict(record)))
+
+    def test_placeholder_is_not_cached(self):
+        builds = detail_pages.builds
+        fragments = caches['template_fragments']
+        fragments.clear()
+        for i in range(5):
+            response = self.client.get(f'/asteroid/no-such-object-{i}/')
+            self.assertContains(response, f'Asteroid no-such-object-{i}')
+            self.assertNotIn('ETag', response)
+        self.assertEqual(detail_pages.builds, builds)
+        self.assertEqual(len(fragments._cache), 0)
+        # Catalog pages still fill their fragments
+        self.client.get('/asteroid/3000020/')
+        self.assertEqual(len(fragments._cache), 2)
+
+
+class JsMinTests(TestCase):
+    def test_minify(self):
+        cases = {
+            "var x = 1; // comment\n/* block */ var y = 'a // b';": "var x=1;var y='a // b';\n",
+            'const t = `hello ${ name + `x${1}` } // kept`;': 'const t=`hello ${name+`x${1}`} // kept`;\n',
+            'x = y - -z; w = p + +q;': 'x=y- -z;w=p+ +q;\n',
+            # Newlines that end a statement without a semicolon are kept
+            'a\n++b': 'a\n++b\n',
+            'function f() {\n  return\n  x\n}': 'function f(){return\nx}\n',
+            'if (a) {\n  b()\n}\nc()': 'if(a){b()}\nc()\n',
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                self.assertEqual(minify(source), expected)
+
+    def test_regex_and_division(self):
+        minified = minify('const re = /ab+c\\/d/g.test(s);\nlet z = a / b / c;')
+        self.assertIn('/ab+c\\/d/g.test(s)', minified)
+        self.assertIn('a / b / c', minified)
+
+    def test_spaced_division_before_strings(self):
+        cases = {
+            "w = h / 2 + 'px /* x */';": "w=h / 2+'px /* x */';\n",
+            "s = total / count + ' items  left';": "s=total / count+' items  left';\n",
+            'x = (a) / 2 + `${b}  /* c */`': 'x=(a) / 2+`${b}  /* c */`\n',
+            # After a keyword and a space, a "/" still starts a regex
+            'function f(s) { return /a  b/.test(s) }': 'function f(s){return /a  b/.test(s)}\n',
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                self.assertEqual(minify(source), expected)
+
+    def test_bundles_are_up_to_date(self):
+        call_command('build_js_bundles', '--check', stdout=StringIO())
+        # Only the bundles are collected, not their sources
+        collected = [path for finder in get_finders() for path, _ in finder.list([]) if path.startswith('js')]
+        self.assertIn('js/base.min.js', [path.replace(os.sep, '/') for path in collected])
+        self.assertEqual([path for path in collected if not path.endswith('.min.js')], [])
+
+    def test_build_and_check(self):
+        base = tempfile.mkdtemp(dir=TEST_ROOT)
+        os.makedirs(os.path.join(base, 'assets', 'js'))
+        os.makedirs(os.path.join(base, 'static', 'js'))
+        with open(os.path.join(base, 'assets', 'js', 'app.js'), 'w') as f:
+            f.write('function add(a, b) {\n  // sum\n  return a + b;\n}\n')
+        with override_settings(BASE_DIR=base):
+            with self.assertRaises(CommandError):
+                call_command('build_js_bundles', '--check', stdout=StringIO())
+            call_command('build_js_bundles', stdout=StringIO())
+            with open(os.path.join(base, 'static', 'js', 'app.min.js')) as f:
+                self.assertEqual(f.read(), 'function add(a,b){return a+b;}\n')
+            call_command('build_js_bundles', '--check', stdout=StringIO())
+
+
+def record_in_child(directory, routes, max_workers):
+    MetricsStore(directory, routes, max_workers).record('a', 0.003, 500, RequestTimings())
+
+
+@isolated_paths
+class MetricsTests(TestCase):
+    routes = ('a', 'b', UNMATCHED_ROUTE)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=TEST_ROOT)
+
+    def test_store_totals(self):
+        store = MetricsStore(self.directory, self.routes, 4)
+        timings = RequestTimings()
+        timings.add('db', 0.002)
+        timings.add('db', 0.001)
+        store.record('a', 0.004, 200, timings)
+        store.record('a', 2.0, 404, RequestTimings())
+        store.record('not-a-route', 0.01, 200, RequestTimings())
+
+        totals = store.totals()
+        a, unmatched = totals[0], totals[2]
+        self.assertEqual(a[:BUCKET_FIELDS].sum(), 2)
+        self.assertAlmostEqual(a[SUM_FIELD], 2.004)
+        self.assertEqual(a[QUERIES_FIELD], 2)
+        self.assertEqual(unmatched[:BUCKET_FIELDS].sum(), 1)
+
+        text = store.prometheus()
+        self.assertIn('meteormatrix_http_requests_total{route="a",status="2xx"} 1', text)
+        self.assertIn('meteormatrix_http_requests_total{route="a",status="4xx"} 1', text)
+        self.assertIn('meteormatrix_http_request_duration_seconds_bucket{route="a",le="+Inf"} 2', text)
+        self.assertIn('meteormatrix_db_queries_total{route="a"} 2', text)
+        self.assertNotIn('route="b"', text)
+
+    def test_workers_share_one_file(self):
+        store = MetricsStore(self.directory, self.routes, 4)
+        store.record('a', 0.003, 200, RequestTimings())
+        child = get_context('fork').Process(target=record_in_child, args=(self.directory, self.routes, 4))
+        child.start()
+        child.join()
+        self.assertEqual(child.exitcode, 0)
+
+        totals = MetricsStore(self.directory, self.routes, 4).totals()
+        self.assertEqual(totals[0][:BUCKET_FIELDS].sum(), 2)
+        self.assertEqual(totals[0][STATUS_FIELD + 4], 1)
+        # The child exited, so a new worker may take over its slot and keep its counts
+        owners = store.array()[:, 0, 0]
+        self.assertEqual(int((owners != 0).sum()), 2)
+
+    def test_metrics_access(self):
+        self.client.get('/api/neo-data/')
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(METRICS_TOKEN='s3cret'):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('route="dashboard:neo_data_api"', response.content.decode())
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer guess').status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=['127.0.0.1']):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_server_timing_is_for_staff(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/neo-data/'))
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertIn('total;dur=', self.client.get('/asteroids/')['Server-Timing'])
+        with override_settings(DEBUG=True):
+            self.client.logout()
+            self.assertIn('Server-Timing', self.client.get('/api/neo-data/'))
+
+
+@isolated_paths
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/neo-data/', {'profile': 1})
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.route, 'dashboard:neo_data_api')
+        self.assertEqual(profile.status_code, 200)
+        self.assertEqual(profile.user, self.staff)
+        self.assertIn('cumulative', profile.summary)
+        self.assertTrue(os.path.exists(profile_path(profile.filename)))
+        pstats.Stats(profile_path(profile.filename))
+
+        download = self.client.get(f'/admin/dashboard/requestprofile/{profile.pk}/download/')
+        self.assertEqual(download.status_code, 200)
+        self.assertIn(profile.filename, download['Content-Disposition'])
+        download.close()
+
+        self.assertIn('X-Profile-Id', self.client.get('/api/neo-data/', HTTP_X_PROFILE='1'))
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/neo-data/'))
+
+    def test_only_staff_can_profile(self):
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/neo-data/', {'profile': 1}))
+        self.client.force_login(User.objects.create_user('visitor'))
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/neo-data/', {'profile': 1}, HTTP_X_PROFILE='1'))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILE_MAX_PROFILES=2)
+    def test_old_profiles_are_pruned(self):
+        self.client.force_login(self.staff)
+        ids = [self.client.get('/api/neo-data/', {'profile': 1})['X-Profile-Id'] for _ in range(3)]
+        kept = RequestProfile.objects.order_by('pk')
+        self.assertEqual([str(profile.pk) for profile in kept], ids[1:])
+        self.assertEqual(sorted(os.listdir(settings.PROFILE_DIR)), sorted(profile.filename for profile in kept))
+
+        prune_profiles(0)
+        self.assertFalse(RequestProfile.objects.exists())
+        self.assertEqual(os.listdir(settings.PROFILE_DIR), [])
@@ -0,0 +1,50 @@
+"""Django's WSGI handler served from the ASGI server on a fixed thread pool.
+
+Production runs ASGI only so ``/api/events/`` can hold idle Server-Sent
+Events connections cheaply. Handing every other request to Django's ASGI
+handler would adapt each sync middleware and view with ``sync_to_async``:
+a thread hop per sync layer and a fresh executor thread per request, which
+also means a new database connection per request. ``ThreadedWSGI`` instead
+runs the plain WSGI handler on ``threads`` long-lived threads, like
+gunicorn's threaded workers, so pages and APIs behave exactly as under WSGI
+and each thread keeps its persistent connection.
+"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import SyncToAsync
+from asgiref.wsgi import WsgiToAsgiInstance
+
+
+def _closing(wsgi_application):
+    """``wsgi_application`` whose response is always closed, so Django sends ``request_finished``"""
+    def application(environ, start_response):
+        response = wsgi_application(environ, start_response)
+        try:
+            yield from response
+        finally:
+            close = getattr(response, 'close', None)
+            if close is not None:
+                close()
+    return application
+
+
+class _PooledInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        # asgiref's request translation, on the pool rather than its thread-sensitive executor
+        self.run_wsgi_app = SyncToAsync(
+            functools.partial(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, self),
+            thread_sensitive=False, executor=executor,
+        )
+
+
+class ThreadedWSGI:
+    """ASGI application running ``wsgi_application`` on ``threads`` threads"""
+
+    def __init__(self, wsgi_application, threads):
+        self.wsgi_application = _closing(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        await _PooledInstance(self.wsgi_application, self.executor)(scope, receive, send)
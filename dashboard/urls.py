@@ -10,4 +10,11 @@ urlpatterns = [
     path('education/', views.education, name='education'),
     path('quiz/', views.quiz, name='quiz'),
     path('api/neo-data/', views.neo_data_api, name='neo_data_api'),
+    path('api/events/', views.neo_events, name='neo_events'),
+    path('api/impact/batch/', views.impact_batch_api, name='impact_batch_api'),
+    path('api/impact/monte-carlo/<str:asteroid_id>/', views.impact_monte_carlo_api, name='impact_monte_carlo_api'),
+    path('api/orbit/<str:asteroid_id>/', views.orbit_positions_api, name='orbit_positions_api'),
+    path('api/near/', views.near_objects_api, name='near_objects_api'),
+    path('images/asteroid/<str:asteroid_id>.svg', views.asteroid_image, name='asteroid_image'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""Responsive variants of the curated asteroid photos.
+
+``build_image_variants`` resizes every image in ``static/images/asteroids``
+to a few widths and encodes each as WebP and JPEG. File names carry a hash
+of their content (``Bennu-320.3f2a9c1b0d4e.webp``), so they can be cached
+forever and a rebuild only adds files whose pixels changed. ``variants.json``
+lists the variants per source image; pages and the API turn it into
+``srcset`` attributes so cards download a thumbnail-sized WebP instead of
+the full JPEG.
+
+Building needs Pillow; reading the manifest does not, so pages still render
+(without srcsets) where the variants have not been built.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.templatetags.static import static
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed to build variants
+    Image = None
+
+SOURCE_PREFIX = 'images/asteroids/'
+VARIANTS_PREFIX = 'images/asteroids/variants/'
+MANIFEST_NAME = 'variants.json'
+VARIANT_WIDTHS = (160, 320, 640)
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+ENCODINGS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def source_dir():
+    return os.path.join(settings.BASE_DIR, 'static', *SOURCE_PREFIX.split('/'))
+
+
+def variants_dir():
+    return os.path.join(settings.BASE_DIR, 'static', *VARIANTS_PREFIX.split('/'))
+
+
+def _slug(name):
+    return '-'.join(name.split())
+
+
+def encode_variants(data, stem, widths=VARIANT_WIDTHS):
+    """(width, height, [(filename, width, format, body)]) for one source image; widths above the original are dropped"""
+    if Image is None:
+        raise ImportError('Pillow is required to build image variants')
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        targets = [width for width in widths if width < image.width] or [image.width]
+        results = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt, (pil_format, options) in ENCODINGS.items():
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                body = buffer.getvalue()
+                digest = hashlib.sha256(body).hexdigest()[:12]
+                extension = 'jpg' if fmt == 'jpeg' else fmt
+                results.append((f'{_slug(stem)}-{width}.{digest}.{extension}', width, fmt, body))
+        return image.width, image.height, results
+
+
+def build_variants(source=None, output=None, widths=VARIANT_WIDTHS, force=False, on_image=None):
+    """Build variants for every source image; returns the new manifest"""
+    source = source or source_dir()
+    output = output or variants_dir()
+    os.makedirs(output, exist_ok=True)
+    previous = load_manifest(output)
+    manifest = {}
+    for filename in sorted(os.listdir(source)):
+        if not filename.lower().endswith(SOURCE_EXTENSIONS):
+            continue
+        with open(os.path.join(source, filename), 'rb') as f:
+            data = f.read()
+        source_hash = hashlib.sha256(data).hexdigest()
+        entry = previous.get(filename)
+        if (not force and entry and entry['source_hash'] == source_hash
+                and entry['widths'] == list(widths)
+                and all(os.path.exists(os.path.join(output, v['file'])) for v in entry['variants'])):
+            manifest[filename] = entry
+            continue
+
+        width, height, encoded = encode_variants(data, os.path.splitext(filename)[0], widths)
+        for name, _, _, body in encoded:
+            path = os.path.join(output, name)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(body)
+        manifest[filename] = {
+            'source_hash': source_hash,
+            'widths': list(widths),
+            'width': width,
+            'height': height,
+            'bytes': len(data),
+            'variants': [
+                {'file': name, 'width': w, 'format': fmt, 'bytes': len(body)}
+                for name, w, fmt, body in encoded
+            ],
+        }
+        if on_image is not None:
+            on_image(filename, manifest[filename])
+
+    # Variant files no source refers to any more
+    keep = {v['file'] for entry in manifest.values() for v in entry['variants']} | {MANIFEST_NAME}
+    for name in os.listdir(output):
+        if name not in keep:
+            os.remove(os.path.join(output, name))
+
+    path = os.path.join(output, MANIFEST_NAME)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def load_manifest(directory=None):
+    try:
+        with open(os.path.join(directory or variants_dir(), MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _static_url(path):
+    try:
+        return static(path)
+    except ValueError:
+        # collectstatic has not run yet, so there is no hashed name to use
+        return settings.STATIC_URL + path
+
+
+class VariantIndex:
+    """``srcset`` strings per source image URL, built from one manifest"""
+
+    def __init__(self, manifest):
+        self.version = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:12]
+        self._sources = {}
+        for filename, entry in manifest.items():
+            sets = {}
+            for variant in entry['variants']:
+                url = _static_url(VARIANTS_PREFIX + variant['file'])
+                sets.setdefault(variant['format'], []).append(f'{url} {variant["width"]}w')
+            self._sources[filename] = {
+                'srcset': ', '.join(sets.get('jpeg', ())),
+                'webp_srcset': ', '.join(sets.get('webp', ())),
+                'width': entry['width'],
+                'height': entry['height'],
+            }
+
+    def lookup(self, image_url):
+        """Variant info for a ``/static/images/asteroids/...`` URL, or None"""
+        # Source images are referenced by their plain static path, not a hashed name
+        prefix = settings.STATIC_URL + SOURCE_PREFIX
+        if not image_url or not image_url.startswith(prefix):
+            return None
+        return self._sources.get(image_url[len(prefix):])
+
+
+_index = None
+_index_key = None
+_index_lock = threading.Lock()
+
+
+def get_variant_index():
+    """Process-wide index, rebuilt when ``build_image_variants`` rewrites the manifest"""
+    global _index, _index_key
+    try:
+        stat = os.stat(os.path.join(variants_dir(), MANIFEST_NAME))
+        key = (stat.st_ino, stat.st_mtime_ns)
+    except FileNotFoundError:
+        key = None
+    if _index is not None and key == _index_key:
+        return _index
+    with _index_lock:
+        if _index is None or key != _index_key:
+            _index = VariantIndex(load_manifest())
+            _index_key = key
+        return _index
+
+
+def with_srcsets(records, index=None):
+    """Add ``image_srcset``/``image_webp_srcset`` to API records that have variants"""
+    index = index or get_variant_index()
+    for record in records:
+        info = index.lookup(record.get('image_url'))
+        record['image_srcset'] = info['srcset'] if info else None
+        record['image_webp_srcset'] = info['webp_srcset'] if info else None
+    return records
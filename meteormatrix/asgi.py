@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "meteormatrix.settings")
 
-application = get_asgi_application()
+# Django itself runs as WSGI on a thread pool; only the event stream is async
+django_application = get_wsgi_application()
+
+# Imported after setup; serves /api/events/ (Server-Sent Events) outside Django
+from django.conf import settings  # noqa: E402
+
+from dashboard.events import with_event_stream  # noqa: E402
+from dashboard.template_timing import warm_templates  # noqa: E402
+from dashboard.threaded_wsgi import ThreadedWSGI  # noqa: E402
+
+warm_templates()
+
+application = with_event_stream(ThreadedWSGI(django_application, settings.WSGI_THREADS))
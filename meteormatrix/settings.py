@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,13 +45,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so static files and every other middleware are included in its timings
+    "dashboard.metrics.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "dashboard.staticfiles.PrecompressedStaticMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Needs request.user; staff opt in per request with ?profile=1
+    "dashboard.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "meteormatrix.urls"
@@ -59,7 +65,6 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -67,6 +72,16 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Compiled once per process (and warmed at startup), timed per template
+            "loaders": [
+                (
+                    "dashboard.template_timing.TimingLoader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
@@ -85,6 +100,52 @@ DATABASES = {
 }
 
 
+# Caches
+# The "catalog" cache holds rendered /api/neo-data/ payloads. It is
+# per-process by default; set CATALOG_CACHE_BACKEND=file (shared directory)
+# or memcached (e.g. a unix socket) so gunicorn workers share one copy and
+# only one of them rebuilds a payload after the catalog changes.
+
+CATALOG_CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "catalog"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / "var" / "cache" / "catalog"),
+    ),
+    "memcached": (
+        "django.core.cache.backends.memcached.PyMemcacheCache",
+        "unix:/tmp/memcached.sock",
+    ),
+}
+CATALOG_CACHE_TTL = int(os.environ.get("CATALOG_CACHE_TTL", 3600))
+_catalog_backend, _catalog_location = CATALOG_CACHE_BACKENDS[
+    os.environ.get("CATALOG_CACHE_BACKEND", "locmem")
+]
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": {
+        "BACKEND": _catalog_backend,
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION", _catalog_location),
+        "TIMEOUT": CATALOG_CACHE_TTL,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    # {% fragment_cache %} fragments; keys include the object's detail page
+    # version, so stale fragments are never read and simply age out
+    "template_fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "template-fragments",
+        "TIMEOUT": 24 * 3600,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+# Template renders slower than this are logged by dashboard.template_timing
+TEMPLATE_SLOW_RENDER_MS = 250
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -123,6 +184,18 @@ STATIC_URL = "static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# collectstatic writes hashed names plus .gz/.br siblings here; the
+# PrecompressedStaticMiddleware serves them with far-future cache headers
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "dashboard.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -130,6 +203,53 @@ MEDIA_ROOT = BASE_DIR / "media"
 # NASA API Configuration
 NASA_API_KEY = "xHKqrnRraX3T5RcwougT05HD6esFRzFvC92lPSXM"
 
+# Asteroid catalog
+# How often each worker checks the Asteroid table for newly ingested rows
+CATALOG_REFRESH_SECONDS = 60
+# Where ingest_neo_feed keeps its resume checkpoint
+NEO_FEED_CHECKPOINT = BASE_DIR / "var" / "ingest_neo_feed.json"
+# Touched by ingestion commands so live event streams reload the catalog
+CATALOG_NOTIFY_FILE = BASE_DIR / "var" / "catalog-changed.json"
+# How often each server process checks for catalog changes while clients listen
+EVENTS_POLL_SECONDS = 2
+# Threads per ASGI worker running the (sync) Django app. asgi.py serves only
+# /api/events/ asynchronously and hands every other request to the WSGI
+# handler on this pool, so views and middleware are never adapted request by
+# request with sync_to_async
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", 8))
+
+# Visualizer
+# Memory-mapped position tables written by build_ephemeris
+EPHEMERIS_DIR = BASE_DIR / "var" / "ephemeris"
+
+# Images
+# Procedural SVGs for catalog objects (generate_accurate_images --catalog)
+ASTEROID_IMAGE_DIR = BASE_DIR / "var" / "images" / "asteroids"
+# Disk cache behind /images/asteroid/<id>.svg, shared by every worker
+ASTEROID_IMAGE_CACHE_DIR = BASE_DIR / "var" / "cache" / "asteroid-images"
+# Manifests and partial files of download_real_images, one directory per output
+IMAGE_DOWNLOAD_STATE_DIR = BASE_DIR / "var" / "downloads"
+
+# Request metrics
+# Memory-mapped per-route counters shared by every worker, served at /metrics
+METRICS_DIR = BASE_DIR / "var" / "metrics"
+# Worker processes that can record at once (one slot each)
+METRICS_MAX_WORKERS = 64
+# Besides staff users, /metrics is served to these client addresses and to
+# scrapers sending "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.environ.get("METRICS_ALLOWED_IPS", "").split(",") if ip.strip()
+]
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# cProfile dumps of requests staff profiled with ?profile=1 (see the admin)
+PROFILE_DIR = BASE_DIR / "var" / "profiles"
+# Older profiles and their dumps are deleted
+PROFILE_MAX_PROFILES = 200
+
+# Impact model
+# Processes used for Monte Carlo runs (defaults to the number of CPUs)
+MONTE_CARLO_WORKERS = int(os.environ.get("MONTE_CARLO_WORKERS", 0)) or None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
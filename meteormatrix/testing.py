@@ -0,0 +1,24 @@
+"""Test helpers shared by the apps' test modules"""
+import atexit
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+TEST_ROOT = tempfile.mkdtemp(prefix='meteormatrix-tests-')
+atexit.register(shutil.rmtree, TEST_ROOT, ignore_errors=True)
+
+# Every on-disk store (metrics, profiles, caches, notify file) goes to a
+# throwaway directory instead of var/
+isolated_paths = override_settings(
+    CATALOG_NOTIFY_FILE=os.path.join(TEST_ROOT, 'catalog-changed.json'),
+    NEO_FEED_CHECKPOINT=os.path.join(TEST_ROOT, 'ingest_neo_feed.json'),
+    EPHEMERIS_DIR=os.path.join(TEST_ROOT, 'ephemeris'),
+    ASTEROID_IMAGE_DIR=os.path.join(TEST_ROOT, 'images'),
+    ASTEROID_IMAGE_CACHE_DIR=os.path.join(TEST_ROOT, 'image-cache'),
+    IMAGE_DOWNLOAD_STATE_DIR=os.path.join(TEST_ROOT, 'downloads'),
+    METRICS_DIR=os.path.join(TEST_ROOT, 'metrics'),
+    PROFILE_DIR=os.path.join(TEST_ROOT, 'profiles'),
+    STATIC_ROOT=os.path.join(TEST_ROOT, 'static'),
+)
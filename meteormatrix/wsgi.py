@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "meteormatrix.settings")
 
 application = get_wsgi_application()
+
+# Imported after setup; compiles every template before the first request
+from dashboard.template_timing import warm_templates  # noqa: E402
+
+warm_templates()
@@ -0,0 +1,93 @@
+"""Server-side impact simulation for the simulation lab.
+
+Inputs are validated and snapped to a fixed grid (1 m, 0.1 km/s,
+10 kg/m³, 1°), then evaluated with the same model as the asteroid detail
+pages. Snapping keeps slider-driven requests on a small set of keys, so
+almost every request is answered from an LRU of serialized response bodies.
+"""
+import json
+from functools import lru_cache
+
+from dashboard.analysis import tsunami_estimate
+from dashboard.impact import impact_batch
+
+# name: (minimum, maximum, quantization step, default)
+PARAMETERS = {
+    'diameter': (1, 10000, 1, 100),  # meters
+    'velocity': (5, 72, 0.1, 20),  # km/s
+    'density': (500, 8000, 10, 2600),  # kg/m³
+    'angle': (5, 90, 1, 45),  # degrees from horizontal
+}
+LOCATIONS = ('land', 'ocean')
+SIMULATION_CACHE_SIZE = 65536
+
+
+def parse_inputs(params):
+    """Validated, quantized (diameter, velocity, density, angle, location); raises ValueError"""
+    values = []
+    for name, (low, high, step, default) in PARAMETERS.items():
+        raw = params.get(name, default)
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} must be a number')
+        if not low <= value <= high:
+            raise ValueError(f'{name} must be between {low} and {high}')
+        values.append(round(round(value / step) * step, 6))
+    location = params.get('location', 'land')
+    if location not in LOCATIONS:
+        raise ValueError(f'location must be one of {", ".join(LOCATIONS)}')
+    return (*values, location)
+
+
+def classify(tnt_megatons):
+    if tnt_megatons < 0.001:
+        return 'Minimal - Small meteorite'
+    if tnt_megatons < 0.1:
+        return 'Minor - Local damage'
+    if tnt_megatons < 10:
+        return 'Moderate - Regional effects'
+    if tnt_megatons < 1000:
+        return 'Major - Continental effects'
+    return 'Catastrophic - Global effects'
+
+
+@lru_cache(maxsize=SIMULATION_CACHE_SIZE)
+def simulate_impact(diameter, velocity, density, angle, location):
+    """JSON body for one quantized input tuple"""
+    diameter_km = diameter / 1000
+    result = {
+        name: float(value)
+        for name, value in impact_batch(
+            diameter_km, velocity, density / 1000, entry_angle_deg=angle
+        ).items()
+    }
+    tnt_megatons = result['tnt_equivalent_tons'] / 1e6
+    if location == 'ocean':
+        tsunami_risk, tsunami_height = tsunami_estimate(diameter_km, velocity)
+    else:
+        tsunami_risk, tsunami_height = None, 0.0
+
+    return json.dumps({
+        'success': True,
+        'inputs': {
+            'diameter': diameter,
+            'velocity': velocity,
+            'density': density,
+            'angle': angle,
+            'location': location,
+        },
+        'mass_kg': result['mass_kg'],
+        'kinetic_energy_joules': result['kinetic_energy_joules'],
+        'tnt_megatons': tnt_megatons,
+        'crater_diameter_km': result['crater_diameter_m'] / 1000,
+        'crater_depth_km': result['crater_depth_m'] / 1000,
+        'richter_equivalent': result['richter_equivalent'],
+        'fireball_radius_km': result['fireball_radius_km'],
+        'overpressure_radius_km': result['overpressure_radius_km'],
+        'thermal_radius_km': result['thermal_radius_km'],
+        'airburst_altitude_km': result['airburst_altitude_km'],
+        'classification': classify(tnt_megatons),
+        'tsunami_risk': tsunami_risk,
+        'tsunami_height_m': tsunami_height,
+    }).encode()
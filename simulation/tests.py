@@ -1,3 +1,49 @@
 from django.test import TestCase
 
-# Create your tests here.
+from dashboard.impact import impact_batch
+from meteormatrix.testing import isolated_paths
+
+from .calculator import parse_inputs, simulate_impact
+
+
+@isolated_paths
+class CalculateImpactTests(TestCase):
+    def get(self, **params):
+        return self.client.get('/simulation/calculate/', params)
+
+    def test_page_renders(self):
+        self.assertEqual(self.client.get('/simulation/').status_code, 200)
+
+    def test_matches_the_impact_model(self):
+        response = self.get(diameter=100, velocity=20, density=2600, angle=90)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        data = response.json()
+        expected = impact_batch(0.1, 20.0, 2.6, entry_angle_deg=90.0)
+        self.assertAlmostEqual(data['kinetic_energy_joules'], float(expected['kinetic_energy_joules']))
+        self.assertAlmostEqual(data['crater_diameter_km'], float(expected['crater_diameter_m']) / 1000)
+        self.assertIsNone(data['tsunami_risk'])
+        self.assertIsNotNone(self.get(location='ocean').json()['tsunami_risk'])
+
+    def test_inputs_are_quantized(self):
+        self.assertEqual(parse_inputs({'diameter': '100.4', 'velocity': '20.04', 'density': '2604', 'angle': '44.6'}),
+                         (100, 20.0, 2600, 45, 'land'))
+        self.assertEqual(parse_inputs({}), (100, 20, 2600, 45, 'land'))
+        self.assertEqual(self.get(diameter='100.2').content, self.get(diameter='99.8').content)
+
+    def test_results_are_cached(self):
+        simulate_impact(250, 17.0, 3000, 30, 'ocean')
+        hits = simulate_impact.cache_info().hits
+        self.get(diameter=250, velocity=17, density=3000, angle=30, location='ocean')
+        self.assertEqual(simulate_impact.cache_info().hits, hits + 1)
+
+    def test_invalid_inputs(self):
+        for params in (
+            {'diameter': '0'}, {'diameter': '10001'}, {'diameter': 'big'}, {'velocity': 'nan'},
+            {'velocity': 'inf'}, {'density': '-1'}, {'angle': '91'}, {'location': 'space'},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+        self.assertEqual(self.client.post('/simulation/calculate/').status_code, 405)
@@ -1,4 +1,13 @@
 from django.shortcuts import render
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from .calculator import parse_inputs, simulate_impact
+
+# Results only change with the model, so browsers may reuse them for a while
+SIMULATION_MAX_AGE = 3600
+
 
 def simulation(request):
     """Impact simulation page"""
@@ -7,7 +16,18 @@ def simulation(request):
     }
     return render(request, 'simulation/simulation.html', context)
 
+
+@require_GET
 def calculate_impact(request):
-    """This endpoint is not needed as calculations are done in JavaScript"""
-    from django.http import JsonResponse
-    return JsonResponse({'message': 'Calculations are performed client-side'})
\ No newline at end of file
+    """Run the server impact model
+
+    Query parameters: ``diameter`` (m), ``velocity`` (km/s), ``density``
+    (kg/m³), ``angle`` (degrees) and ``location`` (``land``/``ocean``).
+    """
+    try:
+        inputs = parse_inputs(request.GET)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    response = HttpResponse(simulate_impact(*inputs), content_type='application/json')
+    patch_cache_control(response, public=True, max_age=SIMULATION_MAX_AGE)
+    return response
@@ -0,0 +1,4 @@
+function showKnowledgePopup(){document.getElementById('knowledgePopup').style.display='flex';}
+function closeKnowledgePopup(){document.getElementById('knowledgePopup').style.display='none';}
+document.getElementById('knowledgePopup').addEventListener('click',function(e){if(e.target===this){closeKnowledgePopup();}});function showLoading(){document.getElementById('loading-overlay').classList.remove('hidden');}
+function hideLoading(){document.getElementById('loading-overlay').classList.add('hidden');}
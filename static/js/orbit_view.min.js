@@ -0,0 +1,4 @@
+function drawOrbit(data){const canvas=document.getElementById('orbit-canvas');canvas.classList.remove('hidden');document.getElementById('orbit-placeholder').classList.add('hidden');canvas.width=canvas.clientWidth;canvas.height=canvas.clientHeight;const ctx=canvas.getContext('2d');const extent=Math.max(1.2,...data.heliocentric_au.map(p=>Math.hypot(p[0],p[1])));const scale=Math.min(canvas.width,canvas.height) / 2 / (extent*1.05);const toCanvas=p=>[canvas.width / 2+p[0]*scale,canvas.height / 2-p[1]*scale];function path(points,color){ctx.strokeStyle=color;ctx.beginPath();points.forEach((p,i)=>{const[x,y]=toCanvas(p);i?ctx.lineTo(x,y):ctx.moveTo(x,y);});ctx.stroke();}
+function dot(p,color,radius){const[x,y]=toCanvas(p);ctx.fillStyle=color;ctx.beginPath();ctx.arc(x,y,radius,0,2*Math.PI);ctx.fill();}
+dot([0,0],'#facc15',6);path(data.earth_au,'#3b82f6');path(data.heliocentric_au,'#22d3ee');dot(data.earth_au[0],'#3b82f6',4);dot(data.heliocentric_au[0],'#f87171',4);}
+document.addEventListener('DOMContentLoaded',function(){fetch(document.getElementById('orbit-canvas').dataset.ephemerisUrl).then(response=>response.json()).then(data=>{if(data.success){drawOrbit(data);}else{document.getElementById('orbit-status').textContent='No orbital elements available';}}).catch(()=>{document.getElementById('orbit-status').textContent='Orbit data unavailable';});});
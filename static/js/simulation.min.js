@@ -0,0 +1,17 @@
+let recentSimulations=JSON.parse(localStorage.getItem('recentSimulations')||'[]');let pendingRequest=null;let recalcTimer=null;document.getElementById('impact-angle').addEventListener('input',function(){document.getElementById('angle-value').textContent=this.value+'°';});document.getElementById('simulation-form').addEventListener('submit',function(e){e.preventDefault();calculateImpact(true);});document.getElementById('simulation-form').addEventListener('input',function(){clearTimeout(recalcTimer);recalcTimer=setTimeout(()=>calculateImpact(false),75);});function calculateImpact(save){const params=new URLSearchParams({diameter:document.getElementById('diameter').value,velocity:document.getElementById('velocity').value,density:document.getElementById('density').value,angle:document.getElementById('impact-angle').value,location:document.querySelector('input[name="location"]:checked').value});if(pendingRequest)pendingRequest.abort();pendingRequest=new AbortController();if(save)showLoading();const url=document.getElementById('simulation-form').dataset.calculateUrl;fetch(`${url}?${params}`,{signal:pendingRequest.signal}).then(response=>response.json()).then(data=>{if(!data.success)throw new Error(data.error);const results=toResults(data);displayResults(results);if(save)saveSimulation(results);}).catch(error=>{if(error.name!=='AbortError')console.error('Simulation failed:',error);}).finally(()=>{if(save)hideLoading();});}
+function toResults(data){return{...data.inputs,mass:data.mass_kg,kineticEnergy:data.kinetic_energy_joules,tntMegatons:data.tnt_megatons,craterDiameter:data.crater_diameter_km,magnitude:data.richter_equivalent,classification:data.classification,tsunamiHeight:data.tsunami_height_m,timestamp:new Date().toLocaleString()};}
+function displayResults(results){document.getElementById('results').classList.remove('hidden');document.getElementById('no-results').classList.add('hidden');document.getElementById('energy').textContent=results.kineticEnergy.toExponential(2);document.getElementById('tnt').textContent=results.tntMegatons.toFixed(3);document.getElementById('crater').textContent=results.craterDiameter.toFixed(2);document.getElementById('magnitude').textContent=results.magnitude.toFixed(1);document.getElementById('classification').textContent=results.classification;if(results.location==='ocean'){document.getElementById('tsunami-info').classList.remove('hidden');document.getElementById('tsunami').textContent=`Wave height: ${results.tsunamiHeight.toFixed(1)} meters`;}else{document.getElementById('tsunami-info').classList.add('hidden');}}
+function saveSimulation(results){recentSimulations.unshift(results);if(recentSimulations.length>6){recentSimulations=recentSimulations.slice(0,6);}
+localStorage.setItem('recentSimulations',JSON.stringify(recentSimulations));displayRecentSimulations();}
+function displayRecentSimulations(){const container=document.getElementById('recent-simulations');container.innerHTML='';if(recentSimulations.length===0){container.innerHTML='<p class="text-gray-400 col-span-full text-center">No recent simulations</p>';return;}
+recentSimulations.forEach((sim,index)=>{const card=document.createElement('div');card.className='glass-effect p-4 rounded-lg';card.innerHTML=`
+            <h4 class="font-semibold text-white mb-2">Simulation ${index+1}</h4>
+            <div class="text-sm space-y-1">
+                <p class="text-gray-300">Diameter: ${sim.diameter}m</p>
+                <p class="text-gray-300">Velocity: ${sim.velocity} km/s</p>
+                <p class="text-gray-300">TNT: ${sim.tntMegatons.toFixed(3)} MT</p>
+                <p class="text-gray-300">Location: ${sim.location}</p>
+                <p class="text-xs text-gray-400">${sim.timestamp}</p>
+            </div>
+        `;container.appendChild(card);});}
+document.addEventListener('DOMContentLoaded',function(){displayRecentSimulations();});
@@ -0,0 +1,4 @@
+function resetView(){alert('3D visualization will be implemented in future updates!');}
+function toggleAnimation(){const button=event.target;if(button.textContent.includes('Pause')){button.textContent='▶️ Play';}else{button.textContent='⏸️ Pause';}}
+function focusAsteroid(asteroidId,asteroidName){document.getElementById('selected-name').textContent=asteroidName;document.getElementById('selected-info').textContent=`ID: ${asteroidId}`;document.getElementById('info-panel').classList.remove('hidden');setTimeout(()=>{document.getElementById('info-panel').classList.add('hidden');},3000);}
+document.addEventListener('DOMContentLoaded',function(){console.log('Visualizer page loaded - 3D features coming soon!');});
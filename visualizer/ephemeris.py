@@ -0,0 +1,134 @@
+"""Precomputed ephemeris store shared by all workers through memory mapping.
+
+``build_ephemeris`` propagates every catalog object with orbital elements
+onto one evenly spaced time grid and writes the heliocentric positions as a
+single packed float32 array of shape (objects + 1, steps, 3); row 0 is
+Earth. A JSON index maps asteroid ids to rows and describes the grid.
+
+Readers open the array with ``mmap_mode='r'``, so every process shares the
+same page cache and a date window is a zero-copy slice. Each build writes a
+new versioned ``.npy`` file before atomically replacing the index, so
+workers still mapping the previous file keep a consistent view until they
+notice the new index.
+"""
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+
+from dashboard.orbits import earth_positions, elements_from_records, heliocentric_positions
+
+INDEX_FILE = 'index.json'
+EARTH_ROW = 0
+EPHEMERIS_DTYPE = np.float32
+
+
+def build_ephemeris(records, directory, start_jd, steps, step_days=1.0, chunk_size=256):
+    """Write positions for every record with orbital elements and return the new index"""
+    os.makedirs(directory, exist_ok=True)
+    elements, indices = elements_from_records(records)
+    jd = start_jd + step_days * np.arange(steps)
+    version = uuid.uuid4().hex[:12]
+    filename = f'positions-{version}.npy'
+    tmp_path = os.path.join(directory, f'{filename}.tmp')
+
+    positions = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=EPHEMERIS_DTYPE, shape=(len(indices) + 1, steps, 3),
+    )
+    positions[EARTH_ROW] = earth_positions(jd)
+    # Bounded chunks keep the float64 intermediates small for long grids
+    for start in range(0, len(indices), chunk_size):
+        chunk = {field: values[start:start + chunk_size] for field, values in elements.items()}
+        positions[1 + start:1 + start + len(chunk['semi_major_axis_au'])] = heliocentric_positions(chunk, jd)
+    positions.flush()
+    del positions
+    os.replace(tmp_path, os.path.join(directory, filename))
+
+    index = {
+        'version': version,
+        'file': filename,
+        'frame': 'heliocentric ecliptic J2000',
+        'units': 'au',
+        'start_jd': float(start_jd),
+        'step_days': float(step_days),
+        'steps': int(steps),
+        'rows': {records[i]['id']: row for row, i in enumerate(indices.tolist(), start=1)},
+    }
+    index_tmp = os.path.join(directory, f'{INDEX_FILE}.tmp')
+    with open(index_tmp, 'w') as f:
+        json.dump(index, f)
+    os.replace(index_tmp, os.path.join(directory, INDEX_FILE))
+
+    # Unlinked files stay readable for processes that still map them
+    for name in os.listdir(directory):
+        if name.startswith('positions-') and name.endswith('.npy') and name != filename:
+            os.remove(os.path.join(directory, name))
+    return index
+
+
+class Ephemeris:
+    """Read-only view of a built ephemeris"""
+
+    def __init__(self, directory, index):
+        self.index = index
+        self.version = index['version']
+        self.rows = index['rows']
+        self.start_jd = index['start_jd']
+        self.step_days = index['step_days']
+        self.steps = index['steps']
+        self.positions = np.load(os.path.join(directory, index['file']), mmap_mode='r')
+
+    @property
+    def end_jd(self):
+        return self.start_jd + self.step_days * (self.steps - 1)
+
+    def __contains__(self, asteroid_id):
+        return asteroid_id in self.rows
+
+    def bounds(self, start_jd, end_jd, stride=1):
+        """Grid slice covering [start_jd, end_jd]; raises ValueError outside the grid"""
+        first = max(0, int(np.ceil((start_jd - self.start_jd) / self.step_days - 1e-9)))
+        last = min(self.steps - 1, int(np.floor((end_jd - self.start_jd) / self.step_days + 1e-9)))
+        if first > last:
+            raise ValueError('Requested window is outside the precomputed ephemeris')
+        return slice(first, last + 1, stride)
+
+    def jd(self, window):
+        return self.start_jd + self.step_days * np.arange(self.steps)[window]
+
+    def heliocentric(self, asteroid_id, window):
+        """Zero-copy (steps, 3) view of the object's positions"""
+        return self.positions[self.rows[asteroid_id], window]
+
+    def earth(self, window):
+        return self.positions[EARTH_ROW, window]
+
+
+_ephemeris = None
+_ephemeris_key = None
+_ephemeris_lock = threading.Lock()
+
+
+def get_ephemeris(directory):
+    """Process-wide reader, reopened when ``build_ephemeris`` replaces the index; None if never built"""
+    global _ephemeris, _ephemeris_key
+    path = os.path.join(directory, INDEX_FILE)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (str(directory), stat.st_ino, stat.st_mtime_ns)
+    if key == _ephemeris_key:
+        return _ephemeris
+    with _ephemeris_lock:
+        if key != _ephemeris_key:
+            try:
+                with open(path) as f:
+                    _ephemeris = Ephemeris(directory, json.load(f))
+            except FileNotFoundError:
+                # A newer build replaced the index mid-read; pick it up next time
+                return _ephemeris
+            _ephemeris_key = key
+        return _ephemeris
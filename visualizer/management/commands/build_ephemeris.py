@@ -0,0 +1,45 @@
+import os
+import time
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.catalog import load_catalog
+from dashboard.orbits import julian_date, within_earth_elements
+from visualizer.ephemeris import build_ephemeris
+
+
+class Command(BaseCommand):
+    help = 'Precompute heliocentric positions of every object with orbital elements into the shared ephemeris store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', default=None,
+                            help='First epoch as YYYY-MM-DD (default: today)')
+        parser.add_argument('--days', type=float, default=3650,
+                            help='Length of the time grid in days')
+        parser.add_argument('--step-days', type=float, default=1.0,
+                            help='Spacing of the time grid in days')
+        parser.add_argument('--output', default=str(settings.EPHEMERIS_DIR),
+                            help='Directory holding the ephemeris files')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else date.today()
+        except ValueError as e:
+            raise CommandError(f'Invalid --start: {e}')
+        if options['days'] <= 0 or options['step_days'] <= 0:
+            raise CommandError('--days and --step-days must be positive')
+        start_jd = julian_date(datetime.combine(start, datetime.min.time(), tzinfo=dt_timezone.utc))
+        steps = int(options['days'] / options['step_days']) + 1
+        if not (within_earth_elements(start_jd) and within_earth_elements(start_jd + (steps - 1) * options['step_days'])):
+            raise CommandError("The time grid must lie between 1800 and 2050, the span of Earth's mean elements")
+
+        started = time.perf_counter()
+        index = build_ephemeris(load_catalog().as_dicts(), options['output'], start_jd, steps, options['step_days'])
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(os.path.join(options['output'], index['file']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(index["rows"])} objects x {steps} epochs from {start} '
+            f'({size / 1e6:.1f} MB) in {elapsed:.2f}s'
+        ))
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from dashboard.catalog import reload_catalog
+from dashboard.models import Asteroid
+from dashboard.orbits import propagate
+
+ELEMENTS = {
+    'orbit_epoch_jd': 2461000.5, 'semi_major_axis_au': 1.5, 'eccentricity': 0.25, 'inclination_deg': 4.0,
+    'ascending_node_deg': 80.0, 'perihelion_argument_deg': 30.0, 'mean_anomaly_deg': 10.0,
+}
+START_JD = 2462502.5  # 2030-01-01
+
+
+class EphemerisApiTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='meteormatrix-ephemeris-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(EPHEMERIS_DIR=self.directory, METRICS_DIR=f'{self.directory}/metrics',
+                                              PROFILE_DIR=f'{self.directory}/profiles')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Asteroid.objects.create(neo_id='3100001', name='Grid Rock', diameter_min=0.1, diameter_max=0.2,
+                                is_potentially_hazardous=False, absolute_magnitude=21.0, **ELEMENTS)
+        self.record = reload_catalog().get('3100001')
+
+    def get(self, asteroid_id='3100001', **params):
+        return self.client.get(f'/visualizer/api/ephemeris/{asteroid_id}/', params)
+
+    def build(self):
+        call_command('build_ephemeris', '--start', '2030-01-01', '--days', '100', '--output', self.directory,
+                     stdout=StringIO())
+
+    def test_precomputed_positions(self):
+        self.build()
+        response = self.get(start=START_JD + 10, end=START_JD + 20, stride=2)
+        self.assertEqual(response['X-Ephemeris-Source'], 'ephemeris')
+        data = response.json()
+        self.assertEqual(data['jd'], [START_JD + day for day in range(10, 21, 2)])
+        expected = propagate(self.record, data['jd'])
+        np.testing.assert_allclose(data['heliocentric_au'], expected['heliocentric_au'], atol=1e-6)
+        np.testing.assert_allclose(data['geocentric_au'], expected['geocentric_au'], atol=1e-6)
+
+        raw = self.get(format='f32').content
+        self.assertEqual(len(raw), 101 * 3 * 4)
+
+        etag = response['ETag']
+        revalidated = self.client.get('/visualizer/api/ephemeris/3100001/',
+                                      {'start': START_JD + 10, 'end': START_JD + 20, 'stride': 2},
+                                      HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_rebuild_is_picked_up(self):
+        self.build()
+        etag = self.get()['ETag']
+        call_command('build_ephemeris', '--start', '2030-01-01', '--days', '50', '--output', self.directory,
+                     stdout=StringIO())
+        response = self.get()
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['jd']), 51)
+
+    def test_live_propagation_without_a_store(self):
+        response = self.get(start=START_JD, end=START_JD + 30, stride=10)
+        self.assertEqual(response['X-Ephemeris-Source'], 'live')
+        data = response.json()
+        self.assertEqual(data['jd'], [START_JD, START_JD + 10, START_JD + 20, START_JD + 30])
+        np.testing.assert_allclose(data['heliocentric_au'], propagate(self.record, data['jd'])['heliocentric_au'],
+                                   atol=1e-6)
+
+    def test_invalid_parameters(self):
+        for params in (
+            {'stride': '0'}, {'stride': 'two'}, {'start': 'nan'}, {'start': 'inf'}, {'end': '-inf'},
+            {'start': 'yesterday'}, {'start': '1e300'}, {'start': START_JD, 'end': START_JD - 1},
+            {'start': START_JD, 'end': START_JD + 20000}, {'start': '2378000'}, {'end': '2470000'},
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+        self.build()
+        response = self.get(start=START_JD + 200, end=START_JD + 300)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.get('no-such-object').status_code, 404)
+
+    def test_build_rejects_bad_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command('build_ephemeris', '--start', '2030-02-30', '--output', self.directory)
+        with self.assertRaises(CommandError):
+            call_command('build_ephemeris', '--days', '0', '--output', self.directory)
+        with self.assertRaises(CommandError):
+            call_command('build_ephemeris', '--start', '2045-01-01', '--output', self.directory)
@@ -6,4 +6,5 @@ app_name = 'visualizer'
 urlpatterns = [
     path('', views.visualizer, name='visualizer'),
     path('orbit/<str:asteroid_id>/', views.orbit_view, name='orbit_view'),
+    path('api/ephemeris/<str:asteroid_id>/', views.ephemeris_api, name='ephemeris_api'),
 ]
\ No newline at end of file
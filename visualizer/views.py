@@ -1,5 +1,29 @@
+import json
+
+import numpy as np
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render, get_object_or_404
+from django.utils import timezone
+from dashboard.catalog import get_catalog
+from dashboard.compression import Payload, not_modified_response, query_etag
 from dashboard.models import Asteroid
+from dashboard.orbits import has_elements, julian_date, propagate, within_earth_elements
+
+from .ephemeris import get_ephemeris
+
+# Live propagation grid when an object is missing from the precomputed ephemeris
+LIVE_MAX_STEPS = 20000
+
+def _parse_jd(params, name):
+    """Julian date query parameter ``name``, or None when it is absent"""
+    if name not in params:
+        return None
+    jd = float(params[name])
+    if not within_earth_elements(jd):
+        # Earth's mean elements are only fitted for 1800-2050
+        raise ValueError(f'{name} must be a Julian date between 1800 and 2050')
+    return jd
 
 def visualizer(request):
     """3D visualization page"""
@@ -20,4 +44,86 @@ def orbit_view(request, asteroid_id):
         'close_approaches': asteroid.close_approaches.all()[:5]
     }
     
-    return render(request, 'visualizer/orbit_view.html', context)
\ No newline at end of file
+    return render(request, 'visualizer/orbit_view.html', context)
+
+def ephemeris_api(request, asteroid_id):
+    """Positions of one object on the precomputed ephemeris grid
+
+    ``start``/``end`` are Julian dates (default: the whole grid) and
+    ``stride`` keeps every n-th epoch. ``format=f32`` returns the raw
+    little-endian float32 (steps, 3) heliocentric block instead of JSON.
+    Objects that are not in the store yet are propagated on the fly.
+    """
+    ephemeris = get_ephemeris(settings.EPHEMERIS_DIR)
+    try:
+        stride = int(request.GET.get('stride', 1))
+        if stride < 1:
+            raise ValueError('stride must be a positive integer')
+        start = _parse_jd(request.GET, 'start')
+        end = _parse_jd(request.GET, 'end')
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    if ephemeris is not None and asteroid_id in ephemeris:
+        try:
+            window = ephemeris.bounds(
+                ephemeris.start_jd if start is None else start,
+                ephemeris.end_jd if end is None else end,
+                stride,
+            )
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        etag = query_etag(f'{ephemeris.version}:{asteroid_id}', request.GET)
+        not_modified = not_modified_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+        jd = ephemeris.jd(window)
+        heliocentric = ephemeris.heliocentric(asteroid_id, window)
+        earth = ephemeris.earth(window)
+        source = 'ephemeris'
+    else:
+        asteroid = get_catalog().get(asteroid_id)
+        if asteroid is None or not has_elements(asteroid):
+            return JsonResponse({'success': False, 'error': f'No orbit available for {asteroid_id}'}, status=404)
+        if start is None:
+            start = julian_date(timezone.now())
+        if end is None:
+            end = start + 365
+        # Compare before converting so a huge window cannot build a huge grid
+        span = (end - start) / stride
+        if not 0 <= span < LIVE_MAX_STEPS:
+            return JsonResponse({'success': False, 'error': f'Window must cover 1 to {LIVE_MAX_STEPS} epochs'}, status=400)
+        steps = int(span) + 1
+        etag = None
+        jd = start + stride * np.arange(steps)
+        orbit = propagate(asteroid, jd)
+        heliocentric = orbit['heliocentric_au'].astype(np.float32)
+        earth = (orbit['heliocentric_au'] - orbit['geocentric_au']).astype(np.float32)
+        source = 'live'
+
+    if request.GET.get('format') == 'f32':
+        body = np.ascontiguousarray(heliocentric, dtype='<f4').tobytes()
+        content_type = 'application/octet-stream'
+    else:
+        heliocentric = heliocentric.astype(np.float64)
+        earth = earth.astype(np.float64)
+        body = json.dumps({
+            'success': True,
+            'id': asteroid_id,
+            'source': source,
+            'frame': 'heliocentric ecliptic J2000',
+            'jd': jd.tolist(),
+            'heliocentric_au': heliocentric.round(7).tolist(),
+            'earth_au': earth.round(7).tolist(),
+            'geocentric_au': (heliocentric - earth).round(7).tolist(),
+        }).encode()
+        content_type = 'application/json'
+
+    if etag is None:
+        response = HttpResponse(body, content_type=content_type)
+    else:
+        response = Payload(body, etag, content_type=content_type).response(request)
+    response['X-Ephemeris-Source'] = source
+    response['X-Ephemeris-Start-JD'] = repr(float(jd[0]))
+    response['X-Ephemeris-Step-Days'] = repr(float(jd[1] - jd[0]) if len(jd) > 1 else 0.0)
+    return response